@@ -63,28 +63,26 @@ if uploaded_file:
                     agent = ChapterBasedAudiobookAgent(file_path)
                     
                     if process_all:
-                        agent.build_all_chapters()
+                        output_file = agent.build_all_chapters()
                     else:
-                        agent.build_chapter_range(chapter_range[0], chapter_range[1])
+                        output_file = agent.build_chapter_range(chapter_range[0], chapter_range[1])
                     
                     st.success("✅ Audiobook generated successfully!")
                     
-                    # Find the generated file
-                    import glob
-                    mp3_files = glob.glob("*.mp3")
-                    if mp3_files:
-                        latest_file = max(mp3_files, key=os.path.getctime)
+                    if output_file and os.path.exists(output_file):
+                        from audio_export import OUTPUT_FORMATS
+                        mime = OUTPUT_FORMATS["m4b"]["mime"]
                         
-                        with open(latest_file, "rb") as f:
+                        with open(output_file, "rb") as f:
                             audio_bytes = f.read()
                         
-                        st.audio(audio_bytes, format="audio/mp3")
+                        st.audio(audio_bytes, format=mime)
                         
                         st.download_button(
                             label="📥 Download Audiobook",
                             data=audio_bytes,
-                            file_name=latest_file,
-                            mime="audio/mp3"
+                            file_name=os.path.basename(output_file),
+                            mime=mime
                         )
                     
                 except Exception as e:
@@ -108,5 +106,5 @@ with st.expander("📋 How to get started"):
     
     4. **Download your audiobook:**
        - You can download individual chapters
-       - Or the complete audiobook as MP3
+       - Or the complete audiobook as M4B with chapter markers
     """)
\ No newline at end of file
@@ -0,0 +1,202 @@
+import os
+import subprocess
+import tempfile
+from pydub import AudioSegment
+from speaker import SAMPLE_RATE
+
+# Container/codec settings. Everything is encoded at Kokoro's native 24 kHz mono.
+OUTPUT_FORMATS = {
+    "m4b": {"codec": "aac", "bitrate": "64k", "extension": ".m4b", "muxer": "ipod", "mime": "audio/mp4"},
+    "opus": {"codec": "libopus", "bitrate": "32k", "extension": ".opus", "muxer": "ogg", "mime": "audio/ogg"},
+    "mp3": {"codec": "libmp3lame", "bitrate": "192k", "extension": ".mp3", "muxer": "mp3", "mime": "audio/mp3"},
+}
+
+
+def escape_metadata(value):
+    """Escape a value for ffmpeg's FFMETADATA1 format"""
+    value = str(value)
+    for char in ("\\", "=", ";", "#", "\n"):
+        value = value.replace(char, "\\" + char)
+    return value
+
+
+class BookEncoder:
+    """
+    Streams PCM into a single ffmpeg process and writes one compressed file
+    with embedded chapter markers. Audio is encoded exactly once; chapter
+    markers and split files are produced afterwards by stream copy.
+    """
+
+    def __init__(self, output_base, output_format="m4b", bitrate=None, metadata=None):
+        """
+        Args:
+            output_base: Output path without extension
+            output_format: One of OUTPUT_FORMATS ("m4b", "opus", "mp3")
+            bitrate: Override the format's default bitrate
+            metadata: Book-level tags, e.g. {"title": ..., "artist": ...}
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported output format: {output_format}")
+
+        self.output_format = output_format
+        self.settings = OUTPUT_FORMATS[output_format]
+        self.bitrate = bitrate or self.settings["bitrate"]
+        self.metadata = metadata or {}
+        self.output_filename = output_base + self.settings["extension"]
+
+        self.chapters = []
+        self.samples_written = 0
+
+        # Encode into a temp file; chapter markers are muxed in on close
+        self.encoded_filename = output_base + ".encoding" + self.settings["extension"]
+        self.stderr_file = tempfile.TemporaryFile()
+        self.process = subprocess.Popen(
+            [
+                "ffmpeg", "-y", "-loglevel", "error",
+                "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "pipe:0",
+                "-c:a", self.settings["codec"], "-b:a", self.bitrate,
+                "-f", self.settings["muxer"], self.encoded_filename,
+            ],
+            stdin=subprocess.PIPE,
+            stderr=self.stderr_file,
+        )
+
+    def write(self, audio, chapter_title=None, file_stem=None):
+        """
+        Append audio to the book. Passing chapter_title starts a new chapter
+        marker at the current position; file_stem names its split file.
+        """
+        if chapter_title is not None:
+            self.start_chapter(chapter_title, file_stem)
+
+        if isinstance(audio, AudioSegment):
+            # No-ops for speaker output, which is already 24 kHz 16-bit mono
+            audio = audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2)
+            pcm = audio.raw_data
+        else:
+            pcm = bytes(audio)
+
+        try:
+            self.process.stdin.write(pcm)
+        except BrokenPipeError:
+            raise RuntimeError(f"ffmpeg stopped accepting audio: {self.read_errors()}")
+
+        self.samples_written += len(pcm) // 2
+        if self.chapters:
+            self.chapters[-1]["end"] = self.samples_written
+
+    def write_silence(self, duration_ms):
+        """Append a pause to the current chapter"""
+        self.write(b"\x00\x00" * int(SAMPLE_RATE * duration_ms / 1000))
+
+    def start_chapter(self, title, file_stem=None):
+        self.chapters.append({
+            "title": title,
+            "file_stem": file_stem or f"chapter_{len(self.chapters) + 1:02d}",
+            "start": self.samples_written,
+            "end": self.samples_written,
+        })
+
+    @property
+    def duration_seconds(self):
+        return self.samples_written / SAMPLE_RATE
+
+    def read_errors(self):
+        self.stderr_file.seek(0)
+        return self.stderr_file.read().decode("utf-8", errors="replace").strip()[-2000:]
+
+    def build_metadata_file(self):
+        """Write an FFMETADATA1 file with book tags and chapter markers"""
+        lines = [";FFMETADATA1"]
+        for key, value in self.metadata.items():
+            lines.append(f"{key}={escape_metadata(value)}")
+
+        for chapter in self.chapters:
+            lines += [
+                "[CHAPTER]",
+                f"TIMEBASE=1/{SAMPLE_RATE}",
+                f"START={chapter['start']}",
+                f"END={chapter['end']}",
+                f"title={escape_metadata(chapter['title'])}",
+            ]
+
+        fd, path = tempfile.mkstemp(suffix=".ffmeta")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        return path
+
+    def close(self):
+        """Finish encoding and mux in the chapter markers (stream copy, no re-encode)"""
+        self.process.stdin.close()
+        return_code = self.process.wait()
+        if return_code != 0:
+            errors = self.read_errors()
+            self.abort()
+            raise RuntimeError(f"ffmpeg encode failed: {errors}")
+        self.stderr_file.close()
+
+        metadata_file = self.build_metadata_file()
+        try:
+            result = subprocess.run(
+                [
+                    "ffmpeg", "-y", "-loglevel", "error",
+                    "-i", self.encoded_filename, "-i", metadata_file,
+                    "-map", "0:a", "-map_metadata", "1", "-map_chapters", "1",
+                    "-c", "copy", "-f", self.settings["muxer"], self.output_filename,
+                ],
+                capture_output=True,
+            )
+            if result.returncode != 0:
+                # The encoded audio is left in place so nothing is lost
+                raise RuntimeError(
+                    f"ffmpeg chapter mux failed, audio kept in {self.encoded_filename}: "
+                    f"{result.stderr.decode(errors='replace')}"
+                )
+            os.remove(self.encoded_filename)
+        finally:
+            os.remove(metadata_file)
+
+        return self.output_filename
+
+    def abort(self):
+        """Stop ffmpeg and delete the partial encode of a render that will not be closed"""
+        if self.process.poll() is None:
+            self.process.kill()
+        self.process.wait()
+        try:
+            self.process.stdin.close()
+        except OSError:
+            # Unflushed PCM has nowhere to go once ffmpeg is gone
+            pass
+        self.stderr_file.close()
+        if os.path.exists(self.encoded_filename):
+            os.remove(self.encoded_filename)
+
+    def split_chapters(self, output_folder):
+        """
+        Cut the finished book into one file per chapter by stream copy.
+        Returns the list of written files.
+        """
+        os.makedirs(output_folder, exist_ok=True)
+        files = []
+
+        for number, chapter in enumerate(self.chapters, 1):
+            filename = os.path.join(output_folder, chapter["file_stem"] + self.settings["extension"])
+            result = subprocess.run(
+                [
+                    "ffmpeg", "-y", "-loglevel", "error",
+                    "-i", self.output_filename,
+                    "-ss", f"{chapter['start'] / SAMPLE_RATE:.3f}",
+                    "-to", f"{chapter['end'] / SAMPLE_RATE:.3f}",
+                    "-map", "0:a", "-map_chapters", "-1",
+                    "-metadata", f"title={chapter['title']}",
+                    "-c", "copy", "-f", self.settings["muxer"], filename,
+                ],
+                capture_output=True,
+            )
+            if result.returncode != 0:
+                print(f"⚠️ Could not split chapter {number}: {result.stderr.decode(errors='replace').strip()}")
+                continue
+            files.append(filename)
+
+        return files
@@ -0,0 +1,199 @@
+import os
+import io
+import time
+import sqlite3
+import threading
+import numpy as np
+import soundfile as sf
+from tts_backends import SAMPLE_RATE
+
+# How clips are kept on disk: half-precision samples, or 16-bit FLAC (about half again)
+CODECS = {
+    "float16": ".npy",
+    "flac": ".flac",
+}
+
+
+class AudioStore:
+    """
+    Synthesized audio shared by every book rendered on this machine, keyed
+    by the speaker's memo key (text, voice, speed, modulation and model
+    version), so front matter, boilerplate, chapter titles and common short
+    lines are synthesized once per voice, not once per book.
+
+    Clips live under objects/ as one file each; a SQLite index (WAL, one
+    connection per call) tracks sizes and last use so any number of render
+    processes can read, write and evict concurrently. When the store grows
+    past max_bytes, least recently used clips are evicted down to 90%.
+    """
+
+    def __init__(self, root, max_bytes=20 * 1024 ** 3, codec="float16"):
+        """
+        Args:
+            root: Store folder (shared by all books)
+            max_bytes: Disk budget for the clips
+            codec: "float16" or "flac" (see CODECS)
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unknown audio store codec: {codec}")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.codec = codec
+        self.db_path = os.path.join(root, "index.sqlite3")
+        os.makedirs(os.path.join(root, "objects"), exist_ok=True)
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "served_samples": 0,
+                      "written_bytes": 0, "evicted": 0, "evicted_bytes": 0}
+        self.stats_lock = threading.Lock()
+
+        db = self.connect()
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS clips ("
+                "key TEXT PRIMARY KEY, path TEXT, bytes INTEGER, samples INTEGER, "
+                "created REAL, last_used REAL, hits INTEGER)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS clips_last_used ON clips (last_used)")
+        finally:
+            db.close()
+
+    def connect(self):
+        # Autocommit; writes that must be atomic open their own transaction
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def count(self, stat, amount=1):
+        with self.stats_lock:
+            self.stats[stat] += amount
+
+    def object_path(self, key):
+        # Two-level fan-out keeps directories small
+        return os.path.join("objects", key[:2], key + CODECS[self.codec])
+
+    def encode(self, audio):
+        buffer = io.BytesIO()
+        if self.codec == "flac":
+            sf.write(buffer, np.clip(audio, -1.0, 1.0), SAMPLE_RATE, format="FLAC", subtype="PCM_16")
+        else:
+            np.save(buffer, np.asarray(audio, dtype=np.float16))
+        return buffer.getvalue()
+
+    def decode(self, path):
+        if path.endswith(".flac"):
+            audio, _ = sf.read(path, dtype="float32")
+            return audio
+        return np.load(path).astype(np.float32)
+
+    def get(self, key):
+        """Float32 samples stored under key, or None"""
+        db = self.connect()
+        try:
+            row = db.execute("SELECT path FROM clips WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.count("misses")
+                return None
+            try:
+                audio = self.decode(os.path.join(self.root, row[0]))
+            except (OSError, ValueError, RuntimeError):
+                # Evicted by another process between the lookup and the read
+                db.execute("DELETE FROM clips WHERE key = ? AND path = ?", (key, row[0]))
+                self.count("misses")
+                return None
+            db.execute("UPDATE clips SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        finally:
+            db.close()
+
+        self.count("hits")
+        self.count("served_samples", len(audio))
+        return audio
+
+    def put(self, key, audio):
+        relative_path = self.object_path(key)
+        path = os.path.join(self.root, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = self.encode(audio)
+
+        # Unique temp file, then an atomic rename: readers never see half a clip
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        now = time.time()
+        db = self.connect()
+        try:
+            db.execute(
+                "INSERT OR REPLACE INTO clips VALUES (?, ?, ?, ?, ?, ?, COALESCE("
+                "(SELECT hits FROM clips WHERE key = ?), 0))",
+                (key, relative_path, len(data), len(audio), now, now, key)
+            )
+        finally:
+            db.close()
+
+        self.count("writes")
+        self.count("written_bytes", len(data))
+        self.evict()
+
+    def used_bytes(self):
+        db = self.connect()
+        try:
+            return db.execute("SELECT COALESCE(SUM(bytes), 0) FROM clips").fetchone()[0]
+        finally:
+            db.close()
+
+    def evict(self):
+        """Drop least recently used clips until the store is back under 90% of max_bytes"""
+        db = self.connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            used = db.execute("SELECT COALESCE(SUM(bytes), 0) FROM clips").fetchone()[0]
+            if used <= self.max_bytes:
+                db.execute("COMMIT")
+                return []
+            victims = []
+            target = used - int(self.max_bytes * 0.9)
+            for key, relative_path, size in db.execute("SELECT key, path, bytes FROM clips ORDER BY last_used"):
+                if target <= 0:
+                    break
+                victims.append((key, relative_path, size))
+                target -= size
+            db.executemany("DELETE FROM clips WHERE key = ?", [(key,) for key, _, _ in victims])
+            db.execute("COMMIT")
+        finally:
+            db.close()
+
+        # Files go after the commit: a concurrent reader either finds the row and
+        # the file, or a missing file it treats as a miss
+        for _, relative_path, size in victims:
+            try:
+                os.remove(os.path.join(self.root, relative_path))
+            except FileNotFoundError:
+                pass
+            self.count("evicted")
+            self.count("evicted_bytes", size)
+        return victims
+
+    def print_report(self):
+        stats = self.stats
+        lookups = stats["hits"] + stats["misses"]
+        if not lookups and not stats["writes"]:
+            return stats
+        reused_s = stats["served_samples"] / SAMPLE_RATE
+        print(f"💽 Audio store: {stats['hits'] / max(1, lookups):.0%} hit rate "
+              f"({stats['hits']} hits, {stats['misses']} misses) | "
+              f"{reused_s / 60:.1f} min of audio not re-synthesized "
+              f"({stats['served_samples'] * 4 / 1024 / 1024:.1f} MB as float32) | "
+              f"{self.used_bytes() / 1024 ** 3:.2f}/{self.max_bytes / 1024 ** 3:.0f} GB used, "
+              f"{stats['evicted']} evicted")
+        return stats
+
+
+def open_audio_store():
+    """The store configured by AUDIO_STORE_DIR (AUDIO_STORE_MAX_GB, AUDIO_STORE_CODEC), or None"""
+    root = os.getenv("AUDIO_STORE_DIR")
+    if not root:
+        return None
+    return AudioStore(
+        root,
+        max_bytes=int(float(os.getenv("AUDIO_STORE_MAX_GB", "20")) * 1024 ** 3),
+        codec=os.getenv("AUDIO_STORE_CODEC", "float16"),
+    )
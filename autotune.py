@@ -0,0 +1,150 @@
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+import subprocess
+from speaker import TUNING_FILE, MAX_PHONEMES, SAMPLE_RATE
+from render_estimate import PROFILE_FILE, save_profile
+
+# Standard workload: narration, dialogue and a long sentence, about 40 s of audio
+WORKLOAD = [
+    "The house at the end of the lane had been empty for as long as anyone could remember. "
+    "Its windows were dark, its garden overgrown, and the gate hung from a single hinge.",
+    "\"Did you hear that?\" Mary whispered. \"Someone is inside.\" "
+    "\"It's only the wind,\" said John, though he did not sound certain.",
+    "They crept up the path together, past the rose bushes that had long since turned wild, "
+    "past the broken fountain and the stone bench where, years ago, an old man used to sit "
+    "every afternoon and feed the birds that gathered around his feet in the fading light.",
+    "Inside, the air was cold and still. Dust covered everything. On the table lay a letter, "
+    "its envelope unopened, addressed to a name neither of them knew.",
+]
+
+
+def run_point(chunk_phonemes):
+    """
+    Child process: load and warm up the speaker, wait for the parent's go
+    signal so all workers start together, synthesize the workload once.
+    """
+    from speaker import AudiobookSpeaker
+    speaker = AudiobookSpeaker(memo_dir=None, chunk_phonemes=chunk_phonemes, audio_store=False)
+    narrator = {"character": "narrator", "emotion": "neutral"}
+
+    print("ready", flush=True)
+    sys.stdin.readline()
+
+    start = time.time()
+    audio_seconds = 0.0
+    for paragraph in WORKLOAD:
+        audio = speaker.synthesize(paragraph, narrator)
+        if audio is not None:
+            audio_seconds += len(audio) / SAMPLE_RATE
+    print(json.dumps({"start": start, "end": time.time(), "audio_seconds": audio_seconds}), flush=True)
+
+
+def measure(workers, threads, chunk_phonemes):
+    """Combined real-time factor (wall time / total audio) of `workers` processes with `threads` torch threads each"""
+    env = dict(os.environ, OMP_NUM_THREADS=str(threads), MKL_NUM_THREADS=str(threads))
+    processes = [
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "point", "--chunk", str(chunk_phonemes)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, env=env, text=True
+        )
+        for _ in range(workers)
+    ]
+
+    # Wait until every worker has loaded the model, then start them together
+    for process in processes:
+        while True:
+            line = process.stdout.readline()
+            if not line or line.strip() == "ready":
+                break
+    for process in processes:
+        process.stdin.write("go\n")
+        process.stdin.flush()
+
+    results = []
+    for process in processes:
+        for line in process.stdout:
+            if line.startswith("{"):
+                results.append(json.loads(line))
+        process.wait()
+
+    if len(results) != workers:
+        return None
+    wall = max(r["end"] for r in results) - min(r["start"] for r in results)
+    audio = sum(r["audio_seconds"] for r in results)
+    return wall / audio if audio else None
+
+
+def default_grid():
+    cpus = os.cpu_count() or 1
+    workers = [w for w in (1, 2, 4) if w <= cpus]
+    threads = [t for t in (1, 2, 4, 8) if t <= cpus]
+    return workers, threads, [200, 350, MAX_PHONEMES]
+
+
+def autotune(workers_grid=None, threads_grid=None, chunk_grid=None, output=TUNING_FILE):
+    """Measure every grid point that fits on this machine and save the fastest"""
+    default_workers, default_threads, default_chunks = default_grid()
+    workers_grid = workers_grid or default_workers
+    threads_grid = threads_grid or default_threads
+    chunk_grid = chunk_grid or default_chunks
+    cpus = os.cpu_count() or 1
+
+    results = []
+    for workers, threads, chunk in itertools.product(workers_grid, threads_grid, chunk_grid):
+        if workers * threads > cpus:
+            continue
+        rtf = measure(workers, threads, chunk)
+        if rtf is None:
+            print(f"   ❌ workers={workers} threads={threads} chunk={chunk}: failed")
+            continue
+        print(f"   workers={workers} threads={threads} chunk={chunk}: RTF {rtf:.3f}")
+        results.append({"workers": workers, "threads": threads, "chunk_phonemes": chunk, "rtf": rtf})
+
+    if not results:
+        print("❌ No configuration completed.")
+        return None
+
+    best = min(results, key=lambda result: result["rtf"])
+    tuning = dict(best, cpus=cpus, tuned=time.strftime("%Y-%m-%d %H:%M:%S"), grid=results)
+
+    tmp_path = output + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(tuning, f, indent=2)
+    os.replace(tmp_path, output)
+
+    # The dry-run estimator models a single render process; the measured RTF is
+    # the combined throughput of all workers, so scale it back to one process
+    save_profile({"kokoro_rtf": best["rtf"] * best["workers"]}, PROFILE_FILE)
+
+    print(f"\n🏁 Best: {best['workers']} worker(s) x {best['threads']} thread(s), "
+          f"{best['chunk_phonemes']}-phoneme chunks, RTF {best['rtf']:.3f}")
+    print(f"💾 Saved to {output}; renders and 'work_queue.py local' pick it up automatically")
+    return tuning
+
+
+def parse_list(value):
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Find the fastest synthesis settings for this CPU")
+    subparsers = parser.add_subparsers(dest="command")
+
+    point_parser = subparsers.add_parser("point", help=argparse.SUPPRESS)
+    point_parser.add_argument("--chunk", type=int, default=MAX_PHONEMES)
+
+    parser.add_argument("--workers", type=parse_list, default=None, help="e.g. 1,2,4")
+    parser.add_argument("--threads", type=parse_list, default=None, help="e.g. 1,2,4,8")
+    parser.add_argument("--chunks", type=parse_list, default=None, help="e.g. 200,350,510")
+    parser.add_argument("--output", default=TUNING_FILE)
+
+    args = parser.parse_args()
+
+    if args.command == "point":
+        run_point(args.chunk)
+    else:
+        autotune(args.workers, args.threads, args.chunks, args.output)
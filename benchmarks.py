@@ -0,0 +1,389 @@
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from main import StoryDirector
+from loudness import LoudnessMeter, LoudnessNormalizer
+from scipy.signal import stft
+
+from speaker import SAMPLE_RATE, AudiobookSpeaker, BACKENDS, KOKORO_RUNTIMES, MAX_PHONEMES
+from chunking import SentenceChunker, split_by_length
+from director_backends import create_director_backend
+from audio_export import BookEncoder
+from render_estimate import PROFILE_FILE, save_profile
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def sample_paragraphs(pdf_path, count):
+    """Take the first `count` non-trivial paragraphs from a PDF"""
+    director = StoryDirector()
+    full_text = director.extract_text_from_pdf(pdf_path)
+
+    paragraphs = []
+    for block in full_text.split("\n\n"):
+        paragraph = " ".join(line.strip() for line in block.split("\n") if line.strip())
+        if len(paragraph.split()) >= 5:
+            paragraphs.append(paragraph)
+        if len(paragraphs) >= count:
+            break
+
+    return paragraphs
+
+
+def bench_director_schema(pdf_path, count=20):
+    """Compare output tokens and latency of the verbose and compact director schemas"""
+    paragraphs = sample_paragraphs(pdf_path, count)
+    results = {}
+
+    for schema in ("verbose", "compact"):
+        director = StoryDirector(schema=schema)
+        previous = ""
+        for paragraph in paragraphs:
+            director.analyze_scene(paragraph, previous)
+            previous = paragraph
+
+        completion = [entry["completion_tokens"] for entry in director.usage_log]
+        latency = [entry["latency_s"] for entry in director.usage_log]
+        results[schema] = {
+            "paragraphs": len(paragraphs),
+            "output_tokens_per_paragraph": statistics.mean(completion) if completion else 0,
+            "avg_latency_s": statistics.mean(latency) if latency else 0,
+            "repaired": director.schema_stats["repaired"],
+            "defaulted": director.schema_stats["defaulted"],
+        }
+
+    print("\n📊 Director schema benchmark")
+    for schema, stats in results.items():
+        print(f"   {schema:8} {stats['output_tokens_per_paragraph']:6.1f} output tokens/paragraph | "
+              f"avg {stats['avg_latency_s']:.2f}s | "
+              f"{stats['repaired']} repaired, {stats['defaulted']} defaulted")
+
+    return results
+
+
+def synthetic_speech(seconds, seed=0):
+    """Noise with a syllable-rate envelope and pauses, roughly speech-like in level and crest factor"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t), 0, None) * (np.sin(2 * np.pi * 0.2 * t) > -0.5)
+    return (rng.standard_normal(len(t)) * envelope * 0.2).astype(np.float32)
+
+
+def bench_loudness(minutes=30, chapter_minutes=10):
+    """Cost of the two loudness passes, scaled to seconds per audio-hour"""
+    normalizer = LoudnessNormalizer()
+    meter_time = 0.0
+    normalize_time = 0.0
+    chapters = max(1, int(minutes // chapter_minutes))
+
+    for chapter in range(chapters):
+        samples = synthetic_speech(chapter_minutes * 60, seed=chapter)
+
+        start = time.perf_counter()
+        meter = LoudnessMeter()
+        # Fed in paragraph-sized pieces, as during synthesis
+        for offset in range(0, len(samples), SAMPLE_RATE * 20):
+            meter.feed(samples[offset:offset + SAMPLE_RATE * 20])
+        loudness = meter.integrated_lufs()
+        meter_time += time.perf_counter() - start
+
+        start = time.perf_counter()
+        normalizer.process(samples, normalizer.gain_for(loudness))
+        normalize_time += time.perf_counter() - start
+
+    audio_hours = chapters * chapter_minutes / 60
+    results = {
+        "audio_minutes": chapters * chapter_minutes,
+        "measure_s_per_audio_hour": meter_time / audio_hours,
+        "normalize_s_per_audio_hour": normalize_time / audio_hours,
+        "limited_blocks": normalizer.stats["limited_blocks"],
+    }
+
+    print("\n📊 Loudness benchmark")
+    print(f"   Pass 1 (measure):        {results['measure_s_per_audio_hour']:.1f} s per audio-hour")
+    print(f"   Pass 2 (gain + limiter): {results['normalize_s_per_audio_hour']:.1f} s per audio-hour")
+
+    return results
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process, or None where it cannot be read"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return peak / 1024 / 1024 if peak > 1 << 32 else peak / 1024
+
+
+def bench_encode(minutes=5, output_format="m4b"):
+    """Seconds per audio-hour spent encoding with ffmpeg"""
+    samples = (np.clip(synthetic_speech(minutes * 60), -1, 1) * 32767).astype(np.int16)
+    output_base = os.path.join(tempfile.mkdtemp(), "encode_bench")
+
+    start = time.perf_counter()
+    encoder = BookEncoder(output_base, output_format=output_format)
+    encoder.write(samples.tobytes(), chapter_title="Benchmark")
+    os.remove(encoder.close())
+    return (time.perf_counter() - start) / (minutes / 60)
+
+
+def calibrate(pdf_path, count=8, profile_path=PROFILE_FILE, skip_llm=False):
+    """
+    Measure this machine's Kokoro real-time factor, speaking rate, memory and
+    finishing cost, plus Groq latency and tokens, and store them as the
+    profile the dry-run estimator uses.
+    """
+    paragraphs = sample_paragraphs(pdf_path, count)
+    profile = {}
+
+    # The speaker warms the pipeline up, so the first paragraph is not a cold start
+    speaker = AudiobookSpeaker(memo_dir=None, audio_store=False)
+    narrator = {"character": "narrator", "emotion": "neutral"}
+
+    synth_time = 0.0
+    audio_seconds = 0.0
+    characters = 0
+    for paragraph in paragraphs:
+        start = time.perf_counter()
+        audio = speaker.synthesize(paragraph, narrator)
+        synth_time += time.perf_counter() - start
+        if audio is not None:
+            audio_seconds += len(audio) / SAMPLE_RATE
+            characters += len(paragraph)
+
+    if audio_seconds:
+        profile["kokoro_rtf"] = synth_time / audio_seconds
+        profile["chars_per_audio_second"] = characters / audio_seconds
+    rss = peak_rss_mb()
+    if rss is not None:
+        profile["model_rss_mb"] = rss
+
+    finish = bench_loudness(minutes=10)
+    finish_s = finish["measure_s_per_audio_hour"] + finish["normalize_s_per_audio_hour"]
+    try:
+        finish_s += bench_encode()
+    except (OSError, RuntimeError) as e:
+        print(f"⚠️ Encode benchmark skipped: {e}")
+    profile["finish_s_per_audio_hour"] = finish_s
+
+    if not skip_llm:
+        director = StoryDirector()
+        prompt_chars = 0
+        previous = ""
+        for paragraph in paragraphs:
+            prompt_chars += len(director.build_prompt(paragraph, previous))
+            director.analyze_scene(paragraph, previous)
+            previous = paragraph
+
+        report = director.get_usage_report()
+        profile["llm_latency_s"] = {model: stats["avg_latency_s"] for model, stats in report["models"].items()}
+        prompt_tokens = sum(entry["prompt_tokens"] for entry in director.usage_log)
+        completion_tokens = [entry["completion_tokens"] for entry in director.usage_log]
+        if prompt_tokens:
+            profile["chars_per_prompt_token"] = prompt_chars / prompt_tokens
+        if completion_tokens:
+            profile["completion_tokens"] = {director.schema: statistics.mean(completion_tokens)}
+
+    profile["calibrated"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    save_profile(profile, profile_path)
+
+    print("\n📊 Calibration")
+    print(f"   Kokoro RTF: {profile.get('kokoro_rtf', 0):.2f} | "
+          f"{profile.get('chars_per_audio_second', 0):.1f} chars per audio-second")
+    print(f"   Finishing: {finish_s:.0f} s per audio-hour")
+    for model, latency in profile.get("llm_latency_s", {}).items():
+        print(f"   {model}: {latency:.2f}s per call")
+    print(f"💾 Saved to {profile_path}")
+
+    return profile
+
+
+def log_spectral_distance(reference, candidate):
+    """
+    Log-spectral distance in dB between two renders of the same phonemes,
+    over their common length (the predicted durations can differ slightly)
+    """
+    length = min(len(reference), len(candidate))
+    _, _, ref_spec = stft(np.asarray(reference[:length], dtype=np.float32), nperseg=1024, noverlap=768)
+    _, _, cand_spec = stft(np.asarray(candidate[:length], dtype=np.float32), nperseg=1024, noverlap=768)
+    ref_db = 20 * np.log10(np.abs(ref_spec) + 1e-5)
+    cand_db = 20 * np.log10(np.abs(cand_spec) + 1e-5)
+    return float(np.mean(np.sqrt(np.mean((ref_db - cand_db) ** 2, axis=0))))
+
+
+# Largest acceptable log-spectral distance to the torch render, in dB
+PARITY_LIMITS_DB = {"onnx": 1.5, "onnx-int8": 4.0}
+
+
+def bench_onnx_parity(max_lsd_db=PARITY_LIMITS_DB):
+    """
+    Render the standard workload with torch and each ONNX backend from the
+    same phonemes and voice, and compare spectra. Returns (results, passed).
+    """
+    from autotune import WORKLOAD
+
+    reference = AudiobookSpeaker(memo_dir=None, backend="torch", audio_store=False)
+    voice = reference.resolve_voice(reference.voice_library["neutral_narrator"])
+    chunks = [chunk for paragraph in WORKLOAD for chunk in reference.phoneme_chunks(paragraph)]
+
+    def render(speaker):
+        return [np.concatenate(speaker.shared.generate_from_phonemes([chunk], voice, 1.0)) for chunk in chunks]
+
+    reference_audio = render(reference)
+    results = {}
+    passed = True
+    for backend in ("onnx", "onnx-int8"):
+        with AudiobookSpeaker(memo_dir=None, backend=backend, audio_store=False) as candidate:
+            candidate_audio = render(candidate)
+        distances = [log_spectral_distance(a, b) for a, b in zip(reference_audio, candidate_audio)]
+        length_ratio = sum(map(len, candidate_audio)) / sum(map(len, reference_audio))
+        ok = max(distances) <= max_lsd_db[backend]
+        passed = passed and ok
+        results[backend] = {"mean_lsd_db": statistics.mean(distances), "max_lsd_db": max(distances),
+                            "length_ratio": length_ratio, "passed": ok}
+
+    print("\n📊 ONNX parity vs torch (log-spectral distance)")
+    for backend, stats in results.items():
+        print(f"   {backend:9} mean {stats['mean_lsd_db']:.2f} dB, max {stats['max_lsd_db']:.2f} dB "
+              f"(limit {max_lsd_db[backend]} dB), length x{stats['length_ratio']:.3f} "
+              f"{'✅' if stats['passed'] else '❌'}")
+    return results, passed
+
+
+def backend_point(backend):
+    """Child process: RTF and peak RSS of one backend on the standard workload"""
+    from autotune import WORKLOAD
+
+    start = time.perf_counter()
+    speaker = AudiobookSpeaker(memo_dir=None, backend=backend, audio_store=False)
+    load_s = time.perf_counter() - start
+    narrator = {"character": "narrator", "emotion": "neutral"}
+
+    start = time.perf_counter()
+    audio_seconds = sum(len(speaker.synthesize(paragraph, narrator)) / SAMPLE_RATE for paragraph in WORKLOAD)
+    synth_s = time.perf_counter() - start
+    print(json.dumps({"load_s": load_s, "rtf": synth_s / audio_seconds, "peak_rss_mb": peak_rss_mb()}))
+
+
+def bench_backends(backends=KOKORO_RUNTIMES):
+    """RTF and resident memory per backend, each measured in a fresh process"""
+    results = {}
+    for backend in backends:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "backend-point", backend],
+            capture_output=True, text=True
+        )
+        lines = [line for line in output.stdout.splitlines() if line.startswith("{")]
+        if output.returncode != 0 or not lines:
+            print(f"   ❌ {backend}: {output.stderr.strip()[-300:]}")
+            continue
+        results[backend] = json.loads(lines[-1])
+
+    print("\n📊 TTS backends")
+    for backend, stats in results.items():
+        rss = f"{stats['peak_rss_mb']:.0f} MB" if stats["peak_rss_mb"] is not None else "n/a"
+        print(f"   {backend:9} RTF {stats['rtf']:.3f} | peak RSS {rss} | load {stats['load_s']:.1f}s")
+    return results
+
+
+def bench_chunking(pdf_path, max_chars=6000, synthesize=True):
+    """
+    The old 1,000-character line splitter against the sentence chunker on the
+    start of a book: units, acoustic-model calls, window left unused (padding),
+    units cut mid-sentence and real-time factor
+    """
+    director = StoryDirector(backend=create_director_backend("rules"))
+    full_text = director.extract_text_from_pdf(pdf_path)
+    text = full_text if len(full_text) <= max_chars else full_text[:full_text.rfind("\n", 0, max_chars) + 1 or max_chars]
+    narrator = {"character": "narrator", "emotion": "neutral"}
+
+    results = {}
+    for method in ("length", "sentences"):
+        # A fresh speaker per method, so neither is served from the other's audio memo
+        speaker = AudiobookSpeaker(memo_dir=None, audio_store=False)
+        units = split_by_length(text) if method == "length" else SentenceChunker(speaker).chunk(text)
+        units = [unit for unit in units if unit.strip()]
+        calls = [chunk for unit in units for chunk in speaker.phoneme_chunks(unit)]
+        stats = {
+            "units": len(units),
+            "model_calls": len(calls),
+            "padding": 1 - sum(map(len, calls)) / (len(calls) * MAX_PHONEMES) if calls else 0.0,
+            "mid_sentence_cuts": sum(1 for unit in units if not re.search(r'[.!?\u2026]["\'\u201d\u2019)]?\s*$', unit)),
+        }
+        if synthesize:
+            start = time.perf_counter()
+            audio_seconds = sum(len(audio) / SAMPLE_RATE for audio in
+                                (speaker.synthesize(unit, narrator) for unit in units) if audio is not None)
+            stats["rtf"] = (time.perf_counter() - start) / audio_seconds if audio_seconds else None
+        results[method] = stats
+        speaker.close()
+
+    print(f"\n📊 Chunking ({len(text):,} characters)")
+    for method, stats in results.items():
+        rtf = f" | RTF {stats['rtf']:.3f}" if stats.get("rtf") is not None else ""
+        print(f"   {method:9} {stats['units']} units, {stats['model_calls']} model calls, "
+              f"{stats['padding']:.0%} window unused, {stats['mid_sentence_cuts']} mid-sentence cuts{rtf}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Audiobook pipeline benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    schema_parser = subparsers.add_parser("director-schema", help="Output tokens per paragraph, verbose vs compact")
+    schema_parser.add_argument("pdf_path")
+    schema_parser.add_argument("--paragraphs", type=int, default=20)
+
+    loudness_parser = subparsers.add_parser("loudness", help="Cost of loudness normalization per audio-hour")
+    loudness_parser.add_argument("--minutes", type=float, default=30)
+
+    calibrate_parser = subparsers.add_parser("calibrate", help="Measure this machine for the dry-run estimator")
+    calibrate_parser.add_argument("pdf_path")
+    calibrate_parser.add_argument("--paragraphs", type=int, default=8)
+    calibrate_parser.add_argument("--profile", default=PROFILE_FILE)
+    calibrate_parser.add_argument("--skip-llm", action="store_true")
+
+    subparsers.add_parser("onnx-parity", help="Spectral distance of ONNX backends to torch")
+    backends_parser = subparsers.add_parser("backends", help="RTF and RSS per TTS backend (Kokoro runtimes by default)")
+    backends_parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(KOKORO_RUNTIMES))
+    point_parser = subparsers.add_parser("backend-point", help=argparse.SUPPRESS)
+    point_parser.add_argument("backend", choices=BACKENDS)
+
+    chunking_parser = subparsers.add_parser("chunking", help="Line splitter vs sentence chunker: calls, padding, RTF")
+    chunking_parser.add_argument("pdf_path")
+    chunking_parser.add_argument("--chars", type=int, default=6000)
+    chunking_parser.add_argument("--skip-synthesis", action="store_true")
+
+    args = parser.parse_args()
+
+    if args.benchmark == "director-schema":
+        results = bench_director_schema(args.pdf_path, args.paragraphs)
+    elif args.benchmark == "loudness":
+        results = bench_loudness(args.minutes)
+    elif args.benchmark == "calibrate":
+        results = calibrate(args.pdf_path, args.paragraphs, args.profile, args.skip_llm)
+    elif args.benchmark == "onnx-parity":
+        results, passed = bench_onnx_parity()
+        print(json.dumps(results, indent=2))
+        sys.exit(0 if passed else 1)
+    elif args.benchmark == "backends":
+        results = bench_backends(args.backends)
+    elif args.benchmark == "chunking":
+        results = bench_chunking(args.pdf_path, args.chars, not args.skip_synthesis)
+    elif args.benchmark == "backend-point":
+        backend_point(args.backend)
+        sys.exit(0)
+
+    print(json.dumps(results, indent=2))
@@ -0,0 +1,270 @@
+import os
+import json
+import time
+import hashlib
+import argparse
+import threading
+from audio_export import BookEncoder, OUTPUT_FORMATS
+from loudness import LoudnessMeter, LoudnessNormalizer
+from orchestrator import ChapterBasedAudiobookAgent, audio_to_segment, segment_to_samples
+
+
+class ChapterScheduler:
+    """
+    Renders chapters in priority order on a background thread, for listeners
+    who jump into the middle of a book. play_from(N) puts chapter N first and
+    the following chapters behind it as prefetch; priorities can be changed
+    at any time and take effect when the current chapter finishes. Rendered
+    chapters are cached per content and casting hash and served without re-rendering.
+    """
+
+    def __init__(self, agent, output_format="mp3", prefetch=3, target_lufs=-18.0):
+        """
+        Args:
+            agent: A loaded ChapterBasedAudiobookAgent
+            output_format: Format of the per-chapter files (one of OUTPUT_FORMATS)
+            prefetch: Chapters after the requested one to render ahead
+            target_lufs: Loudness every chapter is normalized to (None to disable)
+        """
+        self.agent = agent
+        self.output_format = output_format
+        self.prefetch = prefetch
+        self.normalizer = LoudnessNormalizer(target_lufs=target_lufs) if target_lufs is not None else None
+        self.cache_folder = os.path.join(agent.output_folder, "chapter_cache")
+        os.makedirs(self.cache_folder, exist_ok=True)
+
+        self.condition = threading.Condition()
+        self.pending = {}      # chapter number -> (priority, sequence)
+        self.ready = {}        # chapter number -> file path
+        self.failed = {}       # chapter number -> error
+        self.rendering = None
+        self.sequence = 0
+        self.stopped = False
+
+        self.stats = {"cache_hits": 0, "rendered": 0, "wait_latency_s": []}
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def casting(self, chapter_num):
+        """
+        The chapter's directions and voices as last rendered (render manifest),
+        the registry entries of its characters and the voice library
+        """
+        manifest = self.agent.render_manifest
+        paragraphs = [manifest.lookup(segment["hash"]) or {} for segment in manifest.segments(chapter_num)]
+        names = {str(paragraph.get("directions", {}).get("primary_character") or "").strip().lower()
+                 for paragraph in paragraphs}
+        registry = self.agent.character_registry.characters
+        return [
+            [[paragraph.get("directions"), paragraph.get("voice")] for paragraph in paragraphs],
+            {name: registry[name] for name in sorted(names) if name in registry},
+            self.agent.speaker.voice_library,
+        ]
+
+    def cache_path(self, chapter_num):
+        """File for a chapter, keyed by its text, its casting and everything else that changes the audio"""
+        chapter = self.agent.chapters[chapter_num - 1]
+        key = hashlib.sha256(json.dumps([
+            chapter["title"], chapter["content"], self.agent.speaker.backend.version,
+            self.normalizer.target_lufs if self.normalizer else None,
+            self.casting(chapter_num),
+        ], sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+        extension = OUTPUT_FORMATS[self.output_format]["extension"]
+        return os.path.join(self.cache_folder, f"chapter_{chapter_num:02d}_{key}{extension}")
+
+    def request(self, chapter_num, priority):
+        """Queue a chapter (or change its priority); lower numbers render first"""
+        if not 1 <= chapter_num <= len(self.agent.chapters):
+            print(f"⚠️ Chapter {chapter_num} not found. Skipping.")
+            return False
+
+        with self.condition:
+            # A failure is not final: asking again gives the chapter another attempt
+            self.failed.pop(chapter_num, None)
+            if chapter_num in self.ready or chapter_num == self.rendering:
+                return True
+            if os.path.exists(self.cache_path(chapter_num)):
+                self.ready[chapter_num] = self.cache_path(chapter_num)
+                self.stats["cache_hits"] += 1
+                self.condition.notify_all()
+                return True
+            self.sequence += 1
+            self.pending[chapter_num] = (priority, self.sequence)
+            self.condition.notify_all()
+        return True
+
+    def play_from(self, chapter_num, prefetch=None):
+        """
+        Make chapter_num the next chapter rendered and prefetch the ones after
+        it in reading order. Prefetches for the previous position are dropped.
+        """
+        prefetch = self.prefetch if prefetch is None else prefetch
+        with self.condition:
+            self.pending.clear()
+
+        self.request(chapter_num, 0)
+        last = min(chapter_num + prefetch, len(self.agent.chapters))
+        for offset, number in enumerate(range(chapter_num + 1, last + 1), 1):
+            self.request(number, offset)
+
+    def cancel(self, chapter_num):
+        with self.condition:
+            self.pending.pop(chapter_num, None)
+
+    def wait(self, chapter_num, timeout=None):
+        """Block until a chapter is available; returns its file or None. A chapter that failed is retried."""
+        # Latency is how long the listener waits here, not how long ago the chapter was prefetched
+        started = time.perf_counter()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self.condition:
+            # The condition's lock is reentrant, so request() can be called while holding it
+            if chapter_num not in self.ready and chapter_num not in self.pending \
+                    and chapter_num != self.rendering:
+                if not self.request(chapter_num, 0):
+                    return None
+
+            while chapter_num not in self.ready and chapter_num not in self.failed:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self.condition.wait(remaining)
+
+            if chapter_num in self.failed:
+                print(f"❌ Chapter {chapter_num} failed: {self.failed[chapter_num]}")
+                return None
+
+            self.stats["wait_latency_s"].append(time.perf_counter() - started)
+            return self.ready[chapter_num]
+
+    def status(self):
+        with self.condition:
+            queued = sorted(self.pending, key=lambda number: self.pending[number])
+            return {"ready": sorted(self.ready), "rendering": self.rendering, "queued": queued}
+
+    def stop(self):
+        """Stop after the chapter currently rendering"""
+        with self.condition:
+            self.stopped = True
+            self.pending.clear()
+            self.condition.notify_all()
+        self.thread.join()
+
+    def run(self):
+        while True:
+            with self.condition:
+                while not self.pending and not self.stopped:
+                    self.condition.wait()
+                if self.stopped:
+                    return
+                chapter_num = min(self.pending, key=lambda number: self.pending[number])
+                del self.pending[chapter_num]
+                self.rendering = chapter_num
+
+            try:
+                path = self.render(chapter_num)
+                error = None
+            except Exception as e:
+                path, error = None, e
+
+            with self.condition:
+                self.rendering = None
+                if error is None:
+                    self.ready[chapter_num] = path
+                    self.stats["rendered"] += 1
+                else:
+                    self.failed[chapter_num] = error
+                self.condition.notify_all()
+
+    def render(self, chapter_num):
+        """Synthesize, normalize and encode one chapter into the cache"""
+        chapter_info = self.agent.chapters[chapter_num - 1]
+        meter = LoudnessMeter() if self.normalizer is not None else None
+        chapter_audio = self.agent.process_chapter(chapter_num - 1, chapter_info, include_title=True, meter=meter)
+
+        if self.normalizer is not None:
+            gain_db = self.normalizer.gain_for(meter.integrated_lufs())
+            chapter_audio = audio_to_segment(self.normalizer.process(segment_to_samples(chapter_audio), gain_db))
+
+        # Keyed after rendering, so the key has the directions this render recorded
+        path = self.cache_path(chapter_num)
+        extension = OUTPUT_FORMATS[self.output_format]["extension"]
+        # Encoded under another name and renamed when complete: an existing cache file is always whole
+        tmp_base = path[:-len(extension)] + ".tmp"
+        encoder = BookEncoder(
+            tmp_base,
+            output_format=self.output_format,
+            metadata={
+                "title": chapter_info["title"],
+                "artist": self.agent.book_metadata["author"],
+                "album": self.agent.book_metadata["title"],
+                "track": chapter_num,
+            }
+        )
+        try:
+            encoder.write(chapter_audio, chapter_title=chapter_info["title"])
+            tmp_path = encoder.close()
+        except BaseException:
+            encoder.abort()
+            if os.path.exists(tmp_base + extension):
+                os.remove(tmp_base + extension)
+            raise
+        os.replace(tmp_path, path)
+        print(f"\n💾 Chapter {chapter_num} ready: {path}")
+        return path
+
+    def print_report(self):
+        latency = self.stats["wait_latency_s"]
+        print(f"\n⏩ Scheduler: {self.stats['rendered']} chapters rendered, "
+              f"{self.stats['cache_hits']} served from cache")
+        if latency:
+            print(f"   Time to audio: first {latency[0]:.1f}s, worst {max(latency):.1f}s")
+        return self.stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render a book starting from any chapter")
+    parser.add_argument("pdf_path")
+    parser.add_argument("chapter", type=int)
+    parser.add_argument("--prefetch", type=int, default=3)
+    parser.add_argument("--format", choices=sorted(OUTPUT_FORMATS), default="mp3")
+    args = parser.parse_args()
+
+    agent = ChapterBasedAudiobookAgent(args.pdf_path)
+    scheduler = ChapterScheduler(agent, output_format=args.format, prefetch=args.prefetch)
+    scheduler.play_from(args.chapter)
+
+    path = scheduler.wait(args.chapter)
+    if path:
+        print(f"▶️ Chapter {args.chapter}: {path}")
+
+    # Commands while prefetch continues: "play N", "first N", "cancel N", "status", "quit"
+    while True:
+        try:
+            command = input("\n⏩ play N | first N | cancel N | status | quit: ").strip().split()
+        except EOFError:
+            break
+        if not command or command[0] == "quit":
+            break
+        if command[0] == "status":
+            print(scheduler.status())
+            continue
+        if len(command) != 2 or not command[1].isdigit():
+            print("❌ Invalid command.")
+            continue
+
+        chapter_num = int(command[1])
+        if command[0] == "play":
+            scheduler.play_from(chapter_num)
+            path = scheduler.wait(chapter_num)
+            if path:
+                print(f"▶️ Chapter {chapter_num}: {path}")
+        elif command[0] == "first":
+            scheduler.request(chapter_num, -1)
+        elif command[0] == "cancel":
+            scheduler.cancel(chapter_num)
+
+    scheduler.stop()
+    scheduler.print_report()
+    agent.director.print_usage_report()
+    agent.speaker.print_memo_report()
@@ -0,0 +1,130 @@
+import re
+from speaker import MAX_PHONEMES
+
+# Where an over-long sentence may be broken: after clause punctuation, else between words
+BREAK_PATTERNS = (r'(?<=[,;:—])\s+', r'\s+')
+
+
+class SentenceChunker:
+    """
+    Splits chapter text into synthesis units: whole sentences packed until
+    the next one would push the unit past Kokoro's phoneme window, so each
+    unit is one acoustic-model call and nothing is cut mid-sentence. Units
+    never cross a blank line. Sentences longer than the window are broken
+    at clause punctuation, then between words, and synthesized on their own.
+
+    Units are what the director analyzes, what the audio memo and render
+    manifest key on and what work_queue.py dispatches, so they must come
+    out the same on every machine: the window is MAX_PHONEMES, not the
+    autotuned chunk size, and phonemes come from the speaker's G2P cache.
+    """
+
+    def __init__(self, speaker, max_phonemes=MAX_PHONEMES):
+        """
+        Args:
+            speaker: AudiobookSpeaker whose G2P measures the sentences
+            max_phonemes: Phonemes per unit
+        """
+        self.speaker = speaker
+        self.max_phonemes = max_phonemes
+        self.stats = {"units": 0, "sentences": 0, "long_sentences": 0, "phonemes": 0}
+
+    def phoneme_count(self, text):
+        return len(self.speaker.phonemize_sentence(text))
+
+    def split_long(self, text, patterns=BREAK_PATTERNS):
+        """Break text into pieces that each fit the window"""
+        if not patterns or self.phoneme_count(text) <= self.max_phonemes:
+            return [text]
+        parts = re.split(patterns[0], text)
+        if len(parts) == 1:
+            return self.split_long(text, patterns[1:])
+
+        pieces = []
+        current = ""
+        for part in parts:
+            candidate = f"{current} {part}" if current else part
+            if current and self.phoneme_count(candidate) > self.max_phonemes:
+                pieces.append(current)
+                current = part
+            else:
+                current = candidate
+        pieces.append(current)
+        return [part for piece in pieces for part in self.split_long(piece, patterns[1:])]
+
+    def chunk(self, text):
+        """Synthesis units of a chapter's text, in reading order"""
+        units = []
+        for block in re.split(r'\n\s*\n', text):
+            current = []
+            length = 0
+            for sentence in self.speaker.split_sentences(block):
+                self.stats["sentences"] += 1
+                count = self.phoneme_count(sentence)
+
+                if count > self.max_phonemes:
+                    # Pieces of a long sentence are units of their own, so the
+                    # speaker phonemizes exactly the text that was measured
+                    self.stats["long_sentences"] += 1
+                    if current:
+                        units.append(" ".join(current))
+                        current, length = [], 0
+                    for piece in self.split_long(sentence):
+                        units.append(piece)
+                        self.stats["phonemes"] += self.phoneme_count(piece)
+                    continue
+
+                # The speaker joins sentence phonemes with a space
+                if current and length + 1 + count > self.max_phonemes:
+                    units.append(" ".join(current))
+                    current, length = [], 0
+                length = count if not current else length + 1 + count
+                current.append(sentence)
+                self.stats["phonemes"] += count
+            if current:
+                units.append(" ".join(current))
+
+        self.stats["units"] += len(units)
+        return units
+
+    def print_report(self):
+        stats = self.stats
+        if not stats["units"]:
+            return stats
+        fill = stats["phonemes"] / (stats["units"] * self.max_phonemes)
+        print(f"✂️ Chunker: {stats['sentences']} sentences → {stats['units']} units, "
+              f"{fill:.0%} of the {self.max_phonemes}-phoneme window used, "
+              f"{stats['long_sentences']} over-long sentences broken")
+        return stats
+
+
+def split_by_length(text, max_length=1000):
+    """The previous splitter: lines packed up to max_length characters, often mid-sentence"""
+    paragraphs = []
+    current_para = ""
+    
+    lines = text.split('\n')
+    for line in lines:
+        line_stripped = line.strip()
+        
+        # Skip empty lines that aren't paragraph breaks
+        if not line_stripped and not current_para:
+            continue
+        
+        # If line is empty and we have content, it's a paragraph break
+        if not line_stripped and current_para:
+            paragraphs.append(current_para)
+            current_para = ""
+        elif len(current_para) + len(line_stripped) < max_length:
+            current_para += line_stripped + " "
+        else:
+            # Current paragraph is getting too long, start new one
+            if current_para:
+                paragraphs.append(current_para)
+            current_para = line_stripped + " "
+    
+    # Add the last paragraph if exists
+    if current_para:
+        paragraphs.append(current_para)
+    
+    return paragraphs
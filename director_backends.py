@@ -0,0 +1,172 @@
+import os
+import time
+import requests
+from requests.adapters import HTTPAdapter
+
+
+class DirectorBackendError(Exception):
+    """A chat completion failed; status_code is None for timeouts and connection errors"""
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class DirectorBackend:
+    """
+    Where StoryDirector sends its prompts. complete() takes an OpenAI-style
+    chat request and returns (reply text, {"prompt_tokens", "completion_tokens"});
+    retries, backoff and the circuit breaker stay in the director.
+    """
+
+    name = "base"
+    # False for backends that answer without a language model
+    uses_llm = True
+
+    def __init__(self):
+        self.stats = {"calls": 0, "errors": 0, "latency_s": 0.0, "max_latency_s": 0.0}
+
+    def describe(self):
+        return self.name
+
+    def complete(self, request, timeout):
+        raise NotImplementedError
+
+    def call(self, request, timeout):
+        """complete() with per-backend call, error and latency stats"""
+        start = time.perf_counter()
+        try:
+            return self.complete(request, timeout)
+        except DirectorBackendError:
+            self.stats["errors"] += 1
+            raise
+        finally:
+            latency = time.perf_counter() - start
+            self.stats["calls"] += 1
+            self.stats["latency_s"] += latency
+            self.stats["max_latency_s"] = max(self.stats["max_latency_s"], latency)
+
+    def print_report(self):
+        if not self.stats["calls"]:
+            return self.stats
+        print(f"   Backend {self.describe()}: {self.stats['calls']} calls ({self.stats['errors']} failed) | "
+              f"avg {self.stats['latency_s'] / self.stats['calls']:.2f}s, max {self.stats['max_latency_s']:.2f}s")
+        return self.stats
+
+
+class GroqBackend(DirectorBackend):
+    """Groq's hosted models through the groq SDK"""
+
+    name = "groq"
+
+    def __init__(self, api_key=None):
+        super().__init__()
+        # Imported here so the other backends work without the groq SDK installed
+        from groq import Groq
+        # Retries are done by StoryDirector, with backoff and a circuit breaker
+        self.client = Groq(api_key=api_key or os.getenv("GROQ_API_KEY"), max_retries=0)
+
+    def complete(self, request, timeout):
+        from groq import APIError, APIStatusError
+        try:
+            response = self.client.chat.completions.create(**request, timeout=timeout)
+        except APIStatusError as e:
+            raise DirectorBackendError(str(e), e.status_code, e.response.headers.get("retry-after")) from e
+        except APIError as e:
+            raise DirectorBackendError(str(e)) from e
+
+        usage = getattr(response, "usage", None)
+        return response.choices[0].message.content, {
+            "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+            "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+        }
+
+
+class OpenAICompatibleBackend(DirectorBackend):
+    """
+    Any server speaking the OpenAI chat completions API: llama.cpp's
+    llama-server, vLLM, Ollama, LM Studio. One pooled keep-alive session is
+    reused for every call, so a local model pays no per-paragraph TCP setup.
+    """
+
+    name = "openai"
+
+    def __init__(self, base_url=None, api_key=None, pool_size=4, json_mode=True):
+        """
+        Args:
+            base_url: API root, e.g. http://localhost:8080/v1 (default: DIRECTOR_BASE_URL)
+            api_key: Bearer token if the server wants one (default: DIRECTOR_API_KEY)
+            pool_size: Connections kept open to the server
+            json_mode: Send response_format json_object (turn off for servers that reject it)
+        """
+        super().__init__()
+        self.base_url = (base_url or os.getenv("DIRECTOR_BASE_URL", "http://localhost:8080/v1")).rstrip("/")
+        self.json_mode = json_mode
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        api_key = api_key or os.getenv("DIRECTOR_API_KEY")
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+    def describe(self):
+        return f"{self.name} @ {self.base_url}"
+
+    def complete(self, request, timeout):
+        if not self.json_mode:
+            request = {key: value for key, value in request.items() if key != "response_format"}
+        try:
+            response = self.session.post(f"{self.base_url}/chat/completions", json=request, timeout=timeout)
+        except requests.RequestException as e:
+            raise DirectorBackendError(str(e)) from e
+
+        if response.status_code >= 400:
+            raise DirectorBackendError(
+                f"HTTP {response.status_code}: {response.text[:200]}",
+                response.status_code, response.headers.get("retry-after")
+            )
+        try:
+            body = response.json()
+            content = body["choices"][0]["message"]["content"]
+        except (ValueError, KeyError, IndexError) as e:
+            raise DirectorBackendError(f"unexpected reply: {e}") from e
+
+        usage = body.get("usage") or {}
+        return content, {
+            "prompt_tokens": usage.get("prompt_tokens", 0) or 0,
+            "completion_tokens": usage.get("completion_tokens", 0) or 0,
+        }
+
+
+class RuleBasedBackend(DirectorBackend):
+    """
+    No model at all: the director uses its local heuristics for every
+    paragraph. For offline renders and for testing the rest of the pipeline.
+    """
+
+    name = "rules"
+    uses_llm = False
+
+    def complete(self, request, timeout):
+        raise DirectorBackendError("the rule-based director makes no LLM calls")
+
+
+DIRECTOR_BACKENDS = {
+    "groq": GroqBackend,
+    "openai": OpenAICompatibleBackend,
+    "rules": RuleBasedBackend,
+}
+
+
+def create_director_backend(name=None, **options):
+    """
+    The configured director backend: name, else the DIRECTOR_BACKEND env
+    var, else groq. Options go to the backend's constructor.
+    """
+    name = name or os.getenv("DIRECTOR_BACKEND", "groq")
+    if name not in DIRECTOR_BACKENDS:
+        raise ValueError(f"Unknown director backend: {name} (choose from {', '.join(DIRECTOR_BACKENDS)})")
+    return DIRECTOR_BACKENDS[name](**options)
@@ -0,0 +1,152 @@
+import math
+import numpy as np
+from scipy.signal import lfilter, resample_poly
+from scipy.ndimage import minimum_filter1d
+from speaker import SAMPLE_RATE
+
+# Audiobook loudness target (integrated) and true-peak ceiling
+TARGET_LUFS = -18.0
+TRUE_PEAK_DB = -1.5
+
+
+def k_weighting_coefficients(sample_rate=SAMPLE_RATE):
+    """
+    BS.1770 K-weighting (high shelf + high pass) for any sample rate.
+    Returns ((b1, a1), (b2, a2)).
+    """
+    # Stage 1: high shelf
+    gain_db, fc, q = 3.999843853973347, 1681.974450955533, 0.7071752369554196
+    k = math.tan(math.pi * fc / sample_rate)
+    vh = 10 ** (gain_db / 20)
+    vb = vh ** 0.4996667741545416
+    a0 = 1 + k / q + k * k
+    b1 = np.array([(vh + vb * k / q + k * k) / a0, 2 * (k * k - vh) / a0, (vh - vb * k / q + k * k) / a0])
+    a1 = np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+
+    # Stage 2: high pass
+    fc, q = 38.13547087602444, 0.5003270373238773
+    k = math.tan(math.pi * fc / sample_rate)
+    a0 = 1 + k / q + k * k
+    b2 = np.array([1.0, -2.0, 1.0])
+    a2 = np.array([1.0, 2 * (k * k - 1) / a0, (1 - k / q + k * k) / a0])
+
+    return (b1, a1), (b2, a2)
+
+
+class LoudnessMeter:
+    """
+    Streaming EBU R128 integrated loudness meter (pass one). Audio is fed in
+    pieces as it is synthesized; only the 100 ms sub-block energies are kept,
+    about 36,000 floats per audio-hour.
+    """
+
+    def __init__(self, sample_rate=SAMPLE_RATE):
+        (self.b1, self.a1), (self.b2, self.a2) = k_weighting_coefficients(sample_rate)
+        self.zi1 = np.zeros(2)
+        self.zi2 = np.zeros(2)
+        self.sub_block = int(0.1 * sample_rate)
+        self.pending = np.empty(0)
+        self.energies = []
+
+    def feed(self, samples):
+        weighted, self.zi1 = lfilter(self.b1, self.a1, np.asarray(samples, dtype=np.float64), zi=self.zi1)
+        weighted, self.zi2 = lfilter(self.b2, self.a2, weighted, zi=self.zi2)
+
+        buffer = np.concatenate([self.pending, weighted])
+        count = len(buffer) // self.sub_block
+        if count:
+            blocks = buffer[:count * self.sub_block].reshape(count, self.sub_block)
+            self.energies.extend(np.mean(blocks ** 2, axis=1))
+        self.pending = buffer[count * self.sub_block:]
+
+    def integrated_lufs(self):
+        """Gated integrated loudness, or None if there was nothing above the absolute gate"""
+        energies = np.array(self.energies)
+        if len(energies) == 0:
+            return None
+
+        # 400 ms blocks with 75% overlap = mean of 4 consecutive 100 ms sub-blocks
+        if len(energies) >= 4:
+            blocks = np.convolve(energies, np.ones(4) / 4, mode="valid")
+        else:
+            blocks = np.array([energies.mean()])
+
+        with np.errstate(divide="ignore"):
+            loudness = -0.691 + 10 * np.log10(blocks)
+
+        gated = blocks[loudness > -70.0]
+        if len(gated) == 0:
+            return None
+
+        relative_gate = -0.691 + 10 * np.log10(gated.mean()) - 10.0
+        with np.errstate(divide="ignore"):
+            gated = gated[-0.691 + 10 * np.log10(gated) > relative_gate]
+
+        return float(-0.691 + 10 * np.log10(gated.mean()))
+
+
+class LoudnessNormalizer:
+    """
+    Pass two: a static gain to reach the target loudness plus a look-ahead
+    true-peak limiter, applied block-wise with numpy so a chapter is processed
+    in bounded memory.
+    """
+
+    def __init__(self, target_lufs=TARGET_LUFS, true_peak_db=TRUE_PEAK_DB, max_gain_db=20.0,
+                 sample_rate=SAMPLE_RATE, block_ms=20, chunk_seconds=10, oversample=4):
+        self.target_lufs = target_lufs
+        self.ceiling = 10 ** (true_peak_db / 20)
+        self.max_gain_db = max_gain_db
+        self.block = int(sample_rate * block_ms / 1000)
+        self.chunk = self.block * max(1, int(chunk_seconds * 1000 / block_ms))
+        self.oversample = oversample
+        self.stats = {"chapters": 0, "limited_blocks": 0, "blocks": 0}
+
+    def gain_for(self, loudness_lufs):
+        """Gain in dB that brings a chapter to the target, clamped to +-max_gain_db"""
+        if loudness_lufs is None:
+            return 0.0
+        gain = self.target_lufs - loudness_lufs
+        return max(-self.max_gain_db, min(self.max_gain_db, gain))
+
+    def block_peaks(self, samples):
+        """True-peak estimate per block via oversampling, computed chunk by chunk"""
+        peaks = []
+        for start in range(0, len(samples), self.chunk):
+            chunk = samples[start:start + self.chunk]
+            padded_length = -(-len(chunk) // self.block) * self.block
+            chunk = np.pad(chunk, (0, padded_length - len(chunk)))
+            oversampled = resample_poly(chunk, self.oversample, 1)
+            peaks.append(np.abs(oversampled).reshape(-1, self.block * self.oversample).max(axis=1))
+        return np.concatenate(peaks) if peaks else np.empty(0)
+
+    def process(self, samples, gain_db):
+        """Apply gain and true-peak limiting; returns float32 samples"""
+        samples = np.asarray(samples, dtype=np.float32) * np.float32(10 ** (gain_db / 20))
+        if len(samples) == 0:
+            return samples
+
+        peaks = self.block_peaks(samples)
+        required = np.minimum(1.0, self.ceiling / np.maximum(peaks, 1e-9))
+
+        # Look-ahead/release: widen each reduction to its neighbours, then smooth.
+        # Every smoothed value stays at or below the requirement of its own block.
+        radius = 2
+        smoothed = minimum_filter1d(required, size=2 * radius + 1, mode="nearest")
+        kernel = np.ones(2 * radius + 1) / (2 * radius + 1)
+        smoothed = np.convolve(np.pad(smoothed, radius, mode="edge"), kernel, mode="valid")
+
+        self.stats["chapters"] += 1
+        self.stats["blocks"] += len(required)
+        self.stats["limited_blocks"] += int(np.count_nonzero(required < 1.0))
+
+        if np.all(smoothed >= 1.0):
+            return np.clip(samples, -self.ceiling, self.ceiling)
+
+        # Per-sample gain envelope, interpolated between block centres, chunk by chunk
+        centres = np.arange(len(smoothed)) * self.block + self.block / 2
+        for start in range(0, len(samples), self.chunk):
+            positions = np.arange(start, min(start + self.chunk, len(samples)))
+            samples[start:start + len(positions)] *= np.interp(positions, centres, smoothed).astype(np.float32)
+
+        return np.clip(samples, -self.ceiling, self.ceiling)
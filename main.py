@@ -1,18 +1,351 @@
 import fitz  # PyMuPDF
-from groq import Groq
 import os
 from dotenv import load_dotenv
 import json
 import re
+import time
+import random
+import difflib
+from director_backends import create_director_backend, DirectorBackendError
+from text_cleanup import PdfTextCleaner
 
 load_dotenv()
-client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+
+# Override for self-hosted backends (DIRECTOR_BACKEND=openai); both may name the same model
+LARGE_MODEL = os.getenv("DIRECTOR_LARGE_MODEL", "llama-3.3-70b-versatile")
+SMALL_MODEL = os.getenv("DIRECTOR_SMALL_MODEL", "llama-3.1-8b-instant")
+
+# USD per million tokens (input, output) from the Groq price list
+MODEL_PRICING = {
+    "llama-3.3-70b-versatile": {"input": 0.59, "output": 0.79},
+    "llama-3.1-8b-instant": {"input": 0.05, "output": 0.08},
+}
+
+# Compact director schema. Codes expand locally to the keys that
+# AudiobookSpeaker.voice_library and emotion_modulation understand.
+SCENE_CODES = {"n": "narration", "d": "dialogue", "s": "description", "a": "action"}
+
+CHARACTER_CODES = {
+    "N": "neutral_narrator",
+    "A": "authoritative_narrator",
+    "S": "storyteller",
+    "W": "young_woman",
+    "M": "man",
+    "B": "child_boy",
+    "G": "child_girl",
+    "OM": "old_man",
+    "OW": "old_woman",
+}
+
+EMOTION_CODES = {
+    "0": "neutral",
+    "x": "excited",
+    "f": "scared",
+    "a": "angry",
+    "s": "sad",
+    "h": "happy",
+    "m": "mysterious",
+}
+
+# (gender, age) implied by each character
+CHARACTER_PROFILES = {
+    "neutral_narrator": ("neutral", "adult"),
+    "authoritative_narrator": ("male", "adult"),
+    "storyteller": ("female", "adult"),
+    "young_woman": ("female", "young_adult"),
+    "man": ("male", "adult"),
+    "child_boy": ("male", "child"),
+    "child_girl": ("female", "child"),
+    "old_man": ("male", "elderly"),
+    "old_woman": ("female", "elderly"),
+}
+
+# Free-text values the model likes to return instead of a code
+CHARACTER_SYNONYMS = {
+    "narrator": "neutral_narrator",
+    "female_character": "young_woman",
+    "female": "young_woman",
+    "woman": "young_woman",
+    "girl": "child_girl",
+    "male_character": "man",
+    "male": "man",
+    "boy": "child_boy",
+    "child": "child_boy",
+    "elderly_man": "old_man",
+    "elderly_woman": "old_woman",
+    "deep_male": "man",
+    "soft_female": "young_woman",
+    "child_like": "child_boy",
+    "authoritative": "authoritative_narrator",
+}
+
+EMOTION_SYNONYMS = {
+    "joyful": "happy",
+    "joy": "happy",
+    "terrified": "scared",
+    "afraid": "scared",
+    "fearful": "scared",
+    "furious": "angry",
+    "tense": "scared",
+    "calm": "neutral",
+}
+
+DIALOGUE_TAGS = r'\b(said|asked|whispered|shouted|cried|replied|yelled|murmured|answered)\b'
+
+class DirectorUnavailable(Exception):
+    """The LLM could not produce directions (retries exhausted or circuit open)"""
+
+
+class CircuitBreaker:
+    """
+    Stops calling the LLM after repeated failures. While open, callers use
+    local heuristics; after reset_seconds one trial call is let through and
+    a success closes the circuit again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=60):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.failures = 0
+        self.opened_at = 0.0
+        self.stats = {"trips": 0, "rejected": 0}
+
+    def allow(self):
+        if self.state == "open":
+            if time.monotonic() - self.opened_at < self.reset_seconds:
+                self.stats["rejected"] += 1
+                return False
+            self.state = "half_open"
+        return True
+
+    def record_success(self):
+        if self.state != "closed":
+            print("\n✅ Director reachable again, leaving degraded mode")
+        self.state = "closed"
+        self.failures = 0
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == "half_open" or self.failures >= self.failure_threshold:
+            if self.state != "open":
+                self.stats["trips"] += 1
+                print(f"\n⚠️ Director failing, using local heuristics for {self.reset_seconds}s")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+class CharacterRegistry:
+    """
+    Per-book memory of named speakers. Once the director has assigned a voice
+    to a character, later dialogue by that character reuses it, which saves
+    LLM fields (or whole calls) and stops the voice drifting between chapters.
+    """
+
+    # Fields the compact schema asks for; used to count what the registry saves
+    COMPACT_FIELDS = 4
+
+    def __init__(self, path=None):
+        self.path = path
+        self.characters = {}
+        self.stats = {"lookups": 0, "hits": 0, "llm_calls_saved": 0, "fields_saved": 0, "drift_prevented": 0}
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.characters = json.load(f).get("characters", {})
+
+    def lookup(self, name):
+        """Fast name -> entry lookup; None if the character is unknown"""
+        if not name:
+            return None
+        self.stats["lookups"] += 1
+        entry = self.characters.get(name.strip().lower())
+        if entry:
+            self.stats["hits"] += 1
+        return entry
+
+    def find_known_speaker(self, text_snippet):
+        """Return the registry entry of a known character tagged as speaking in the text"""
+        if not self.characters:
+            return None
+
+        for match in re.finditer(rf'{DIALOGUE_TAGS}\s+([A-Z][a-z]+)|([A-Z][a-z]+)\s+{DIALOGUE_TAGS}', text_snippet):
+            name = match.group(2) or match.group(3)
+            entry = self.lookup(name)
+            if entry:
+                return entry
+        return None
+
+    def register(self, name, directions):
+        """
+        Remember the voice chosen for a speaking character. The first
+        assignment wins; later directions are corrected to match it.
+        """
+        key = name.strip().lower()
+        if not key:
+            return directions
+
+        entry = self.characters.get(key)
+        if entry is None:
+            self.characters[key] = {
+                "name": name.strip(),
+                "character": directions["primary_character"],
+                "gender": directions["character_gender"],
+                "age": directions["character_age"],
+                "appearances": 1,
+            }
+            return directions
+
+        entry["appearances"] += 1
+        if directions["primary_character"] != entry["character"]:
+            self.stats["drift_prevented"] += 1
+            directions = dict(directions,
+                              primary_character=entry["character"],
+                              character_gender=entry["gender"],
+                              character_age=entry["age"])
+        return directions
+
+    def save(self):
+        if not self.path:
+            return
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"characters": self.characters}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+    def print_report(self):
+        print(f"🗂️ Character registry: {len(self.characters)} known | "
+              f"{self.stats['hits']}/{self.stats['lookups']} lookups hit | "
+              f"{self.stats['llm_calls_saved']} LLM calls and {self.stats['fields_saved']} fields saved | "
+              f"{self.stats['drift_prevented']} voice drifts prevented")
+        return self.stats
 
 class StoryDirector : 
     """The AI Agent that character, emotions and scene changes from the text"""
 
-    def analyze_scene(self, text_snippet, previous_context=""):
-        prompt = f"""
+    def __init__(self, large_model=LARGE_MODEL, small_model=SMALL_MODEL,
+                 budget_usd=None, short_paragraph_words=40, schema="compact",
+                 max_retries=3, timeout_s=20.0, backoff_base_s=0.5, backoff_max_s=8.0, breaker=None,
+                 backend=None):
+        """
+        Args:
+            large_model: Model used for dialogue-dense or ambiguous passages
+            small_model: Fast model used for short or simple paragraphs
+            budget_usd: Spend limit for the render; once reached every call goes to the small model
+            short_paragraph_words: Paragraphs below this word count count as short
+            schema: "compact" for short enum codes, "verbose" for the original ten-key prompt
+            max_retries: Extra attempts after a timeout, 429/5xx, connection error or malformed JSON
+            timeout_s: Per-call timeout
+            backoff_base_s: First retry delay; doubles per attempt (with full jitter) up to backoff_max_s
+            breaker: CircuitBreaker that switches to heuristic directions after repeated failures
+            backend: DirectorBackend to send prompts to (default: create_director_backend(), from DIRECTOR_BACKEND)
+        """
+        self.large_model = large_model
+        self.small_model = small_model
+        self.budget_usd = budget_usd
+        self.short_paragraph_words = short_paragraph_words
+        self.usage_log = []
+        self.schema = schema
+        self.schema_stats = {"responses": 0, "repaired": 0, "defaulted": 0}
+        self.max_retries = max_retries
+        self.timeout_s = timeout_s
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.breaker = breaker or CircuitBreaker()
+        self.backend = backend or create_director_backend()
+        self.fault_stats = {"retries": 0, "failed_calls": 0, "sources": {}}
+        self.text_cleaner = None
+
+    def score_complexity(self, text_snippet):
+        """Rough measure of how hard a paragraph is to direct"""
+        quotes = len(re.findall(r'["\u201c\u201d]', text_snippet))
+        tags = len(re.findall(DIALOGUE_TAGS, text_snippet, re.IGNORECASE))
+        # Several capitalised names mid-sentence usually means several speakers
+        names = len(set(re.findall(r'(?<=[a-z,] )[A-Z][a-z]+', text_snippet)))
+        return quotes // 2 + tags * 2 + max(0, names - 1)
+
+    def choose_model(self, text_snippet):
+        """Route a paragraph to the small or large model"""
+        if self.budget_usd is not None and self.total_cost() >= self.budget_usd:
+            return self.small_model
+
+        word_count = len(text_snippet.split())
+        complexity = self.score_complexity(text_snippet)
+
+        if complexity >= 3:
+            return self.large_model
+        if word_count < self.short_paragraph_words or complexity == 0:
+            return self.small_model
+        return self.large_model
+
+    def record_usage(self, model, usage, latency):
+        """Store token counts and latency for one LLM call"""
+        prompt_tokens = usage["prompt_tokens"]
+        completion_tokens = usage["completion_tokens"]
+
+        pricing = MODEL_PRICING.get(model, {"input": 0.0, "output": 0.0})
+        cost = (prompt_tokens * pricing["input"] + completion_tokens * pricing["output"]) / 1_000_000
+
+        entry = {
+            "model": model,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "latency_s": latency,
+            "cost_usd": cost,
+        }
+        self.usage_log.append(entry)
+        return entry
+
+    def total_cost(self):
+        return sum(entry["cost_usd"] for entry in self.usage_log)
+
+    def get_usage_report(self):
+        """Summarise tokens, cost and latency per model"""
+        report = {"calls": len(self.usage_log), "cost_usd": self.total_cost(), "models": {}}
+
+        for entry in self.usage_log:
+            stats = report["models"].setdefault(entry["model"], {
+                "calls": 0, "prompt_tokens": 0, "completion_tokens": 0,
+                "cost_usd": 0.0, "latency_s": 0.0, "max_latency_s": 0.0
+            })
+            stats["calls"] += 1
+            stats["prompt_tokens"] += entry["prompt_tokens"]
+            stats["completion_tokens"] += entry["completion_tokens"]
+            stats["cost_usd"] += entry["cost_usd"]
+            stats["latency_s"] += entry["latency_s"]
+            stats["max_latency_s"] = max(stats["max_latency_s"], entry["latency_s"])
+
+        for stats in report["models"].values():
+            stats["avg_latency_s"] = stats["latency_s"] / stats["calls"]
+
+        return report
+
+    def print_usage_report(self):
+        """Print the cost and latency report for this render"""
+        report = self.get_usage_report()
+
+        print(f"\n💰 Director usage: {report['calls']} calls, ${report['cost_usd']:.4f}")
+        if self.budget_usd is not None:
+            print(f"   Budget: ${self.budget_usd:.4f}")
+        for model, stats in report["models"].items():
+            print(f"   • {model}: {stats['calls']} calls | "
+                  f"{stats['prompt_tokens']} in / {stats['completion_tokens']} out tokens | "
+                  f"${stats['cost_usd']:.4f} | "
+                  f"avg {stats['avg_latency_s']:.2f}s, max {stats['max_latency_s']:.2f}s")
+        if self.schema_stats["responses"]:
+            print(f"   Schema ({self.schema}): {self.schema_stats['repaired']} repaired, "
+                  f"{self.schema_stats['defaulted']} defaulted of {self.schema_stats['responses']} responses")
+        if self.fault_stats["retries"] or self.fault_stats["failed_calls"] or self.breaker.stats["trips"]:
+            sources = ", ".join(f"{count} {source}" for source, count in self.fault_stats["sources"].items())
+            print(f"   Faults: {self.fault_stats['retries']} retries, {self.fault_stats['failed_calls']} failed calls, "
+                  f"circuit opened {self.breaker.stats['trips']}x | directions: {sources}")
+        self.backend.print_report()
+
+        return report
+
+    def build_prompt(self, text_snippet, previous_context=""):
+        """Build the director prompt for the configured schema"""
+        if self.schema == "verbose":
+            return f"""
         You are a professional audiobook director analyzing a scene. 
         
         CONTEXT: {previous_context}
@@ -31,20 +364,264 @@ class StoryDirector :
         - "is_dialogue": (true/false)
         - "speaking_character_name": (if dialogue, who's speaking)
         """
-        response = client.chat.completions.create(
-            model = "llama-3.3-70b-versatile",
-            messages = [{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
-            temperature = 0.7
+
+        scene_codes = ",".join(f"{code}={name}" for code, name in SCENE_CODES.items())
+        character_codes = ",".join(f"{code}={name}" for code, name in CHARACTER_CODES.items())
+        emotion_codes = ",".join(f"{code}={name}" for code, name in EMOTION_CODES.items())
+
+        return f"""Audiobook director. Classify the TEXT.
+CONTEXT: {previous_context}
+TEXT: '{text_snippet}'
+Reply with ONLY compact JSON {{"t":..,"c":..,"e":..,"n":..}} using codes:
+t: {scene_codes}
+c (voice): {character_codes}
+e: {emotion_codes}
+n: speaking character's name, "" if none"""
+
+    def repair_value(self, value, codes, synonyms, default):
+        """
+        Map a model value onto a known key without another LLM call.
+        Returns (key, status) where status is "ok", "repaired" or "defaulted".
+        """
+        if value is None:
+            return default, "defaulted"
+
+        raw = str(value).strip()
+        if raw in codes:
+            return codes[raw], "ok"
+
+        normalized = raw.lower().replace(" ", "_").replace("-", "_")
+        known = set(codes.values())
+        if normalized in known:
+            return normalized, "ok"
+        if normalized in synonyms:
+            return synonyms[normalized], "repaired"
+
+        # Case-insensitive code match ("om" for "OM")
+        for code, key in codes.items():
+            if code.lower() == normalized:
+                return key, "repaired"
+
+        close = difflib.get_close_matches(normalized, list(known) + list(synonyms), n=1, cutoff=0.75)
+        if close:
+            return synonyms.get(close[0], close[0]), "repaired"
+
+        return default, "defaulted"
+
+    def normalize_directions(self, raw):
+        """
+        Validate a director response (compact or verbose) and expand it into
+        the keys the orchestrator and speaker use.
+        """
+        if not isinstance(raw, dict):
+            raw = {}
+
+        compact = "c" in raw or "e" in raw
+        statuses = []
+
+        scene_type, status = self.repair_value(
+            raw.get("t") if compact else raw.get("scene_type"),
+            SCENE_CODES, {}, "narration"
         )
-        result = json.loads(response.choices[0].message.content)
-        return result
+        statuses.append(status)
+
+        if compact:
+            character_value = raw.get("c")
+        else:
+            character_value = raw.get("primary_character") or raw.get("voice_type")
+        character, status = self.repair_value(
+            character_value, CHARACTER_CODES, CHARACTER_SYNONYMS, "neutral_narrator"
+        )
+        statuses.append(status)
+
+        emotion, status = self.repair_value(
+            raw.get("e") if compact else raw.get("emotion"),
+            EMOTION_CODES, EMOTION_SYNONYMS, "neutral"
+        )
+        statuses.append(status)
+
+        name = raw.get("n") if compact else raw.get("speaking_character_name")
+        name = name.strip() if isinstance(name, str) else ""
+
+        gender, age = CHARACTER_PROFILES[character]
+        is_dialogue = scene_type == "dialogue" or raw.get("is_dialogue") is True
+
+        self.schema_stats["responses"] += 1
+        if "defaulted" in statuses:
+            self.schema_stats["defaulted"] += 1
+        elif "repaired" in statuses:
+            self.schema_stats["repaired"] += 1
+
+        return {
+            "scene_type": scene_type,
+            "primary_character": character,
+            "character_gender": gender,
+            "character_age": age,
+            "emotion": emotion,
+            "is_dialogue": is_dialogue,
+            "speaking_character_name": name,
+        }
+
+    def request_directions(self, prompt, model, max_tokens=None):
+        """Send one director prompt and return the parsed JSON reply"""
+        request = {
+            "model": model,
+            "messages": [{"role": "user", "content": prompt}],
+            "response_format": {"type": "json_object"},
+            "temperature": 0.7,
+        }
+        if max_tokens:
+            request["max_tokens"] = max_tokens
+
+        if not self.backend.uses_llm:
+            raise DirectorUnavailable(f"{self.backend.name} backend")
+        if not self.breaker.allow():
+            raise DirectorUnavailable("circuit open")
+
+        last_error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self.fault_stats["retries"] += 1
+                time.sleep(self.retry_delay(attempt, last_error))
+
+            start = time.perf_counter()
+            try:
+                content, usage = self.backend.call(request, self.timeout_s)
+                self.record_usage(model, usage, time.perf_counter() - start)
+                result = json.loads(content)
+                if not isinstance(result, dict):
+                    raise ValueError("director reply is not a JSON object")
+            except (DirectorBackendError, ValueError, TypeError) as e:
+                # 4xx other than 408/409/429 will not succeed on a retry
+                status_code = getattr(e, "status_code", None)
+                if status_code is not None and status_code < 500 and status_code not in (408, 409, 429):
+                    last_error = e
+                    break
+                last_error = e
+                continue
+
+            self.breaker.record_success()
+            return result
+
+        self.fault_stats["failed_calls"] += 1
+        self.breaker.record_failure()
+        raise DirectorUnavailable(f"{type(last_error).__name__}: {last_error}")
+
+    def retry_delay(self, attempt, error):
+        """Exponential backoff with full jitter, honouring Retry-After on 429s"""
+        delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempt - 1)))
+        if isinstance(error, DirectorBackendError):
+            retry_after = error.retry_after
+            if retry_after:
+                try:
+                    delay = max(delay, min(self.backoff_max_s, float(retry_after)))
+                except ValueError:
+                    pass
+        return delay
+
+    def heuristic_directions(self, text_snippet, character=None, emotion=None):
+        """
+        Directions from the speaker's local keyword heuristics, used while the
+        LLM is unavailable so the render keeps going.
+        """
+        character, _ = self.repair_value(character or "narrator", CHARACTER_CODES, CHARACTER_SYNONYMS, "neutral_narrator")
+        emotion, _ = self.repair_value(emotion or "neutral", EMOTION_CODES, EMOTION_SYNONYMS, "neutral")
+        gender, age = CHARACTER_PROFILES[character]
+        is_dialogue = bool(re.search(r'["\u201c]', text_snippet)) and character not in (
+            "neutral_narrator", "authoritative_narrator", "storyteller")
+
+        return {
+            "scene_type": "dialogue" if is_dialogue else "narration",
+            "primary_character": character,
+            "character_gender": gender,
+            "character_age": age,
+            "emotion": emotion,
+            "is_dialogue": is_dialogue,
+            "speaking_character_name": "",
+            "direction_source": "heuristic",
+        }
+
+    def count_source(self, directions):
+        source = directions.get("direction_source", "llm")
+        self.fault_stats["sources"][source] = self.fault_stats["sources"].get(source, 0) + 1
+        return directions
+
+    def analyze_known_speaker(self, text_snippet, previous_context, entry, registry, emotion_hint=None):
+        """
+        Directions for a paragraph whose speaker is already in the registry:
+        only the emotion is asked for, or nothing when the heuristic found one.
+        """
+        source = "registry"
+        if emotion_hint and emotion_hint != "neutral":
+            emotion = emotion_hint
+            registry.stats["llm_calls_saved"] += 1
+            registry.stats["fields_saved"] += registry.COMPACT_FIELDS
+        else:
+            emotion_codes = ",".join(f"{code}={name}" for code, name in EMOTION_CODES.items())
+            prompt = f"""Audiobook director. {entry['name']} is speaking.
+CONTEXT: {previous_context}
+TEXT: '{text_snippet}'
+Reply with ONLY JSON {{"e":..}} using codes e: {emotion_codes}"""
+            try:
+                raw = self.request_directions(prompt, self.small_model, max_tokens=20)
+                emotion, _ = self.repair_value(raw.get("e"), EMOTION_CODES, EMOTION_SYNONYMS, "neutral")
+                registry.stats["fields_saved"] += registry.COMPACT_FIELDS - 1
+            except DirectorUnavailable:
+                # The voice is still known; only the emotion falls back
+                emotion = "neutral"
+                source = "registry+heuristic"
+
+        return {
+            "scene_type": "dialogue",
+            "primary_character": entry["character"],
+            "character_gender": entry["gender"],
+            "character_age": entry["age"],
+            "emotion": emotion,
+            "is_dialogue": True,
+            "speaking_character_name": entry["name"],
+            "direction_source": source,
+        }
+
+    def analyze_scene(self, text_snippet, previous_context="", registry=None, emotion_hint=None,
+                      character_hint=None):
+        """
+        Directions for one paragraph. Never raises for LLM failures: after
+        retries, or while the circuit breaker is open, the local heuristics
+        are used instead. "direction_source" in the result records which
+        path produced it ("llm", "registry", "registry+heuristic" or "heuristic").
+        
+        Args:
+            registry: CharacterRegistry for the book; known speakers skip most of the analysis
+            emotion_hint: Emotion from the local keyword heuristic, used for known speakers
+            character_hint: Character from the local heuristic, used in degraded mode
+        """
+        if registry is not None:
+            entry = registry.find_known_speaker(text_snippet)
+            if entry:
+                return self.count_source(
+                    self.analyze_known_speaker(text_snippet, previous_context, entry, registry, emotion_hint)
+                )
+
+        prompt = self.build_prompt(text_snippet, previous_context)
+        model = self.choose_model(text_snippet)
+
+        # The compact reply is ~20 tokens; cap it so a rambling model stays cheap
+        max_tokens = 60 if self.schema == "compact" else None
+        try:
+            result = self.normalize_directions(self.request_directions(prompt, model, max_tokens))
+        except DirectorUnavailable:
+            return self.count_source(self.heuristic_directions(text_snippet, character_hint, emotion_hint))
+        result["direction_source"] = "llm"
+
+        if registry is not None and result["is_dialogue"] and result["speaking_character_name"]:
+            result = registry.register(result["speaking_character_name"], result)
+        return self.count_source(result)
 
     def detect_chapters(self, full_text):
         """Detect chapter boundaries in text"""
         chapter_patterns = [
-            r'CHAPTER\s+\d+[\.\s]',
-            r'Chapter\s+\d+[\.\s]',
+            r'CHAPTER\s+\d+(?:[\.\s]|$)',
+            r'Chapter\s+\d+(?:[\.\s]|$)',
             r'\n\d+\.\s+',  # Numbered chapters: "1. "
             r'\n[A-Z][A-Z\s]+\n',  # All caps titles
         ]
@@ -111,9 +688,18 @@ class StoryDirector :
         
         return {"title": title, "author": author}
     
-    def extract_text_from_pdf(self, pdf_path):
-        """Extract text with structure preservation"""
+    def extract_text_from_pdf(self, pdf_path, clean=True):
+        """
+        Extract text with structure preservation
+        
+        Args:
+            clean: Strip running headers/footers, page numbers and layout line breaks (see PdfTextCleaner)
+        """
         doc = fitz.open(pdf_path)
+        if clean:
+            self.text_cleaner = PdfTextCleaner()
+            return self.text_cleaner.clean(doc)
+        
         full_text = ""
         
         for page_num in range(len(doc)):
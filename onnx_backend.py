@@ -0,0 +1,118 @@
+import os
+import json
+import time
+import argparse
+import numpy as np
+
+ONNX_DIR = os.path.join("model_assets", "onnx")
+ONNX_MODEL = os.path.join(ONNX_DIR, "kokoro.onnx")
+ONNX_INT8_MODEL = os.path.join(ONNX_DIR, "kokoro.int8.onnx")
+ONNX_VOCAB = os.path.join(ONNX_DIR, "kokoro.vocab.json")
+
+
+def export_onnx(output_path=ONNX_MODEL, quantize=True, opset=17):
+    """
+    Export Kokoro-82M to ONNX (and optionally a dynamic int8 copy). The
+    complex-valued iSTFT is swapped for Kokoro's real-valued version so the
+    graph only uses ops ONNX Runtime's CPU provider supports.
+    """
+    import torch
+    from kokoro import KModel
+    from speaker import REPO_ID
+
+    model = KModel(repo_id=REPO_ID, disable_complex=True).eval()
+
+    class ExportWrapper(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, ref_s, speed):
+            audio, _ = self.model.forward_with_tokens(input_ids, ref_s, speed)
+            return audio
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    dummy_ids = torch.randint(1, 100, (1, 48), dtype=torch.long)
+    dummy_ids[0, 0] = dummy_ids[0, -1] = 0
+    start = time.perf_counter()
+    torch.onnx.export(
+        ExportWrapper(model),
+        (dummy_ids, torch.randn(1, 256), torch.tensor([1.0])),
+        output_path,
+        input_names=["input_ids", "ref_s", "speed"],
+        output_names=["audio"],
+        dynamic_axes={"input_ids": {1: "tokens"}, "audio": {0: "samples"}},
+        opset_version=opset,
+    )
+    print(f"📦 Exported {output_path} in {time.perf_counter() - start:.0f}s "
+          f"({os.path.getsize(output_path) / 1024 / 1024:.0f} MB)")
+
+    # Phoneme -> id table, so inference needs neither torch nor the Hub
+    with open(os.path.join(os.path.dirname(output_path), os.path.basename(ONNX_VOCAB)), 'w', encoding='utf-8') as f:
+        json.dump(model.vocab, f, ensure_ascii=False)
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        int8_path = output_path.replace(".onnx", ".int8.onnx")
+        quantize_dynamic(output_path, int8_path, weight_type=QuantType.QInt8)
+        print(f"📦 Quantized {int8_path} ({os.path.getsize(int8_path) / 1024 / 1024:.0f} MB)")
+
+    return output_path
+
+
+class OnnxKokoro:
+    """Kokoro acoustic model on ONNX Runtime's CPU execution provider"""
+
+    def __init__(self, model_path=ONNX_MODEL, threads=None):
+        """
+        Args:
+            model_path: kokoro.onnx or kokoro.int8.onnx written by export_onnx
+            threads: Intra-op threads (None lets ONNX Runtime decide)
+        """
+        import onnxruntime as ort
+
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(f"{model_path} not found; run 'python onnx_backend.py export' first")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.model_path = model_path
+
+        with open(os.path.join(os.path.dirname(model_path), os.path.basename(ONNX_VOCAB)), 'r', encoding='utf-8') as f:
+            self.vocab = json.load(f)
+
+    def infer(self, phonemes, voice_pack, speed=1.0):
+        """
+        Synthesize one phoneme string (<= 510 phonemes). voice_pack is the
+        [510, 1, 256] style tensor/array; the row for the phoneme count is
+        used, as KPipeline does.
+        """
+        ids = [self.vocab[p] for p in phonemes if p in self.vocab]
+        if not ids:
+            return None
+        input_ids = np.array([[0, *ids, 0]], dtype=np.int64)
+        ref_s = np.asarray(voice_pack[min(len(phonemes), len(voice_pack)) - 1], dtype=np.float32).reshape(1, -1)
+        audio, = self.session.run(None, {
+            "input_ids": input_ids,
+            "ref_s": ref_s,
+            "speed": np.array([speed], dtype=np.float32),
+        })
+        return audio.reshape(-1)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Kokoro ONNX export")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Export kokoro.onnx (and kokoro.int8.onnx)")
+    export_parser.add_argument("--output", default=ONNX_MODEL)
+    export_parser.add_argument("--no-quantize", action="store_true")
+    export_parser.add_argument("--opset", type=int, default=17)
+
+    args = parser.parse_args()
+
+    if args.command == "export":
+        export_onnx(args.output, quantize=not args.no_quantize, opset=args.opset)
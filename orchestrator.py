@@ -2,18 +2,132 @@ import os
 import json
 import fitz
 from pydub import AudioSegment
+import numpy as np
 import re
-from main import StoryDirector
-from speaker import AudiobookSpeaker
+import queue
+import threading
+from main import StoryDirector, CharacterRegistry
+from speaker import AudiobookSpeaker, SAMPLE_RATE
+from chunking import SentenceChunker, split_by_length
+from audio_export import BookEncoder
+from render_manifest import RenderManifest, paragraph_hash
+from loudness import LoudnessMeter, LoudnessNormalizer
+from render_estimate import RenderEstimator, load_profile, PROFILE_FILE
+
+def audio_to_segment(samples):
+    """Convert float samples from the speaker into a 16-bit mono AudioSegment"""
+    pcm = (np.clip(np.asarray(samples, dtype=np.float32), -1.0, 1.0) * 32767).astype(np.int16)
+    return AudioSegment(
+        data=pcm.tobytes(),
+        sample_width=2,
+        frame_rate=SAMPLE_RATE,
+        channels=1
+    )
+
+def segment_to_samples(segment):
+    """Float samples of an AudioSegment at the speaker's sample rate"""
+    segment = segment.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2)
+    return np.frombuffer(segment.raw_data, dtype=np.int16).astype(np.float32) / 32768
+
+class ChapterExportWorker(threading.Thread):
+    """
+    Background thread that feeds finished chapters to the BookEncoder while the
+    main thread synthesizes the next one. The queue is bounded, so synthesis
+    blocks instead of piling up chapter buffers when encoding falls behind.
+    """
+
+    def __init__(self, encoder, rescue_folder, max_pending=2, normalizer=None):
+        """
+        Args:
+            encoder: BookEncoder to write into (None if it could not be started)
+            rescue_folder: Where chapters are saved as WAV if encoding fails
+            max_pending: Chapter buffers allowed to wait in the queue
+            normalizer: LoudnessNormalizer applied to chapters submitted with a gain
+        """
+        super().__init__(name="chapter-export", daemon=True)
+        self.encoder = encoder
+        self.rescue_folder = rescue_folder
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.errors = []
+        self.rescued_files = []
+        self.failed = encoder is None
+        self.normalizer = normalizer
+
+    def submit(self, audio, chapter_title=None, file_stem=None, gain_db=None):
+        """
+        Queue audio for export; blocks while the queue is full. With gain_db,
+        the normalizer's gain and true-peak limiter are applied on this thread.
+        """
+        self.queue.put(("audio", audio, chapter_title, file_stem, gain_db))
+
+    def submit_silence(self, duration_ms):
+        self.queue.put(("silence", duration_ms, None, None, None))
+
+    def finish(self):
+        """Wait for every queued item to be written"""
+        self.queue.put(None)
+        self.join()
+        return self.errors
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            
+            kind, payload, chapter_title, file_stem, gain_db = item
+            if kind == "audio" and gain_db is not None and self.normalizer is not None:
+                try:
+                    payload = self.normalize(payload, gain_db)
+                except Exception as e:
+                    # A dead worker would leave submit()/finish() blocked on the queue forever
+                    self.errors.append(f"{chapter_title or kind}: loudness normalization failed: {e}")
+                    print(f"\n⚠️ Normalization failed for {chapter_title or 'chapter'}, exporting it as is: {e}")
+            
+            if self.failed:
+                self.rescue(kind, payload, file_stem)
+                continue
+            
+            try:
+                if kind == "silence":
+                    self.encoder.write_silence(payload)
+                else:
+                    self.encoder.write(payload, chapter_title=chapter_title, file_stem=file_stem)
+            except Exception as e:
+                # Keep rendering; everything from here on is saved as WAV instead
+                self.failed = True
+                self.errors.append(f"{chapter_title or kind}: {e}")
+                print(f"\n❌ Export failed, saving remaining chapters as WAV: {e}")
+                self.rescue(kind, payload, file_stem)
+
+    def normalize(self, segment, gain_db):
+        """Pass two of loudness normalization on one chapter buffer"""
+        return audio_to_segment(self.normalizer.process(segment_to_samples(segment), gain_db))
+
+    def rescue(self, kind, payload, file_stem):
+        """Save a chapter that could not be encoded so the render is not lost"""
+        if kind != "audio" or not isinstance(payload, AudioSegment):
+            return
+        
+        filename = os.path.join(self.rescue_folder, f"{file_stem or 'chapter'}_unencoded.wav")
+        try:
+            payload.export(filename, format="wav")
+            self.rescued_files.append(filename)
+        except Exception as e:
+            self.errors.append(f"{filename}: {e}")
 
 class ChapterBasedAudiobookAgent:
-    def __init__(self, pdf_path):
+    def __init__(self, pdf_path, llm_budget_usd=None, output_folder="chapters", tts_backend=None):
         self.pdf_path = pdf_path
-        self.output_folder = "chapters"
+        self.output_folder = output_folder
         os.makedirs(self.output_folder, exist_ok=True)
         
-        self.director = StoryDirector()
-        self.speaker = AudiobookSpeaker()
+        self.director = StoryDirector(budget_usd=llm_budget_usd)
+        # Warmed up by the first synthesis, so a dry run (estimate_render) never runs the model
+        self.speaker = AudiobookSpeaker(memo_dir=os.path.join(self.output_folder, "audio_memo"), backend=tts_backend,
+                                        warm_up=False)
+        # Bound to this speaker, so draft renders with another backend get the same units
+        self.chunker = SentenceChunker(self.speaker)
         
         # Load and process the entire book
         print("📖 Loading and analyzing book structure...")
@@ -24,6 +138,21 @@ class ChapterBasedAudiobookAgent:
         print(f"📚 Book: {self.book_metadata['title']}")
         print(f"✍️ Author: {self.book_metadata['author']}")
         print(f"📑 Found {len(self.chapters)} chapters")
+        if self.director.text_cleaner is not None:
+            self.director.text_cleaner.print_report(
+                len(split_by_length(self.director.text_cleaner.raw_text)),
+                len(split_by_length(self.full_text))
+            )
+        
+        # Named speakers and their voices, kept across renders of this book
+        registry_name = f"{self.book_metadata['title'].replace(' ', '_')}_characters.json"
+        self.character_registry = CharacterRegistry(os.path.join(self.output_folder, registry_name))
+        
+        # Paragraph hashes, directions and audio keys of previous renders
+        manifest_name = f"{self.book_metadata['title'].replace(' ', '_')}_render.json"
+        self.render_manifest = RenderManifest(os.path.join(self.output_folder, manifest_name))
+        self.incremental = False
+        self.render_stats = {"paragraphs": 0, "reused_directions": 0, "reused_audio": 0}
         
         # Display chapter list for user
         self.display_chapter_list()
@@ -49,14 +178,20 @@ class ChapterBasedAudiobookAgent:
             "voice_type": "authoritative"
         }
         
-        intro_file = os.path.join(self.output_folder, "00_introduction.wav")
         print(f"\n🎤 Creating introduction: '{self.book_metadata['title']}'")
-        self.speaker.generate_audio(intro_text, intro_notes, intro_file)
+        intro_audio = self.speaker.synthesize(intro_text, intro_notes)
         
-        return AudioSegment.from_wav(intro_file)
+        if intro_audio is None:
+            return AudioSegment.empty()
+        return audio_to_segment(intro_audio)
     
-    def process_chapter(self, chapter_index, chapter_info, include_title=True):
-        """Process a single chapter"""
+    def process_chapter(self, chapter_index, chapter_info, include_title=True, meter=None,
+                        paragraph_range=None):
+        """
+        Process a single chapter (feeding its audio to a LoudnessMeter, if given).
+        paragraph_range=(start, end) renders only those paragraphs, for distributed work units.
+        Paragraph offsets recorded in the render manifest are relative to the returned audio.
+        """
         chapter_title = chapter_info['title']
         chapter_content = chapter_info['content']
         
@@ -70,20 +205,53 @@ class ChapterBasedAudiobookAgent:
         if include_title:
             chapter_title_audio = self.create_chapter_title_audio(chapter_title)
             chapter_audio += chapter_title_audio
+            if meter is not None:
+                meter.feed(segment_to_samples(chapter_title_audio))
             chapter_audio += AudioSegment.silent(duration=1500)  # 1.5 second pause
         
         # Split content into manageable segments (paragraphs)
         paragraphs = self.split_into_paragraphs(chapter_content)
+        if paragraph_range is None:
+            paragraph_range = (0, len(paragraphs))
+            self.render_manifest.start_chapter(chapter_index + 1)
+        else:
+            # A re-run work unit replaces its own slice, never the rest of the chapter
+            self.render_manifest.start_chapter(chapter_index + 1, paragraph_range)
+        
+        # Phonemize this chapter's paragraphs ahead of synthesis on the G2P threads
+        self.speaker.prefetch_phonemes(paragraphs[paragraph_range[0]:paragraph_range[1]])
         
-        for i, paragraph in enumerate(paragraphs):
+        for i in range(*paragraph_range):
+            paragraph = paragraphs[i]
             if not paragraph.strip():
                 continue
                 
             print(f"\r📄 Processing paragraph {i+1}/{len(paragraphs)}", end="")
+            self.render_stats["paragraphs"] += 1
             
-            # Analyze this paragraph
-            previous_context = paragraphs[i-1] if i > 0 else ""
-            scene_analysis = self.director.analyze_scene(paragraph, previous_context)
+            # In incremental mode, unchanged paragraphs keep their previous directions
+            text_hash = paragraph_hash(paragraph)
+            previous = self.render_manifest.lookup(text_hash) if self.incremental else None
+            # Paragraphs directed by the fallback heuristics get another chance at the LLM
+            if previous and "heuristic" in previous["directions"].get("direction_source", "llm"):
+                previous = None
+            
+            if previous:
+                scene_analysis = previous["directions"]
+                self.render_stats["reused_directions"] += 1
+            else:
+                # Analyze this paragraph
+                previous_context = paragraphs[i-1] if i > 0 else ""
+                character_hint, emotion_hint = self.speaker.detect_character_and_emotion(
+                    paragraph, registry=self.character_registry
+                )
+                scene_analysis = self.director.analyze_scene(
+                    paragraph,
+                    previous_context,
+                    registry=self.character_registry,
+                    emotion_hint=emotion_hint,
+                    character_hint=character_hint
+                )
             
             # Prepare character info for speaker
             character_info = {
@@ -93,56 +261,58 @@ class ChapterBasedAudiobookAgent:
                 "age": scene_analysis.get("character_age", "adult"),
                 "scene_type": scene_analysis.get("scene_type", "narration")
             }
+            _, emotion, voice_file, _, speed = self.speaker.plan_synthesis(character_info)
+            memo_key = self.speaker.memo_key(paragraph, voice_file, speed, emotion)
             
-            # Generate audio for this paragraph
-            temp_file = os.path.join(self.output_folder, f"temp_para_{chapter_index}_{i}.wav")
+            # Re-stitch unchanged paragraphs from cached audio; synthesize the rest
+            # (repeated lines also come from the memo)
+            samples = self.speaker.memo_get(memo_key) if previous else None
+            if samples is not None:
+                self.render_stats["reused_audio"] += 1
+            else:
+                samples = self.speaker.synthesize(paragraph, character_info)
             
-            if self.speaker.generate_audio(paragraph, character_info, temp_file):
+            if samples is not None:
+                if meter is not None:
+                    meter.feed(samples)
+                
                 # Add to chapter audio
-                para_audio = AudioSegment.from_wav(temp_file)
-                chapter_audio += para_audio
+                start = int(chapter_audio.frame_count())
+                chapter_audio += audio_to_segment(samples)
+                self.render_manifest.record(
+                    chapter_index + 1, text_hash, scene_analysis, memo_key,
+                    text=paragraph, voice=voice_file, start=start, end=int(chapter_audio.frame_count()),
+                    position=i
+                )
                 
                 # Add small pause between paragraphs
                 if i < len(paragraphs) - 1:
                     pause = AudioSegment.silent(duration=500)  # 500ms pause
                     chapter_audio += pause
-                
-                # Clean up temp file
-                os.remove(temp_file)
         
         print()  # New line after progress
+        self.character_registry.save()
+        self.render_manifest.save(self.book_metadata)
         return chapter_audio
     
-    def split_into_paragraphs(self, text, max_length=1000):
-        """Split text into paragraphs, respecting natural breaks"""
-        paragraphs = []
-        current_para = ""
-        
-        lines = text.split('\n')
-        for line in lines:
-            line_stripped = line.strip()
-            
-            # Skip empty lines that aren't paragraph breaks
-            if not line_stripped and not current_para:
-                continue
-            
-            # If line is empty and we have content, it's a paragraph break
-            if not line_stripped and current_para:
-                paragraphs.append(current_para)
-                current_para = ""
-            elif len(current_para) + len(line_stripped) < max_length:
-                current_para += line_stripped + " "
-            else:
-                # Current paragraph is getting too long, start new one
-                if current_para:
-                    paragraphs.append(current_para)
-                current_para = line_stripped + " "
-        
-        # Add the last paragraph if exists
-        if current_para:
-            paragraphs.append(current_para)
-        
-        return paragraphs
+    def print_reuse_report(self):
+        """Print how much of this render was reused from the previous one"""
+        stats = self.render_stats
+        if not self.incremental or not stats["paragraphs"]:
+            return stats
+        print(f"♻️ Incremental render: reused directions for "
+              f"{stats['reused_directions']}/{stats['paragraphs']} paragraphs "
+              f"({stats['reused_directions'] / stats['paragraphs']:.0%}), audio for "
+              f"{stats['reused_audio']}/{stats['paragraphs']} "
+              f"({stats['reused_audio'] / stats['paragraphs']:.0%})")
+        return stats
+    
+    def split_into_paragraphs(self, text):
+        """
+        Split text into the units that are directed, synthesized, cached and
+        dispatched: whole sentences packed to Kokoro's phoneme window
+        """
+        return self.chunker.chunk(text)
     
     def create_chapter_title_audio(self, chapter_title):
         """Create special audio for chapter titles"""
@@ -153,16 +323,16 @@ class ChapterBasedAudiobookAgent:
             "voice_type": "authoritative"
         }
         
-        temp_file = os.path.join(self.output_folder, "temp_title.wav")
         title_text = f"Chapter. {chapter_title}"
-        self.speaker.generate_audio(title_text, title_notes, temp_file)
-        
-        title_audio = AudioSegment.from_wav(temp_file)
-        os.remove(temp_file)
+        title_audio = self.speaker.synthesize(title_text, title_notes)
         
-        return title_audio
+        if title_audio is None:
+            return AudioSegment.empty()
+        return audio_to_segment(title_audio)
     
-    def build_specific_chapters(self, chapter_numbers, output_name=None, include_intro=True):
+    def build_specific_chapters(self, chapter_numbers, output_name=None, include_intro=True,
+                                output_format="m4b", split_chapters=False, max_pending_chapters=2,
+                                incremental=False, target_lufs=-18.0, dry_run=False, tts_backend=None):
         """
         Build audiobook for specific chapters only
         
@@ -170,6 +340,13 @@ class ChapterBasedAudiobookAgent:
             chapter_numbers: List of chapter numbers (1-indexed) or range string
             output_name: Custom output filename (without extension)
             include_intro: Whether to include book introduction
+            output_format: "m4b" (AAC), "opus" or "mp3"; encoded once with chapter markers
+            split_chapters: Also write one file per chapter (stream copy of the book file)
+            max_pending_chapters: Finished chapters allowed to wait for the export worker
+            incremental: Reuse directions and audio for paragraphs unchanged since the last render
+            target_lufs: Integrated loudness every chapter is normalized to (None to disable)
+            dry_run: Only estimate calls, tokens, duration, time and memory; returns the estimate
+            tts_backend: Synthesize this render with another backend, e.g. "espeak" for a fast draft
         """
         # Parse chapter numbers
         chapters_to_process = self.parse_chapter_selection(chapter_numbers)
@@ -180,14 +357,157 @@ class ChapterBasedAudiobookAgent:
         
         print(f"\n🎯 Selected {len(chapters_to_process)} chapter(s): {chapters_to_process}")
         
-        master_audio = AudioSegment.empty()
+        if dry_run:
+            return self.estimate_render(chapters_to_process, include_intro, incremental, max_pending_chapters)
+        
+        if tts_backend and tts_backend != self.speaker.shared.metrics["backend"]:
+            speaker = self.speaker
+            self.speaker = AudiobookSpeaker(memo_dir=speaker.memo_dir, backend=tts_backend)
+            try:
+                return self.build_specific_chapters(
+                    chapters_to_process, output_name, include_intro, output_format, split_chapters,
+                    max_pending_chapters, incremental, target_lufs
+                )
+            finally:
+                self.speaker.close()
+                self.speaker = speaker
+        
+        self.incremental = incremental
+        self.render_stats = {"paragraphs": 0, "reused_directions": 0, "reused_audio": 0}
+        
+        # Generate output filename
+        if not output_name:
+            chapter_str = "-".join(str(c) for c in chapters_to_process)
+            output_name = f"{self.book_metadata['title'].replace(' ', '_')}_chapters_{chapter_str}"
+            if not self.speaker.backend.needs_voice_pack:
+                # Keep drafts from overwriting the real render
+                output_name += f"_{self.speaker.backend.name}"
+        
+        try:
+            encoder = BookEncoder(
+                output_name,
+                output_format=output_format,
+                metadata={
+                    "title": self.book_metadata['title'],
+                    "artist": self.book_metadata['author'],
+                    "album": self.book_metadata['title'],
+                    "genre": "Audiobook",
+                }
+            )
+        except OSError as e:
+            print(f"❌ Could not start the encoder ({e}). Chapters will be saved as WAV.")
+            encoder = None
+        
+        # Encoding runs on a background thread, overlapped with synthesis of the next chapter
+        normalizer = LoudnessNormalizer(target_lufs=target_lufs) if target_lufs is not None else None
+        export_worker = ChapterExportWorker(
+            encoder,
+            self.output_folder,
+            max_pending=max_pending_chapters,
+            normalizer=normalizer
+        )
+        export_worker.start()
+        
+        try:
+            self.render_chapters_to(export_worker, chapters_to_process, include_intro)
+        except BaseException:
+            # Let the worker drain (it saves WAVs if encoding already failed), then
+            # stop ffmpeg so no process or partial .encoding file outlives the run
+            try:
+                export_worker.finish()
+            finally:
+                if encoder is not None:
+                    encoder.abort()
+            raise
+        
+        # Export final audiobook
+        print(f"\n🎬 Finishing export...")
+        export_errors = export_worker.finish()
+        
+        output_filename = None
+        if not export_worker.failed:
+            try:
+                output_filename = encoder.close()
+            except RuntimeError as e:
+                export_errors.append(str(e))
+        elif encoder is not None:
+            # The chapters went to WAV; the half-written encode is of no use
+            encoder.abort()
+        
+        if output_filename is None:
+            print(f"\n⚠️ Export did not complete:")
+            for error in export_errors:
+                print(f"   ❌ {error}")
+            for filename in export_worker.rescued_files:
+                print(f"   💾 {filename}")
+            self.director.print_usage_report()
+            self.character_registry.print_report()
+            self.speaker.print_memo_report()
+            self.speaker.print_g2p_report()
+            self.speaker.print_pipeline_report()
+            self.chunker.print_report()
+            self.print_reuse_report()
+            return None
+        
+        chapter_files = []
+        if split_chapters:
+            chapter_files = encoder.split_chapters(self.output_folder)
+            print(f"💾 Saved {len(chapter_files)} chapter file(s) to {self.output_folder}")
+        self.place_chapters(encoder, chapters_to_process, output_filename, chapter_files)
+        
+        print(f"\n✅ SUCCESS! Selected chapters created:")
+        print(f"📁 Final file: {output_filename} ({os.path.getsize(output_filename) / 1024 / 1024:.1f} MB)")
+        print(f"📑 Chapter markers: {len(encoder.chapters)}")
+        print(f"⏱️ Total duration: {encoder.duration_seconds / 60:.1f} minutes")
+        if normalizer is not None:
+            print(f"🔊 Loudness: chapters normalized to {normalizer.target_lufs:.1f} LUFS, limiter engaged on "
+                  f"{normalizer.stats['limited_blocks']}/{normalizer.stats['blocks']} blocks")
+        
+        # Cost and latency of the director calls for this render
+        self.director.print_usage_report()
+        self.character_registry.print_report()
+        self.speaker.print_memo_report()
+        self.speaker.print_g2p_report()
+        self.speaker.print_pipeline_report()
+        self.chunker.print_report()
+        self.print_reuse_report()
+        
+        return output_filename
+    
+    def place_chapters(self, encoder, chapters_to_process, output_filename, chapter_files=()):
+        """Record where each rendered chapter sits in the master file (and its split file) in the render manifest"""
+        stems = {f"chapter_{chapter_num:02d}_selected": chapter_num for chapter_num in chapters_to_process}
+        extension = os.path.splitext(output_filename)[1]
+        for chapter in encoder.chapters:
+            chapter_num = stems.get(chapter["file_stem"])
+            if chapter_num is None:
+                continue
+            chapter_file = os.path.join(self.output_folder, chapter["file_stem"] + extension)
+            self.render_manifest.place_chapter(
+                chapter_num, output_filename, chapter["start"], chapter["end"],
+                chapter_file if chapter_file in chapter_files else None
+            )
+        self.render_manifest.save(self.book_metadata)
+    
+    def render_chapters_to(self, export_worker, chapters_to_process, include_intro=True):
+        """
+        Synthesize the intro and selected chapters and hand them to the export worker.
+        Loudness is measured while each chapter synthesizes (pass one); the worker
+        applies the resulting gain and limiter (pass two).
+        """
+        normalizer = export_worker.normalizer
         
         # Add introduction if requested
         if include_intro:
             print("\n🎤 Adding book introduction...")
             intro_audio = self.create_book_introduction()
-            master_audio += intro_audio
-            master_audio += AudioSegment.silent(duration=2000)  # 2 second pause
+            gain_db = None
+            if normalizer is not None:
+                meter = LoudnessMeter()
+                meter.feed(segment_to_samples(intro_audio))
+                gain_db = normalizer.gain_for(meter.integrated_lufs())
+            export_worker.submit(intro_audio, chapter_title="Introduction", file_stem="00_introduction", gain_db=gain_db)
+            export_worker.submit_silence(2000)  # 2 second pause
         
         # Process selected chapters
         for idx, chapter_num in enumerate(chapters_to_process):
@@ -197,41 +517,46 @@ class ChapterBasedAudiobookAgent:
                 chapter_info = self.chapters[chapter_idx]
                 
                 # Process chapter
+                meter = LoudnessMeter() if normalizer is not None else None
                 chapter_audio = self.process_chapter(
                     chapter_idx, 
                     chapter_info, 
-                    include_title=True
+                    include_title=True,
+                    meter=meter
                 )
                 
-                master_audio += chapter_audio
+                gain_db = None
+                if meter is not None:
+                    loudness = meter.integrated_lufs()
+                    gain_db = normalizer.gain_for(loudness)
+                    if loudness is not None:
+                        print(f"🔊 Chapter loudness {loudness:.1f} LUFS → gain {gain_db:+.1f} dB")
                 
-                # Save individual chapter file
-                chapter_filename = os.path.join(
-                    self.output_folder, 
-                    f"chapter_{chapter_num:02d}_selected.wav"
+                # Hand the chapter to the export worker; its measured length sets the marker
+                export_worker.submit(
+                    chapter_audio,
+                    chapter_title=chapter_info['title'],
+                    file_stem=f"chapter_{chapter_num:02d}_selected",
+                    gain_db=gain_db
                 )
-                chapter_audio.export(chapter_filename, format="wav")
-                print(f"💾 Saved individual chapter: {chapter_filename}")
                 
                 # Add chapter break (except after last chapter)
                 if idx < len(chapters_to_process) - 1:
-                    master_audio += AudioSegment.silent(duration=3000)  # 3 second pause
+                    export_worker.submit_silence(3000)  # 3 second pause
             else:
                 print(f"⚠️ Chapter {chapter_num} not found. Skipping.")
-        
-        # Generate output filename
-        if not output_name:
-            chapter_str = "-".join(str(c) for c in chapters_to_process)
-            output_name = f"{self.book_metadata['title'].replace(' ', '_')}_chapters_{chapter_str}"
-        
-        # Export final audiobook
-        output_filename = f"{output_name}.mp3"
-        print(f"\n🎬 Exporting selected chapters to: {output_filename}")
-        master_audio.export(output_filename, format="mp3", bitrate="192k")
-        
-        print(f"\n✅ SUCCESS! Selected chapters created:")
-        print(f"📁 Final file: {output_filename}")
-        print(f"⏱️ Total duration: {len(master_audio) / 1000 / 60:.1f} minutes")
+    
+    def estimate_render(self, chapter_numbers, include_intro=True, incremental=False,
+                        max_pending_chapters=2, profile_path=PROFILE_FILE):
+        """
+        Estimate a render without calling the LLM or TTS, calibrated from the
+        benchmark profile of this machine (see benchmarks.py calibrate)
+        """
+        chapters_to_process = self.parse_chapter_selection(chapter_numbers)
+        estimator = RenderEstimator(self, load_profile(profile_path))
+        estimate = estimator.estimate(chapters_to_process, include_intro, incremental, max_pending_chapters)
+        estimator.print_estimate(estimate)
+        return estimate
     
     def build_chapter_range(self, start_chapter, end_chapter, **kwargs):
         """
@@ -294,30 +619,88 @@ class ChapterBasedAudiobookAgent:
         
         return []
     
-    def build_all_chapters(self):
+    def build_all_chapters(self, **kwargs):
         """Build complete audiobook with all chapters"""
-        self.build_specific_chapters(
+        return self.build_specific_chapters(
             list(range(1, len(self.chapters) + 1)),
             output_name=f"{self.book_metadata['title'].replace(' ', '_')}_complete",
-            include_intro=True
+            include_intro=True,
+            **kwargs
         )
     
+    def create_job_manifest(self, job_dir, chapter_numbers=None, paragraphs_per_unit=None,
+                            include_intro=True, queue_backend="file"):
+        """
+        Split a book into work units for distributed rendering (see work_queue.py)
+        
+        Args:
+            job_dir: Shared folder for the manifest, leases and unit results
+            chapter_numbers: Chapters to include (any parse_chapter_selection format); all by default
+            paragraphs_per_unit: Split chapters into paragraph ranges of this size (None = one unit per chapter)
+            include_intro: Add the book introduction as its own unit
+            queue_backend: "file" (lease files, works on shared filesystems) or "sqlite"
+        """
+        if chapter_numbers is None:
+            chapters_to_process = list(range(1, len(self.chapters) + 1))
+        else:
+            chapters_to_process = self.parse_chapter_selection(chapter_numbers)
+        
+        units = []
+        if include_intro:
+            units.append({"id": "unit_0000", "kind": "intro", "chapter": None, "paragraphs": None})
+        
+        for chapter_num in chapters_to_process:
+            paragraph_count = len(self.split_into_paragraphs(self.chapters[chapter_num - 1]['content']))
+            step = paragraphs_per_unit or max(paragraph_count, 1)
+            for start in range(0, max(paragraph_count, 1), step):
+                units.append({
+                    "id": f"unit_{len(units) + 1:04d}",
+                    "kind": "chapter",
+                    "chapter": chapter_num,
+                    "title": self.chapters[chapter_num - 1]['title'],
+                    "paragraphs": [start, min(start + step, paragraph_count)],
+                })
+        
+        job = {
+            "pdf_path": os.path.abspath(self.pdf_path),
+            "book": self.book_metadata,
+            "queue_backend": queue_backend,
+            "chapters": chapters_to_process,
+            "units": units,
+        }
+        
+        os.makedirs(job_dir, exist_ok=True)
+        job_file = os.path.join(job_dir, "job.json")
+        with open(job_file, 'w', encoding='utf-8') as f:
+            json.dump(job, f, indent=2, ensure_ascii=False)
+        
+        print(f"🧩 Job manifest: {job_file} ({len(units)} work units, {len(chapters_to_process)} chapters)")
+        return job_file
+    
     def create_manifest(self, selected_chapters=None):
-        """Create a JSON manifest with chapter information"""
+        """
+        Create a JSON manifest with chapter information. Files and offsets come
+        from the render manifest, which has the per-paragraph seek index.
+        """
         manifest = {
             "book": self.book_metadata,
             "chapters": [],
             "total_chapters": len(self.chapters),
             "output_folder": self.output_folder,
-            "selected_chapters": selected_chapters
+            "selected_chapters": selected_chapters,
+            "render_manifest": self.render_manifest.path
         }
         
         for i, chapter in enumerate(self.chapters):
-            chapter_file = f"chapter_{i+1:02d}.wav"
+            timeline = self.render_manifest.timeline.get(str(i + 1), {})
             manifest["chapters"].append({
                 "number": i + 1,
                 "title": chapter['title'],
-                "file": chapter_file,
+                "file": timeline.get("file"),
+                "master_file": timeline.get("master_file"),
+                "master_start": timeline.get("master_start"),
+                "master_end": timeline.get("master_end"),
+                "paragraphs": len(self.render_manifest.segments(i + 1)),
                 "word_count": len(chapter['content'].split()),
                 "included_in_selection": (selected_chapters is None) or ((i+1) in selected_chapters)
             })
@@ -337,10 +720,11 @@ def get_user_selection():
     print("2. Process specific chapters (e.g., 1,3,5 or 1-5)")
     print("3. Process a range of chapters (e.g., 3 to 7)")
     print("4. Process single chapter")
+    print("5. Estimate render time and cost (dry run)")
     print("0. Exit")
     print("-"*60)
     
-    choice = input("Enter your choice (0-4): ").strip()
+    choice = input("Enter your choice (0-5): ").strip()
     
     return choice
 
@@ -359,8 +743,9 @@ if __name__ == "__main__":
             
         elif choice == "1":
             # Process all chapters
+            incremental = input("Reuse unchanged paragraphs from the previous render? (y/n, default=n): ").strip().lower() == 'y'
             print("\n📚 Processing ALL chapters...")
-            agent.build_all_chapters()
+            agent.build_all_chapters(incremental=incremental)
             agent.create_manifest()
             break
             
@@ -415,5 +800,14 @@ if __name__ == "__main__":
                 print("❌ Invalid chapter number.")
             break
             
+        elif choice == "5":
+            # Dry run: no LLM or TTS calls
+            selection = input("\nEnter chapter numbers (e.g., '1,3,5' or '1-5', press Enter for all): ").strip()
+            incremental = input("Reuse unchanged paragraphs from the previous render? (y/n, default=n): ").strip().lower() == 'y'
+            agent.estimate_render(
+                selection if selection else list(range(1, len(agent.chapters) + 1)),
+                incremental=incremental
+            )
+            
         else:
             print("❌ Invalid choice. Please try again.")
\ No newline at end of file
@@ -0,0 +1,200 @@
+import os
+import json
+from main import MODEL_PRICING
+from speaker import SAMPLE_RATE
+from render_manifest import paragraph_hash
+
+# Written by `python benchmarks.py calibrate`
+PROFILE_FILE = "benchmark_profile.json"
+
+# Used for anything the profile has not measured (typical CPU laptop, Groq)
+DEFAULT_PROFILE = {
+    "kokoro_rtf": 0.5,                  # synthesis seconds per second of audio
+    "chars_per_audio_second": 14.0,     # at speed 1.0
+    "llm_latency_s": {},                # per model; falls back to default_llm_latency_s
+    "default_llm_latency_s": 0.6,
+    "chars_per_prompt_token": 3.8,
+    "completion_tokens": {"compact": 18, "verbose": 140, "known_speaker": 6},
+    "model_rss_mb": 1200.0,             # process RSS after loading Kokoro
+    "finish_s_per_audio_hour": 60.0,    # loudness passes + encode, per audio-hour
+    "calibrated": None,
+}
+
+# Pauses the orchestrator inserts, in seconds
+PARAGRAPH_PAUSE_S = 0.5
+TITLE_PAUSE_S = 1.5
+CHAPTER_BREAK_S = 3.0
+INTRO_PAUSE_S = 2.0
+
+
+def load_profile(path=PROFILE_FILE):
+    """The benchmark profile of this machine, filled in with defaults"""
+    profile = json.loads(json.dumps(DEFAULT_PROFILE))
+    if path and os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            measured = json.load(f)
+        for key, value in measured.items():
+            if isinstance(value, dict) and isinstance(profile.get(key), dict):
+                profile[key].update(value)
+            else:
+                profile[key] = value
+    return profile
+
+
+def save_profile(measured, path=PROFILE_FILE):
+    """Merge measured values into the stored profile"""
+    profile = {}
+    if os.path.exists(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+    profile.update(measured)
+
+    tmp_path = path + ".tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, indent=2)
+    os.replace(tmp_path, path)
+    return profile
+
+
+class RenderEstimator:
+    """
+    Predicts the cost of a render from the parsed text alone: director calls
+    and tokens (with model routing, the character registry and incremental
+    reuse applied), characters to synthesize, audio duration, wall-clock time
+    and peak memory. No LLM or TTS calls are made.
+    """
+
+    def __init__(self, agent, profile=None):
+        """
+        Args:
+            agent: A loaded ChapterBasedAudiobookAgent
+            profile: Benchmark profile (see load_profile); the stored one by default
+        """
+        self.agent = agent
+        self.profile = profile or load_profile()
+
+    def llm_latency(self, model):
+        return self.profile["llm_latency_s"].get(model, self.profile["default_llm_latency_s"])
+
+    def speech_seconds(self, text, emotion="neutral"):
+        modulation = self.agent.speaker.emotion_modulation.get(emotion, {"speed": 1.0})
+        return len(text) / (self.profile["chars_per_audio_second"] * modulation["speed"])
+
+    def estimate(self, chapters_to_process, include_intro=True, incremental=False, max_pending_chapters=2):
+        director = self.agent.director
+        registry = self.agent.character_registry
+        manifest = self.agent.render_manifest
+        # find_known_speaker counts lookups; a dry run should leave the stats alone
+        registry_stats = dict(registry.stats)
+
+        estimate = {
+            "chapters": len(chapters_to_process),
+            "paragraphs": 0,
+            "llm_calls": 0,
+            "llm_calls_skipped": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "models": {},
+            "cost_usd": 0.0,
+            "characters": 0,
+            "audio_seconds": 0.0,
+        }
+        llm_seconds = 0.0
+        speech_seconds = 0.0
+        longest_chapter_s = 0.0
+
+        def add_call(model, prompt, completion_tokens):
+            nonlocal llm_seconds
+            prompt_tokens = int(len(prompt) / self.profile["chars_per_prompt_token"])
+            pricing = MODEL_PRICING.get(model, {"input": 0.0, "output": 0.0})
+            stats = estimate["models"].setdefault(model, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0})
+            stats["calls"] += 1
+            stats["prompt_tokens"] += prompt_tokens
+            stats["completion_tokens"] += completion_tokens
+            estimate["llm_calls"] += 1
+            estimate["prompt_tokens"] += prompt_tokens
+            estimate["completion_tokens"] += completion_tokens
+            estimate["cost_usd"] += (prompt_tokens * pricing["input"] + completion_tokens * pricing["output"]) / 1_000_000
+            llm_seconds += self.llm_latency(model)
+
+        if include_intro:
+            intro_text = f"{self.agent.book_metadata['title']}. By {self.agent.book_metadata['author']}."
+            estimate["characters"] += len(intro_text)
+            speech_seconds += self.speech_seconds(intro_text)
+            estimate["audio_seconds"] += self.speech_seconds(intro_text) + INTRO_PAUSE_S
+
+        try:
+            for position, chapter_num in enumerate(chapters_to_process):
+                chapter_info = self.agent.chapters[chapter_num - 1]
+                title_text = f"Chapter. {chapter_info['title']}"
+                chapter_s = self.speech_seconds(title_text) + TITLE_PAUSE_S
+                speech_seconds += self.speech_seconds(title_text)
+                estimate["characters"] += len(title_text)
+
+                paragraphs = self.agent.split_into_paragraphs(chapter_info['content'])
+                for i, paragraph in enumerate(paragraphs):
+                    if not paragraph.strip():
+                        continue
+                    estimate["paragraphs"] += 1
+                    estimate["characters"] += len(paragraph)
+                    _, emotion_hint = self.agent.speaker.detect_character_and_emotion(paragraph)
+
+                    previous = manifest.lookup(paragraph_hash(paragraph)) if incremental else None
+                    if not director.backend.uses_llm:
+                        estimate["llm_calls_skipped"] += 1
+                    elif previous and "heuristic" not in previous["directions"].get("direction_source", "llm"):
+                        estimate["llm_calls_skipped"] += 1
+                    elif registry.find_known_speaker(paragraph):
+                        if emotion_hint != "neutral":
+                            estimate["llm_calls_skipped"] += 1
+                        else:
+                            add_call(director.small_model, paragraph,
+                                     self.profile["completion_tokens"]["known_speaker"])
+                    else:
+                        previous_context = paragraphs[i-1] if i > 0 else ""
+                        add_call(director.choose_model(paragraph),
+                                 director.build_prompt(paragraph, previous_context),
+                                 self.profile["completion_tokens"].get(director.schema, 18))
+
+                    seconds = self.speech_seconds(paragraph, emotion_hint)
+                    speech_seconds += seconds
+                    chapter_s += seconds + (PARAGRAPH_PAUSE_S if i < len(paragraphs) - 1 else 0)
+
+                longest_chapter_s = max(longest_chapter_s, chapter_s)
+                estimate["audio_seconds"] += chapter_s
+                if position < len(chapters_to_process) - 1:
+                    estimate["audio_seconds"] += CHAPTER_BREAK_S
+        finally:
+            registry.stats = registry_stats
+
+        # Synthesis and director calls run one after another; normalizing and
+        # encoding overlap with the next chapter, so only the last one adds time
+        finish_s_per_second = self.profile["finish_s_per_audio_hour"] / 3600
+        estimate["llm_seconds"] = llm_seconds
+        estimate["tts_seconds"] = speech_seconds * self.profile["kokoro_rtf"]
+        estimate["wall_seconds"] = llm_seconds + estimate["tts_seconds"] + longest_chapter_s * finish_s_per_second
+
+        # The model plus the largest chapter: its 16-bit audio is copied as it grows
+        # (x2) and normalized in float32 (input, gained copy, limited output: 3 x 4
+        # bytes), while up to max_pending_chapters more wait for the export worker
+        longest_samples = longest_chapter_s * SAMPLE_RATE
+        chapter_bytes = longest_samples * (2 * 2 + 3 * 4) + max_pending_chapters * longest_samples * 2
+        estimate["peak_memory_mb"] = self.profile["model_rss_mb"] + chapter_bytes / 1024 / 1024
+        estimate["calibrated"] = self.profile.get("calibrated")
+        return estimate
+
+    def print_estimate(self, estimate):
+        print(f"\n🧮 Dry run: {estimate['chapters']} chapters, {estimate['paragraphs']} paragraphs")
+        print(f"   Director: {estimate['llm_calls']} calls ({estimate['llm_calls_skipped']} skipped), "
+              f"~{estimate['prompt_tokens']} in / {estimate['completion_tokens']} out tokens, "
+              f"~${estimate['cost_usd']:.4f}")
+        for model, stats in estimate["models"].items():
+            print(f"   • {model}: {stats['calls']} calls")
+        print(f"   Speech: {estimate['characters']:,} characters → ~{estimate['audio_seconds'] / 60:.1f} minutes of audio")
+        print(f"   Wall clock: ~{estimate['wall_seconds'] / 60:.1f} minutes "
+              f"(director {estimate['llm_seconds'] / 60:.1f}, synthesis {estimate['tts_seconds'] / 60:.1f})")
+        print(f"   Peak memory: ~{estimate['peak_memory_mb']:.0f} MB")
+        if estimate["calibrated"]:
+            print(f"   Calibrated {estimate['calibrated']}")
+        else:
+            print(f"   ⚠️ Default profile; run 'python benchmarks.py calibrate <pdf>' for this machine's numbers")
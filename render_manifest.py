@@ -0,0 +1,235 @@
+import os
+import re
+import json
+import hashlib
+import time
+import argparse
+from bisect import bisect_right
+from speaker import SAMPLE_RATE
+
+
+def paragraph_hash(text):
+    """Content hash of a paragraph, insensitive to whitespace changes"""
+    normalized = re.sub(r'\s+', ' ', text).strip()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+class RenderManifest:
+    """
+    Paragraph-level record of a render: for each paragraph hash, the text,
+    the director output, the voice and the audio memo key, and for each
+    chapter the paragraph order with sample offsets into the chapter audio
+    and the master file. A later render of an edited PDF diffs its
+    paragraphs against this and only re-analyzes and re-synthesizes what
+    changed; players use it as a seek index (segments, segment_at, locate).
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.paragraphs = {}
+        self.chapters = {}
+        # chapter number -> {"segments": [[start, end], ...] parallel to chapters[n],
+        #                    "file", "master_file", "master_start", "master_end"}
+        self.timeline = {}
+        self.index = None
+
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.paragraphs = data.get("paragraphs", {})
+            self.chapters = data.get("chapters", {})
+            self.timeline = data.get("timeline", {})
+
+    def lookup(self, text_hash):
+        return self.paragraphs.get(text_hash)
+
+    def start_chapter(self, chapter_number, paragraph_range=None):
+        """
+        Forget the previous paragraph list of a chapter that is being re-rendered,
+        or with paragraph_range=(start, end) only that slice of it (a work unit)
+        """
+        if paragraph_range is None:
+            self.chapters[str(chapter_number)] = []
+            self.timeline[str(chapter_number)] = {"segments": [], "file": None, "master_file": None,
+                                                  "master_start": None, "master_end": None}
+        else:
+            hashes, spans = self.slots(chapter_number, paragraph_range[1] - 1)
+            for position in range(*paragraph_range):
+                hashes[position] = None
+                spans[position] = [None, None]
+        self.index = None
+
+    def slots(self, chapter_number, position):
+        """A chapter's hash and span lists, padded so position exists"""
+        hashes = self.chapters.setdefault(str(chapter_number), [])
+        spans = self.timeline.setdefault(str(chapter_number), {"segments": []})["segments"]
+        for values, empty in ((hashes, None), (spans, [None, None])):
+            while len(values) <= position:
+                values.append(empty)
+        return hashes, spans
+
+    def record(self, chapter_number, text_hash, directions, memo_key, text=None, voice=None,
+               start=None, end=None, position=None):
+        """
+        Args:
+            text: The paragraph, kept for text-to-audio lookup
+            voice: Voice file it was read with
+            start, end: Sample offsets of the paragraph in the chapter audio
+            position: Paragraph index in the chapter; replaces what was recorded there
+                (default: append)
+        """
+        self.paragraphs[text_hash] = {
+            "directions": directions,
+            "memo_key": memo_key,
+            "voice": voice,
+            "text": re.sub(r'\s+', ' ', text).strip() if text else None,
+        }
+        if position is None:
+            position = len(self.chapters.get(str(chapter_number), []))
+        hashes, spans = self.slots(chapter_number, position)
+        hashes[position] = text_hash
+        spans[position] = [start, end]
+        self.index = None
+
+    def place_chapter(self, chapter_number, master_file, master_start, master_end, chapter_file=None):
+        """Where a rendered chapter ended up: its span in the master file and its own file, if split"""
+        timeline = self.timeline.setdefault(str(chapter_number), {"segments": []})
+        timeline.update({"file": chapter_file, "master_file": master_file,
+                         "master_start": master_start, "master_end": master_end})
+        self.index = None
+
+    def segments(self, chapter_number):
+        """A chapter's paragraphs in reading order, with offsets in the chapter and master files"""
+        timeline = self.timeline.get(str(chapter_number), {})
+        spans = timeline.get("segments", [])
+        master_start = timeline.get("master_start")
+
+        result = []
+        for position, text_hash in enumerate(self.chapters.get(str(chapter_number), [])):
+            if text_hash is None:
+                # Not rendered (yet): a work unit that has not reported
+                continue
+            start, end = spans[position] if position < len(spans) else (None, None)
+            placed = master_start is not None and start is not None
+            result.append({
+                "chapter": int(chapter_number),
+                "position": position,
+                "hash": text_hash,
+                "voice": self.paragraphs.get(text_hash, {}).get("voice"),
+                "file": timeline.get("file"),
+                "start": start,
+                "end": end,
+                "master_file": timeline.get("master_file"),
+                "master_start": master_start + start if placed else None,
+                "master_end": master_start + end if placed else None,
+            })
+        return result
+
+    def build_index(self):
+        """Hash -> segments, and per master file the segments sorted by offset"""
+        by_hash = {}
+        by_master = {}
+        for chapter_number in self.chapters:
+            for segment in self.segments(chapter_number):
+                by_hash.setdefault(segment["hash"], []).append(segment)
+                if segment["master_start"] is not None:
+                    by_master.setdefault(segment["master_file"], []).append(segment)
+        for segments in by_master.values():
+            segments.sort(key=lambda segment: segment["master_start"])
+        self.index = {
+            "hash": by_hash,
+            "master": by_master,
+            "master_starts": {master: [s["master_start"] for s in segments] for master, segments in by_master.items()},
+        }
+        return self.index
+
+    def locate(self, text):
+        """
+        Where some text was read: the paragraph with exactly this text, else
+        every paragraph containing it as a phrase (case-insensitive)
+        """
+        index = self.index or self.build_index()
+        hits = index["hash"].get(paragraph_hash(text))
+        if hits:
+            return hits
+        phrase = re.sub(r'\s+', ' ', text).strip().lower()
+        return [segment for text_hash, segments in index["hash"].items()
+                if phrase in (self.paragraphs.get(text_hash, {}).get("text") or "").lower()
+                for segment in segments]
+
+    def segment_at(self, master_sample, master_file=None):
+        """The paragraph playing at a sample offset of a master file (the only one if not given)"""
+        index = self.index or self.build_index()
+        if master_file is None:
+            if len(index["master"]) != 1:
+                return None
+            master_file = next(iter(index["master"]))
+        starts = index["master_starts"].get(master_file, [])
+        position = bisect_right(starts, master_sample) - 1
+        if position < 0:
+            return None
+        segment = index["master"][master_file][position]
+        return segment if master_sample < segment["master_end"] else None
+
+    def changed_positions(self, chapter_number, paragraphs):
+        """Positions in a chapter's current paragraph list that differ from this render, for partial re-renders"""
+        previous = self.chapters.get(str(chapter_number), [])
+        return [i for i, paragraph in enumerate(paragraphs)
+                if i >= len(previous) or previous[i] != paragraph_hash(paragraph)]
+
+    def save(self, book_metadata=None):
+        # Drop paragraphs no chapter refers to any more (edited-away text)
+        referenced = {text_hash for hashes in self.chapters.values() for text_hash in hashes}
+        self.paragraphs = {h: entry for h, entry in self.paragraphs.items() if h in referenced}
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "book": book_metadata,
+                "updated": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "sample_rate": SAMPLE_RATE,
+                "chapters": self.chapters,
+                "timeline": self.timeline,
+                "paragraphs": self.paragraphs,
+            }, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+
+def describe_segment(segment):
+    line = f"Chapter {segment['chapter']} ¶{segment['position'] + 1} ({segment['voice']})"
+    if segment["start"] is not None:
+        line += f" | chapter {segment['start'] / SAMPLE_RATE:.2f}-{segment['end'] / SAMPLE_RATE:.2f}s"
+    if segment["master_start"] is not None:
+        line += (f" | {segment['master_file']} "
+                 f"{segment['master_start'] / SAMPLE_RATE:.2f}-{segment['master_end'] / SAMPLE_RATE:.2f}s")
+    return line
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Look up audio in a render manifest")
+    parser.add_argument("manifest")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    locate_parser = subparsers.add_parser("locate", help="Where a paragraph or phrase is read")
+    locate_parser.add_argument("text")
+    at_parser = subparsers.add_parser("at", help="Paragraph playing at a time of the master file")
+    at_parser.add_argument("seconds", type=float)
+    at_parser.add_argument("--master")
+    chapter_parser = subparsers.add_parser("chapter", help="Paragraph offsets of a chapter")
+    chapter_parser.add_argument("number", type=int)
+
+    args = parser.parse_args()
+    manifest = RenderManifest(args.manifest)
+
+    if args.command == "locate":
+        segments = manifest.locate(args.text)
+    elif args.command == "at":
+        segment = manifest.segment_at(int(args.seconds * SAMPLE_RATE), args.master)
+        segments = [segment] if segment else []
+    else:
+        segments = manifest.segments(args.number)
+
+    if not segments:
+        print("❌ Nothing found.")
+    for segment in segments:
+        print(describe_segment(segment))
@@ -1,14 +1,209 @@
 import os
 import soundfile as sf
-from kokoro import KPipeline
 import numpy as np
 import re
+import json
+import hashlib
+import threading
+import time
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from audio_store import open_audio_store
+from tts_backends import create_backend, TTS_BACKENDS, KOKORO_RUNTIMES, REPO_ID, SAMPLE_RATE, MODEL_VERSION
+
+# Kokoro's context window in phonemes
+MAX_PHONEMES = 510
+
+BACKENDS = tuple(TTS_BACKENDS)
+
+# Written by autotune.py: best (workers, torch threads, chunk size) for this machine
+TUNING_FILE = "synthesis_tuning.json"
+
+def load_tuning(path=TUNING_FILE):
+    """The autotuned synthesis settings, or {} if this machine was never tuned"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def apply_tuning(tuning):
+    """Set torch's intra-op threads from the tuning, unless OMP_NUM_THREADS says otherwise"""
+    threads = tuning.get("threads")
+    if threads and "OMP_NUM_THREADS" not in os.environ:
+        try:
+            import torch
+        except ImportError:
+            # Draft and test backends run without PyTorch
+            return
+        torch.set_num_threads(threads)
+        print(f"⚙️ Autotuned: {threads} torch threads, {tuning.get('chunk_phonemes', MAX_PHONEMES)}-phoneme chunks")
+
+WARM_UP_TEXT = "Warming up."
+
+class SharedPipeline:
+    """
+    One TTS backend (see tts_backends.py) per language for the whole process.
+    Weights are loaded once and a short warm-up synthesis pays the one-time
+    kernel initialization before the first real paragraph. Every
+    AudiobookSpeaker (all agents, scheduler threads, app sessions) uses the
+    same instance; acoustic-model calls are serialized by a lock because the
+    model is not thread-safe, while G2P runs on per-thread instances.
+    """
+
+    def __init__(self, lang_code='a', backend="torch"):
+        start = time.perf_counter()
+        self.backend = create_backend(backend, lang_code, threads=load_tuning().get("threads"))
+        self.lock = threading.Lock()
+        self.warmed_up = False
+        self.metrics = {
+            "lang_code": lang_code,
+            "backend": backend,
+            "load_s": time.perf_counter() - start,
+            "warm_up_s": None,
+            "first_call_s": None,
+            "calls": 0,
+            "call_s": 0.0,
+            "speakers": 0,
+        }
+        print(f"🧊 TTS backend '{backend}' ({lang_code}) loaded in {self.metrics['load_s']:.1f}s")
+
+    def warm_up(self, voice):
+        """Run one throwaway synthesis; only the first call does anything"""
+        with self.lock:
+            if self.warmed_up or voice is None:
+                return
+            start = time.perf_counter()
+            self.run_acoustic_model(self.phonemize(WARM_UP_TEXT), voice, 1.0)
+            self.warmed_up = True
+            self.metrics["warm_up_s"] = time.perf_counter() - start
+        print(f"🔥 Pipeline warmed up in {self.metrics['warm_up_s']:.1f}s")
+
+    def phonemize(self, text):
+        """Run G2P only (misaki/espeak-ng); lock-free, so G2P threads overlap each other and synthesis"""
+        return self.backend.phonemize(text)
+
+    def run_acoustic_model(self, phonemes, voice, speed):
+        """Audio chunks for one phoneme string on the configured backend (caller holds the lock)"""
+        return self.backend.synthesize(phonemes, voice, speed)
+
+    def generate_from_phonemes(self, phoneme_chunks, voice, speed):
+        """Run only the acoustic model on pre-computed phoneme strings (each <= MAX_PHONEMES)"""
+        with self.lock:
+            start = time.perf_counter()
+            chunks = []
+            for phonemes in phoneme_chunks:
+                chunks.extend(self.run_acoustic_model(phonemes, voice, speed))
+            elapsed = time.perf_counter() - start
+            if self.metrics["first_call_s"] is None:
+                self.metrics["first_call_s"] = elapsed
+            self.metrics["calls"] += 1
+            self.metrics["call_s"] += elapsed
+        return chunks
+
+
+class PhonemeCache:
+    """
+    Sentence -> phoneme string cache. Kept in memory and, with a path, in an
+    append-only JSON-lines file so later renders (and other processes sharing
+    the folder) skip G2P for every sentence seen before. Whole sentences are
+    the unit because G2P is context dependent ("read", "lead").
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "g2p_s": 0.0}
+
+        if path and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        sentence, phonemes = json.loads(line)
+                    except ValueError:
+                        continue  # torn line from an interrupted write
+                    self.entries[sentence] = phonemes
+
+    def get(self, sentence):
+        with self.lock:
+            phonemes = self.entries.get(sentence)
+            if phonemes is not None:
+                self.stats["hits"] += 1
+            return phonemes
+
+    def put(self, sentence, phonemes, seconds):
+        with self.lock:
+            self.stats["misses"] += 1
+            self.stats["g2p_s"] += seconds
+            if sentence in self.entries:
+                return
+            self.entries[sentence] = phonemes
+            if self.path:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(json.dumps([sentence, phonemes], ensure_ascii=False) + "\n")
+
+
+_shared_pipelines = {}
+_shared_pipelines_lock = threading.Lock()
+
+def shared_pipeline(lang_code='a', backend="torch"):
+    """The process-wide SharedPipeline for a language and backend, created on first use"""
+    with _shared_pipelines_lock:
+        if (lang_code, backend) not in _shared_pipelines:
+            if not _shared_pipelines:
+                apply_tuning(load_tuning())
+            _shared_pipelines[(lang_code, backend)] = SharedPipeline(lang_code, backend)
+        return _shared_pipelines[(lang_code, backend)]
 
 class AudiobookSpeaker:
-    def __init__(self, lang_code='a'):
-        self.pipeline = KPipeline(lang_code=lang_code, repo_id="hexgrad/Kokoro-82M")
+    def __init__(self, lang_code='a', memo_dir=None, memo_max_items=256, voice_bank=None, warm_up=True,
+                 g2p_workers=2, chunk_phonemes=None, backend=None, audio_store=None):
+        """
+        Args:
+            lang_code: Kokoro language code
+            voice_bank: Path to a packed voice_bank.npy (defaults to the one in voice_dir, if present)
+            memo_dir: Folder for the on-disk audio memo tier and phoneme cache (None keeps both in memory only)
+            memo_max_items: Number of synthesized clips kept in memory
+            warm_up: Run the warm-up synthesis now if this process has not yet
+                (otherwise it runs before the first synthesis that misses the memo)
+            g2p_workers: Threads that phonemize upcoming paragraphs ahead of synthesis
+            chunk_phonemes: Phonemes per acoustic-model call (autotuned value, else MAX_PHONEMES)
+            backend: One of BACKENDS: Kokoro ("torch", "onnx", "onnx-int8"), "espeak" drafts,
+                "tone"/"null" for tests (default: TTS_BACKEND env var, else torch)
+            audio_store: Cross-book AudioStore used as the disk tier instead of memo_dir
+                (default: the one configured by AUDIO_STORE_DIR, if any; False for none)
+        """
+        start = time.perf_counter()
+        self.shared = shared_pipeline(lang_code, backend or os.getenv("TTS_BACKEND", "torch"))
+        self.backend = self.shared.backend
         self.voice_dir = os.path.join("model_assets", "voices")
         
+        # Memory-mapped voice bank shared through the page cache by every process
+        self.voice_bank = None
+        self.voice_bank_index = {}
+        self.load_voice_bank(voice_bank or os.path.join(self.voice_dir, "voice_bank.npy"))
+        
+        # Content-addressed memo of synthesized audio
+        self.audio_memo = OrderedDict()
+        self.memo_max_items = memo_max_items
+        self.memo_dir = memo_dir
+        self.memo_lock = threading.Lock()
+        self.memo_stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+        if memo_dir:
+            os.makedirs(memo_dir, exist_ok=True)
+        # False opts out even when AUDIO_STORE_DIR is set (benchmarks must synthesize every clip)
+        self.audio_store = open_audio_store() if audio_store is None else audio_store or None
+        
+        # G2P runs as its own stage, cached per sentence and prefetched by worker threads
+        cache_name = f"phonemes_{lang_code}_{hashlib.sha256(self.backend.g2p_version.encode()).hexdigest()[:8]}.jsonl"
+        use_disk = memo_dir and self.backend.has_g2p
+        self.phoneme_cache = PhonemeCache(os.path.join(memo_dir, cache_name) if use_disk else None)
+        self.g2p_executor = ThreadPoolExecutor(max_workers=g2p_workers, thread_name_prefix="g2p") if g2p_workers else None
+        self.g2p_pending = {}
+        self.g2p_stats = {"paragraphs": 0, "wait_s": 0.0}
+        self.chunk_phonemes = min(MAX_PHONEMES, chunk_phonemes or load_tuning().get("chunk_phonemes", MAX_PHONEMES))
+        
         self.voice_library = {
             # Narrator voices
             "neutral_narrator": "af_bella.pt",
@@ -46,11 +241,35 @@ class AudiobookSpeaker:
             "mysterious": {"speed": 0.9, "pitch_shift": 0.95, "volume": 0.95},
         }
         
+        if warm_up:
+            self.warm_up()
+        with self.shared.lock:
+            self.shared.metrics["speakers"] += 1
+        self.init_seconds = time.perf_counter() - start
         
-    def detect_character_and_emotion(self, text_segment, context=""):
+    def close(self):
+        """Stop the G2P worker threads; pending prefetches are dropped"""
+        if self.g2p_executor is not None:
+            self.g2p_executor.shutdown(wait=True, cancel_futures=True)
+            self.g2p_executor = None
+        self.g2p_pending.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def warm_up(self):
+        """Pay the process's one-time kernel initialization (no-op once done)"""
+        if not self.shared.warmed_up:
+            self.shared.warm_up(self.backend_voice(self.voice_library["neutral_narrator"]))
+
+    def detect_character_and_emotion(self, text_segment, context="", registry=None):
         """
         Analyze text to determine who's speaking and their emotional state
-        This should work with the StoryDirector's analysis
+        This should work with the StoryDirector's analysis.
+        A CharacterRegistry, if given, resolves named speakers to their known voice.
         """
         # Patterns to detect dialogue
         dialogue_patterns = [
@@ -73,8 +292,11 @@ class AudiobookSpeaker:
                 # Extract character name from dialogue tags
                 if match.groups():
                     char_name = match.group(1).lower()
+                    known = registry.lookup(char_name) if registry is not None else None
                     # Map common names to character types
-                    if char_name in ['she', 'her', 'mary', 'sarah', 'emily', 'anna']:
+                    if known:
+                        character = known["character"]
+                    elif char_name in ['she', 'her', 'mary', 'sarah', 'emily', 'anna']:
                         character = "young_woman"
                     elif char_name in ['he', 'him', 'john', 'david', 'michael', 'jack']:
                         character = "man"
@@ -114,7 +336,11 @@ class AudiobookSpeaker:
         # Try exact match first
         if voice_key in self.voice_library:
             return self.voice_library[voice_key]
-        
+
+        # Characters with a single voice (child_boy, old_woman, narrators)
+        if character in self.voice_library:
+            return self.voice_library[character]
+
         # Fallback to character with neutral emotion
         neutral_key = f"{character}_neutral"
         if neutral_key in self.voice_library:
@@ -123,62 +349,308 @@ class AudiobookSpeaker:
         # Ultimate fallback to neutral narrator
         return self.voice_library["neutral_narrator"]
 
+    def load_voice_bank(self, bank_path):
+        """Memory-map a voice bank written by voice_downloader.pack_voice_bank"""
+        index_path = os.path.splitext(bank_path)[0] + ".json"
+        if not (os.path.exists(bank_path) and os.path.exists(index_path)):
+            return False
+        
+        with open(index_path, 'r', encoding='utf-8') as f:
+            self.voice_bank_index = json.load(f)["voices"]
+        self.voice_bank = np.load(bank_path, mmap_mode='r')
+        print(f"📦 Voice bank mapped: {len(self.voice_bank_index)} voices")
+        return True
+
+    def backend_voice(self, voice_file):
+        """What the backend takes as a voice: a Kokoro voice pack, or just the file name"""
+        if self.backend.needs_voice_pack:
+            return self.resolve_voice(voice_file)
+        return voice_file
+
+    def resolve_voice(self, voice_file):
+        """
+        Return what KPipeline should receive for a voice: a zero-copy tensor
+        view into the voice bank when available, otherwise the .pt path.
+        Returns None if the voice is nowhere to be found.
+        """
+        entry = self.voice_bank_index.get(voice_file)
+        if entry is not None:
+            import torch
+            size = int(np.prod(entry["shape"]))
+            view = self.voice_bank[entry["offset"]:entry["offset"] + size].reshape(entry["shape"])
+            with warnings.catch_warnings():
+                # The map is read-only on purpose; the pipeline never writes to voice packs
+                warnings.simplefilter("ignore", UserWarning)
+                return torch.from_numpy(view)
+        
+        voice_path = os.path.join(self.voice_dir, voice_file)
+        if os.path.exists(voice_path):
+            return voice_path
+        return None
+
     def apply_emotion_modulation(self, audio_data, emotion):
         """Apply basic audio modulation based on emotion"""
         if emotion not in self.emotion_modulation:
             return audio_data
         
-        modulation = self.emotion_modulation[emotion]  
-    
-    def generate_audio(self, text, character_info, output_filename):
+        modulation = self.emotion_modulation[emotion]
+        volume = modulation.get("volume", 1.0)
+        if volume == 1.0:
+            return audio_data
+        
+        return np.clip(audio_data * volume, -1.0, 1.0).astype(np.float32)
+
+    def normalize_text(self, text):
+        """Canonical form of text used for memo keys"""
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def memo_key(self, text, voice_file, speed, emotion):
+        """Content address for one synthesis: text, voice, speed, modulation and model version"""
+        modulation = self.emotion_modulation.get(emotion, self.emotion_modulation["neutral"])
+        payload = json.dumps([
+            self.normalize_text(text),
+            voice_file,
+            speed,
+            modulation,
+            self.backend.version,
+        ], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def memo_get(self, key):
+        """Look up audio in memory, then on disk (the shared audio store, else memo_dir)"""
+        with self.memo_lock:
+            if key in self.audio_memo:
+                self.audio_memo.move_to_end(key)
+                self.memo_stats["memory_hits"] += 1
+                return self.audio_memo[key]
+        
+        if self.audio_store is not None:
+            audio = self.audio_store.get(key)
+            if audio is not None:
+                self.memo_put(key, audio, persist=False)
+                with self.memo_lock:
+                    self.memo_stats["disk_hits"] += 1
+            return audio
+        
+        if self.memo_dir:
+            path = os.path.join(self.memo_dir, f"{key}.npy")
+            if os.path.exists(path):
+                try:
+                    audio = np.load(path)
+                except (OSError, ValueError):
+                    return None
+                self.memo_put(key, audio, persist=False)
+                with self.memo_lock:
+                    self.memo_stats["disk_hits"] += 1
+                return audio
+        
+        return None
+
+    def memo_put(self, key, audio, persist=True):
+        """Store audio in memory (LRU-bounded) and optionally on disk"""
+        with self.memo_lock:
+            self.audio_memo[key] = audio
+            self.audio_memo.move_to_end(key)
+            while len(self.audio_memo) > self.memo_max_items:
+                self.audio_memo.popitem(last=False)
+        
+        if persist and self.audio_store is not None:
+            self.audio_store.put(key, audio)
+        elif persist and self.memo_dir:
+            path = os.path.join(self.memo_dir, f"{key}.npy")
+            # Write to a unique temp file first so concurrent writers never see half a file
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                np.save(f, audio)
+            os.replace(tmp_path, path)
+
+    def split_sentences(self, text):
+        # A sentence may end inside closing quotes: "Run!" she said.
+        pattern = r'(?:(?<=[.!?\u2026])|(?<=[.!?\u2026]["\'\u201d\u2019]))\s+'
+        return [sentence for sentence in re.split(pattern, self.normalize_text(text)) if sentence]
+
+    def phonemize_sentence(self, sentence):
+        """Phonemes for one sentence, from the cache or a fresh G2P run"""
+        phonemes = self.phoneme_cache.get(sentence)
+        if phonemes is None:
+            start = time.perf_counter()
+            phonemes = self.shared.phonemize(sentence)
+            self.phoneme_cache.put(sentence, phonemes, time.perf_counter() - start)
+        return phonemes
+
+    def phonemize_text(self, text):
+        return [self.phonemize_sentence(sentence) for sentence in self.split_sentences(text)]
+
+    def prefetch_phonemes(self, texts):
+        """Start G2P for upcoming paragraphs on the worker threads"""
+        if self.g2p_executor is None:
+            return
+        # Drop finished prefetches nobody consumed (paragraphs served from the audio memo);
+        # their phonemes are in the cache anyway
+        for key in [key for key, future in self.g2p_pending.items() if future.done()]:
+            del self.g2p_pending[key]
+        for text in texts:
+            key = self.normalize_text(text)
+            if key and key not in self.g2p_pending:
+                self.g2p_pending[key] = self.g2p_executor.submit(self.phonemize_text, text)
+
+    def phoneme_chunks(self, text):
         """
-        Generate audio with character-specific voices
-        character_info should contain: {"character": "...", "emotion": "...", "gender": "...", "age": "..."}
+        Phonemes for a paragraph packed into chunks of at most chunk_phonemes,
+        breaking between sentences (or, for very long sentences, between words)
         """
+        start = time.perf_counter()
+        future = self.g2p_pending.pop(self.normalize_text(text), None)
+        sentences = future.result() if future is not None else self.phonemize_text(text)
+        self.g2p_stats["paragraphs"] += 1
+        self.g2p_stats["wait_s"] += time.perf_counter() - start
+
+        chunks = []
+        current = ""
+        for phonemes in sentences:
+            for piece in self.split_phonemes(phonemes):
+                if current and len(current) + 1 + len(piece) > self.chunk_phonemes:
+                    chunks.append(current)
+                    current = piece
+                else:
+                    current = f"{current} {piece}" if current else piece
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def split_phonemes(self, phonemes):
+        limit = self.chunk_phonemes
+        if len(phonemes) <= limit:
+            return [phonemes] if phonemes.strip() else []
+        pieces = []
+        current = ""
+        for word in phonemes.split(" "):
+            if current and len(current) + 1 + len(word) > limit:
+                pieces.append(current)
+                current = word[:limit]
+            else:
+                current = f"{current} {word}" if current else word[:limit]
+        if current:
+            pieces.append(current)
+        return pieces
+
+    def plan_synthesis(self, character_info):
+        """Resolve character_info to (character, emotion, voice_file, voice, speed)"""
         # Extract character and emotion info
         character = character_info.get("character", "narrator")
         emotion = character_info.get("emotion", "neutral")
         
         # Get appropriate voice file
         voice_file = self.get_voice_for_character(character, emotion)
-        voice_path = os.path.join(self.voice_dir, voice_file)
+        voice = self.backend_voice(voice_file)
+        
+        if voice is None:
+            print(f"⚠️ Voice file {voice_file} not found. Using default.")
+            voice_file = "af_bella.pt"
+            # resolve_voice may return a tensor, which has no truth value
+            voice = self.resolve_voice(voice_file)
+            if voice is None:
+                voice = os.path.join(self.voice_dir, voice_file)
         
         # Get speed modulation
         modulation = self.emotion_modulation.get(emotion, self.emotion_modulation["neutral"])
         speed = modulation["speed"]
         
+        return character, emotion, voice_file, voice, speed
+
+    def memo_key_for(self, text, character_info):
+        """Memo key synthesize() would use for this text and direction"""
+        _, emotion, voice_file, _, speed = self.plan_synthesis(character_info)
+        return self.memo_key(text, voice_file, speed, emotion)
+
+    def synthesize(self, text, character_info):
+        """
+        Synthesize text and return the audio samples (24 kHz float32), or None.
+        Identical requests are served from the audio memo.
+        """
+        character, emotion, voice_file, voice, speed = self.plan_synthesis(character_info)
+        
         print(f"🎙️ Character: {character} | Emotion: {emotion} | Voice: {voice_file}")
         
-        if not os.path.exists(voice_path):
-            print(f"⚠️ Voice file {voice_file} not found. Using default.")
-            voice_path = os.path.join(self.voice_dir, "af_bella.pt")
-            
-        # Generate audio
-        generator = self.pipeline(
-            text, 
-            voice=voice_path, 
-            speed=speed, 
-            split_pattern=r'\n+'
-        )
-        
-        audio_chunks = []
-        for i, (gs, ps, audio) in enumerate(generator):
-            audio_chunks.append(audio)
-        
-        if audio_chunks:
-            combined_audio = np.concatenate(audio_chunks)
-            
-            # Apply emotion-based audio modulation
-            modulated_audio = self.apply_emotion_modulation(combined_audio, emotion)  # FIXED: Changed emotion_modulation to apply_emotion_modulation
+        key = self.memo_key(text, voice_file, speed, emotion)
+        cached = self.memo_get(key)
+        if cached is not None:
+            return cached
+        
+        with self.memo_lock:
+            self.memo_stats["misses"] += 1
             
+        # G2P (usually already done by the prefetch threads), then the acoustic model
+        # (serialized with every other speaker in this process)
+        self.warm_up()
+        audio_chunks = self.shared.generate_from_phonemes(self.phoneme_chunks(text), voice, speed)
+        
+        if not audio_chunks:
+            return None
+        
+        combined_audio = np.concatenate(audio_chunks)
+        
+        # Apply emotion-based audio modulation
+        modulated_audio = self.apply_emotion_modulation(combined_audio, emotion)
+        
+        self.memo_put(key, modulated_audio)
+        return modulated_audio
+    
+    def generate_audio(self, text, character_info, output_filename):
+        """
+        Generate audio with character-specific voices
+        character_info should contain: {"character": "...", "emotion": "...", "gender": "...", "age": "..."}
+        """
+        modulated_audio = self.synthesize(text, character_info)
+        
+        if modulated_audio is not None:
             # Save audio
-            sf.write(output_filename, modulated_audio, 24000)
+            sf.write(output_filename, modulated_audio, SAMPLE_RATE)
             print(f"✅ Audio saved: {output_filename}")
             return True
         else:
             print("❌ Error: No audio was generated.")
             return False
 
+    def print_memo_report(self):
+        """Print how much synthesis the audio memo saved"""
+        stats = self.memo_stats
+        lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+        if not lookups:
+            return stats
+        hit_rate = (stats["memory_hits"] + stats["disk_hits"]) / lookups
+        print(f"🧠 Audio memo: {hit_rate:.0%} hit rate "
+              f"({stats['memory_hits']} memory, {stats['disk_hits']} disk, {stats['misses']} synthesized)")
+        if self.audio_store is not None:
+            self.audio_store.print_report()
+        return stats
+
+    def print_g2p_report(self):
+        """Print phoneme cache hit rate and G2P time per paragraph"""
+        stats = self.phoneme_cache.stats
+        lookups = stats["hits"] + stats["misses"]
+        paragraphs = self.g2p_stats["paragraphs"]
+        if not lookups or not paragraphs:
+            return stats
+        print(f"🔤 G2P: {stats['hits'] / lookups:.0%} sentence cache hit rate "
+              f"({len(self.phoneme_cache.entries)} cached) | "
+              f"{stats['g2p_s'] / paragraphs * 1000:.0f} ms G2P per paragraph, "
+              f"{self.g2p_stats['wait_s'] / paragraphs * 1000:.0f} ms of it on the synthesis path")
+        return stats
+
+    def print_pipeline_report(self):
+        """Print cold-start and first-call metrics of the shared pipeline"""
+        metrics = self.shared.metrics
+        line = f"🧊 Pipeline: loaded in {metrics['load_s']:.1f}s"
+        if metrics["warm_up_s"] is not None:
+            line += f", warm-up {metrics['warm_up_s']:.1f}s"
+        if metrics["calls"]:
+            line += (f", first call {metrics['first_call_s']:.2f}s, "
+                     f"avg {metrics['call_s'] / metrics['calls']:.2f}s over {metrics['calls']} calls")
+        line += f" | shared by {metrics['speakers']} speaker(s), this one ready in {self.init_seconds:.2f}s"
+        print(line)
+        return metrics
+
 
 # Add this simple version for testing
 if __name__ == "__main__":
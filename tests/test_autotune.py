@@ -0,0 +1,19 @@
+import pytest
+
+pytest.importorskip("soundfile")
+
+import autotune
+
+
+def test_profile_gets_the_per_process_rtf(monkeypatch, tmp_path):
+    # Two workers together render audio 0.3x real time; each one alone runs at 0.6
+    combined = {(1, 1, 200): 0.5, (2, 1, 200): 0.3}
+    monkeypatch.setattr(autotune, "measure", lambda workers, threads, chunk: combined[(workers, threads, chunk)])
+    monkeypatch.setattr(autotune.os, "cpu_count", lambda: 2)
+    saved = {}
+    monkeypatch.setattr(autotune, "save_profile", lambda profile, path: saved.update(profile))
+
+    tuning = autotune.autotune([1, 2], [1], [200], output=str(tmp_path / "tuning.json"))
+
+    assert tuning["workers"] == 2
+    assert saved["kokoro_rtf"] == pytest.approx(0.6)
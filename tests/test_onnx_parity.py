@@ -0,0 +1,48 @@
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip("soundfile")
+
+from benchmarks import PARITY_LIMITS_DB, bench_onnx_parity, log_spectral_distance
+from onnx_backend import ONNX_INT8_MODEL, ONNX_MODEL, export_onnx
+from speaker import REPO_ID, SAMPLE_RATE
+
+
+def test_log_spectral_distance_separates_matching_and_different_audio():
+    rng = np.random.default_rng(0)
+    t = np.arange(2 * SAMPLE_RATE) / SAMPLE_RATE
+    reference = (0.3 * np.sin(2 * np.pi * 220 * t) * (1 + 0.5 * np.sin(2 * np.pi * 3 * t))).astype(np.float32)
+
+    assert log_spectral_distance(reference, reference) == 0.0
+    # Quantization-sized noise stays well inside the int8 limit, a different signal does not
+    close = reference + rng.normal(0, 1e-4, reference.shape).astype(np.float32)
+    assert log_spectral_distance(reference, close) < PARITY_LIMITS_DB["onnx-int8"]
+    different = (0.3 * np.sin(2 * np.pi * 330 * t)).astype(np.float32)
+    assert log_spectral_distance(reference, different) > PARITY_LIMITS_DB["onnx-int8"]
+    # Only the common length is compared
+    assert log_spectral_distance(reference, reference[:SAMPLE_RATE]) == 0.0
+
+
+def kokoro_weights_cached():
+    hub = pytest.importorskip("huggingface_hub")
+    return isinstance(hub.try_to_load_from_cache(REPO_ID, "kokoro-v1_0.pth"), str)
+
+
+def test_onnx_backends_match_torch():
+    pytest.importorskip("torch")
+    pytest.importorskip("kokoro")
+    pytest.importorskip("onnxruntime")
+    if not (os.path.exists(ONNX_MODEL) and os.path.exists(ONNX_INT8_MODEL)):
+        if not kokoro_weights_cached():
+            pytest.skip("Kokoro weights not downloaded")
+        export_onnx()
+
+    results, passed = bench_onnx_parity()
+
+    for backend, stats in results.items():
+        assert stats["max_lsd_db"] <= PARITY_LIMITS_DB[backend], backend
+        assert stats["length_ratio"] == pytest.approx(1.0, abs=0.05), backend
+    assert set(results) == set(PARITY_LIMITS_DB)
+    assert passed
@@ -0,0 +1,36 @@
+import threading
+
+import pytest
+
+pytest.importorskip("soundfile")
+
+from speaker import AudiobookSpeaker
+
+
+def test_g2p_threads_run_concurrently(monkeypatch):
+    speaker = AudiobookSpeaker(memo_dir=None, backend="tone", audio_store=False, warm_up=False, g2p_workers=2)
+    inside = threading.Barrier(2, timeout=5)
+
+    def phonemize(text):
+        # Both worker threads must be inside G2P at once to pass the barrier
+        inside.wait()
+        return text
+
+    monkeypatch.setattr(speaker.backend, "phonemize", phonemize)
+    with speaker:
+        speaker.prefetch_phonemes(["First paragraph.", "Second paragraph."])
+        assert speaker.phoneme_chunks("First paragraph.") == ["First paragraph."]
+        assert speaker.phoneme_chunks("Second paragraph.") == ["Second paragraph."]
+
+
+def test_close_stops_the_g2p_workers():
+    speaker = AudiobookSpeaker(memo_dir=None, backend="tone", audio_store=False, warm_up=False)
+    speaker.prefetch_phonemes(["A paragraph."])
+    threads = list(speaker.g2p_executor._threads)
+    speaker.close()
+
+    assert speaker.g2p_executor is None
+    assert not any(thread.is_alive() for thread in threads)
+    # Without the pool, G2P runs inline
+    speaker.prefetch_phonemes(["Another paragraph."])
+    assert speaker.phoneme_chunks("Another paragraph.") == ["Another paragraph."]
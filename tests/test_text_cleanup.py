@@ -0,0 +1,88 @@
+import pytest
+
+pytest.importorskip("groq")
+
+from director_backends import create_director_backend
+from main import StoryDirector
+from text_cleanup import PdfTextCleaner
+
+
+class FakeRect:
+    height = 800
+
+
+class FakePage:
+    """The parts of a PyMuPDF page the cleaner reads: one block of (text, font size) lines"""
+
+    rect = FakeRect()
+
+    def __init__(self, lines):
+        self.lines = lines
+
+    def get_text(self, option="text"):
+        if option != "dict":
+            return "\n".join(text for text, _ in self.lines)
+        return {"blocks": [{
+            "type": 0,
+            "lines": [
+                {"bbox": (72, 200 + 20 * i, 500, 216 + 20 * i), "spans": [{"text": text, "size": size}]}
+                for i, (text, size) in enumerate(self.lines)
+            ],
+        }]}
+
+
+BOOK = [
+    FakePage([
+        ("THE DARK HOUSE", 24),
+        ("by Jane Smith", 14),
+        ("CHAPTER 1", 16),
+        ("The house at the end of the lane had been empty for as long", 12),
+        ("as anyone could remember. Its windows were dark and its gar-", 12),
+        ("den overgrown, and the gate hung from a single hinge.", 12),
+    ]),
+    FakePage([
+        ("Chapter 2", 16),
+        ("It was a dark night and the", 12),
+        ("wind howled. Nobody slept.", 12),
+        ("A Quiet Interlude", 16),
+        ("The morning came late.", 12),
+    ]),
+]
+
+
+def test_headings_keep_their_own_lines():
+    cleaner = PdfTextCleaner()
+    lines = [line for line in cleaner.clean(BOOK).split("\n") if line]
+
+    assert lines == [
+        "THE DARK HOUSE",
+        "by Jane Smith",
+        "CHAPTER 1",
+        "The house at the end of the lane had been empty for as long as anyone could remember. "
+        "Its windows were dark and its garden overgrown, and the gate hung from a single hinge.",
+        "Chapter 2",
+        "It was a dark night and the wind howled. Nobody slept.",
+        "A Quiet Interlude",
+        "The morning came late.",
+    ]
+
+
+def test_chapters_and_metadata_survive_cleanup():
+    director = StoryDirector(backend=create_director_backend("rules"))
+    text = PdfTextCleaner().clean(BOOK)
+
+    assert director.extract_book_metadata(text) == {"title": "THE DARK HOUSE", "author": "Jane Smith"}
+    chapters = director.detect_chapters(text)
+    assert [chapter["title"] for chapter in chapters] == ["Prologue", "Chapter 2"]
+    assert chapters[1]["content"].lstrip().startswith("It was a dark night")
+
+
+@pytest.mark.parametrize("before, after, detail", [
+    (10, 7, "(3 fragments fewer to direct and synthesize)"),
+    (7, 9, "(2 more than in the raw page text)"),
+    (5, 5, "(unchanged)"),
+])
+def test_report_words_the_paragraph_change_by_its_sign(capsys, before, after, detail):
+    PdfTextCleaner().print_report(before, after)
+
+    assert capsys.readouterr().out.splitlines()[-1] == f"   Paragraphs: {before} → {after} {detail}"
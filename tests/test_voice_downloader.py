@@ -0,0 +1,113 @@
+import json
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+pytest.importorskip("tqdm")
+from voice_downloader import VoiceDownloader, fetch_catalog, create_session, CATALOG_FILE
+
+VOICE = bytes(range(256)) * 64
+CATALOG = [{"type": "file", "path": "voices/af_test.pt",
+            "lfs": {"size": len(VOICE), "oid": hashlib.sha256(VOICE).hexdigest()}}]
+ETAG = '"catalog-v1"'
+
+
+class VoiceServer(BaseHTTPRequestHandler):
+    """Serves one voice file (with Range support) and an ETag'd catalog"""
+
+    body = VOICE
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.requests_seen.append((self.path, dict(self.headers)))
+        if self.path == "/api":
+            if self.headers.get("If-None-Match") == ETAG:
+                self.send_response(304)
+                self.end_headers()
+                return
+            payload = json.dumps(CATALOG).encode("utf-8")
+            self.send_response(200)
+            self.send_header("ETag", ETAG)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            return
+
+        body = self.body
+        range_header = self.headers.get("Range")
+        if range_header:
+            start = int(range_header.split("=")[1].rstrip("-"))
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(body) - 1}/{len(body)}")
+            body = body[start:]
+        else:
+            self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server():
+    VoiceServer.body = VOICE
+    VoiceServer.requests_seen = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), VoiceServer)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def make_downloader(server, tmp_path):
+    return VoiceDownloader(base_url=f"{server}/voices/", api_url=f"{server}/api",
+                           voices_folder=str(tmp_path), max_workers=1)
+
+
+def test_partial_download_is_resumed_with_range(server, tmp_path):
+    downloader = make_downloader(server, tmp_path)
+    expected = downloader.fetch_remote_manifest()["af_test.pt"]
+    (tmp_path / "af_test.pt.part").write_bytes(VOICE[:1000])
+
+    result = downloader.download_voice("af_test.pt", expected)
+
+    assert result["status"] == "resumed"
+    assert result["bytes"] == len(VOICE) - 1000
+    assert (tmp_path / "af_test.pt").read_bytes() == VOICE
+    voice_requests = [headers for path, headers in VoiceServer.requests_seen if path.startswith("/voices/")]
+    assert voice_requests[-1].get("Range") == "bytes=1000-"
+
+
+def test_corrupted_file_fails_checksum(server, tmp_path):
+    downloader = make_downloader(server, tmp_path)
+    expected = downloader.fetch_remote_manifest()["af_test.pt"]
+
+    corrupted = bytearray(VOICE)
+    corrupted[500] ^= 0xFF
+    (tmp_path / "local.pt").write_bytes(bytes(corrupted))
+    assert not downloader.verify_file(str(tmp_path / "local.pt"), expected)
+
+    # Same size, wrong content from the server: discarded, never installed
+    VoiceServer.body = bytes(corrupted)
+    result = downloader.download_voice("af_test.pt", expected)
+    assert result["status"] == "failed"
+    assert not (tmp_path / "af_test.pt").exists()
+    assert not (tmp_path / "af_test.pt.part").exists()
+
+
+def test_catalog_not_modified_uses_cache(server, tmp_path):
+    session = create_session(pool_size=1)
+    cache_path = str(tmp_path / CATALOG_FILE)
+
+    files, source = fetch_catalog(session, f"{server}/api", cache_path)
+    assert source == "network"
+
+    files_again, source = fetch_catalog(session, f"{server}/api", cache_path)
+    assert source == "not-modified"
+    assert files_again == files == CATALOG
+    assert VoiceServer.requests_seen[-1][1].get("If-None-Match") == ETAG
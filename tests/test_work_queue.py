@@ -0,0 +1,96 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+import pytest
+
+pytest.importorskip("soundfile")
+import work_queue
+from work_queue import FileLeaseQueue
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Claims units until none are left, logging every claim, heartbeating while it "renders"
+WORKER = """
+import os, sys, time
+from work_queue import FileLeaseQueue, worker_id
+job_dir = sys.argv[1]
+work_queue = FileLeaseQueue(job_dir, lease_seconds=2.0)
+worker = worker_id()
+while True:
+    unit_id = work_queue.claim(worker)
+    if unit_id is None:
+        break
+    with open(os.path.join(job_dir, "claims.log"), "a") as f:
+        f.write(unit_id + "\\n")
+    for _ in range(3):
+        time.sleep(0.02)
+        assert work_queue.heartbeat(unit_id, worker), unit_id
+    work_queue.complete(unit_id, worker)
+"""
+
+
+def make_job(job_dir, count):
+    os.makedirs(job_dir, exist_ok=True)
+    units = [{"id": f"unit_{i:03d}", "kind": "chapter"} for i in range(count)]
+    with open(os.path.join(job_dir, "job.json"), "w", encoding="utf-8") as f:
+        json.dump({"units": units}, f)
+    return [unit["id"] for unit in units]
+
+
+def write_lease(job_dir, unit_id, worker, expires):
+    with open(os.path.join(job_dir, "leases", f"{unit_id}.lease"), "w", encoding="utf-8") as f:
+        json.dump({"worker": worker, "expires": expires}, f)
+
+
+def test_each_unit_is_leased_once_by_several_processes(tmp_path):
+    job_dir = str(tmp_path / "job")
+    unit_ids = make_job(job_dir, 40)
+    FileLeaseQueue(job_dir)
+    # Leases left behind by a crashed worker: every process races to reclaim them
+    for unit_id in unit_ids[::4]:
+        write_lease(job_dir, unit_id, "crashed-worker", time.time() - 60)
+
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [REPO_ROOT, os.environ.get("PYTHONPATH")])))
+    processes = [subprocess.Popen([sys.executable, "-c", WORKER, job_dir], env=env, stderr=subprocess.PIPE)
+                 for _ in range(6)]
+    for process in processes:
+        _, stderr = process.communicate(timeout=120)
+        assert process.returncode == 0, stderr.decode()
+
+    with open(os.path.join(job_dir, "claims.log"), encoding="utf-8") as f:
+        claims = f.read().split()
+    assert sorted(claims) == sorted(unit_ids)
+    assert FileLeaseQueue(job_dir).status()["done"] == len(unit_ids)
+    assert os.listdir(os.path.join(job_dir, "leases")) == []
+
+
+def test_heartbeat_during_reclaim_keeps_the_lease(tmp_path, monkeypatch):
+    job_dir = str(tmp_path / "job")
+    unit_id = make_job(job_dir, 1)[0]
+    owner = FileLeaseQueue(job_dir, lease_seconds=60)
+    reclaimer = FileLeaseQueue(job_dir, lease_seconds=60)
+    write_lease(job_dir, unit_id, "owner", time.time() - 1)
+
+    # The owner's heartbeat lands after the reclaimer read the lease, then after it moved it away
+    for stage in ("before rename", "after rename"):
+        write_lease(job_dir, unit_id, "owner", time.time() - 1)
+        rename = os.rename
+
+        def racing_rename(source, target):
+            if stage == "before rename":
+                assert owner.heartbeat(unit_id, "owner")
+            rename(source, target)
+            if stage == "after rename":
+                assert owner.heartbeat(unit_id, "owner")
+
+        monkeypatch.setattr(work_queue.os, "rename", racing_rename)
+        assert reclaimer.claim("reclaimer") is None, stage
+        monkeypatch.setattr(work_queue.os, "rename", rename)
+
+        lease = owner.read_lease(unit_id)
+        assert lease["worker"] == "owner", stage
+        assert lease["expires"] > time.time(), stage
+        assert [name for name in os.listdir(os.path.join(job_dir, "leases")) if ".stale." in name] == []
@@ -0,0 +1,228 @@
+import re
+from collections import Counter
+
+# Page numbers as printed: "12", "- 12 -", "Page 12", "12 of 300", "xiv"
+PAGE_NUMBER = re.compile(r'^[\-–—\s]*(?:(?i:page)\s+)?(?:\d{1,4}|[ivxlcdm]{1,7})(?:\s+(?i:of)\s+\d{1,4})?[\-–—\s]*$')
+
+# A page number printed before or after a running header's text: "41 | Title", "Chapter 3 — 41"
+LEADING_PAGE_NUMBER = re.compile(r'^\d{1,4}(?![\d.])[\s|·•:\-–—]*')
+TRAILING_PAGE_NUMBER = re.compile(r'[\s|·•:\-–—]*(?<![\d.])\d{1,4}$')
+# Words a number belongs to rather than being a page number: "CHAPTER 2" is a heading, not a header
+NUMBERED_HEADING = re.compile(r'\b(?:chapter|part|book|section|volume)$')
+# Chapter headings that StoryDirector.detect_chapters splits on; the first one of each is never a running line
+CHAPTER_HEADING = re.compile(r'^(?:chapter|part|book)\s+(?:\d+|[ivxlcdm]+)\b', re.IGNORECASE)
+
+# A short line in capitals is a title or heading ("THE DARK HOUSE"), never part of a paragraph
+CAPS_HEADING_MAX_CHARS = 60
+
+# A page ending in one of these finished its sentence; otherwise the paragraph continues
+SENTENCE_END = ('.', '!', '?', ':', '"', '”', '’', "'", ')', '…')
+
+
+class PdfTextCleaner:
+    """
+    Text of a PDF without the print layout: running headers and footers
+    (lines repeated in the page margins across pages, with the page number
+    ignored so "Chapter 3 | 41" matches every page of the chapter, while
+    "CHAPTER 2" headings stay distinct), page numbers, hyphenated line
+    breaks and paragraphs broken by line or page ends. Headings keep their
+    own line even when PyMuPDF puts them in the same block as the text.
+    Uses PyMuPDF's block and line coordinates and font sizes, not just the text.
+    """
+
+    def __init__(self, margin=0.1, min_repeats=3, heading_size_delta=1.0):
+        """
+        Args:
+            margin: Top and bottom fraction of the page where headers and footers live
+            min_repeats: Pages a margin line must appear on to count as a running header/footer
+            heading_size_delta: Points a line's font must exceed its block's body font by to count as a heading
+        """
+        self.margin = margin
+        self.min_repeats = min_repeats
+        self.heading_size_delta = heading_size_delta
+        self.raw_text = ""
+        self.headings = set()
+        self.stats = {
+            "pages": 0,
+            "chars_before": 0,
+            "chars_after": 0,
+            "running_lines": 0,
+            "page_numbers": 0,
+            "hyphenations": 0,
+            "merged_lines": 0,
+            "merged_pages": 0,
+        }
+
+    def layout_key(self, text):
+        """A margin line without its page number; other digits (chapter numbers) are kept"""
+        key = re.sub(r'\s+', ' ', text).strip().lower()
+        if PAGE_NUMBER.match(key):
+            return "#"
+        key = LEADING_PAGE_NUMBER.sub('', key)
+        match = TRAILING_PAGE_NUMBER.search(key)
+        if match and not NUMBERED_HEADING.search(key[:match.start()]):
+            key = key[:match.start()]
+        return key
+
+    def read_pages(self, doc):
+        """Per page: blocks of (text, zone, font size) lines, zone being "top", "bottom" or None"""
+        pages = []
+        for page in doc:
+            height = page.rect.height
+            blocks = []
+            for block in page.get_text("dict")["blocks"]:
+                if block.get("type", 0) != 0:
+                    continue
+                lines = []
+                for line in block["lines"]:
+                    text = "".join(span["text"] for span in line["spans"]).strip()
+                    if not text:
+                        continue
+                    size = max((span.get("size", 0) for span in line["spans"] if span["text"].strip()), default=0)
+                    y0, y1 = line["bbox"][1], line["bbox"][3]
+                    zone = "top" if y1 <= height * self.margin else "bottom" if y0 >= height * (1 - self.margin) else None
+                    lines.append((text, zone, size))
+                if lines:
+                    blocks.append(lines)
+            pages.append(blocks)
+            self.raw_text += page.get_text() + "\n\n"
+        return pages
+
+    def find_running_lines(self, pages):
+        """Margin lines that repeat on at least min_repeats pages"""
+        counts = Counter()
+        for blocks in pages:
+            counts.update({(zone, self.layout_key(text)) for lines in blocks for text, zone, _ in lines if zone})
+        return {key for key, count in counts.items() if count >= self.min_repeats}
+
+    def edge_lines(self, blocks):
+        """(block, line) positions of the margin lines with nothing but margin between them and the page edge"""
+        positions = [(b, l, zone) for b, lines in enumerate(blocks) for l, (_, zone, _) in enumerate(lines)]
+        edge = set()
+        for sequence, wanted in ((positions, "top"), (reversed(positions), "bottom")):
+            for b, l, zone in sequence:
+                if zone != wanted:
+                    break
+                edge.add((b, l))
+        return edge
+
+    def is_heading(self, text):
+        """
+        The heading a chapter starts with, as opposed to a running header
+        naming the chapter ("Chapter 3 | 41", or "CHAPTER 3" repeated on its pages)
+        """
+        key = re.sub(r'\s+', ' ', text).strip().lower()
+        if not CHAPTER_HEADING.match(key) or self.layout_key(text) != key or key in self.headings:
+            return False
+        self.headings.add(key)
+        return True
+
+    def looks_like_heading(self, text, size, body_size):
+        """A line that stands on its own: chapter heading, short all-caps title, or larger than the body font"""
+        if CHAPTER_HEADING.match(text):
+            return True
+        if len(text) <= CAPS_HEADING_MAX_CHARS and re.search(r'[A-Z]{2}', text) and text == text.upper():
+            return True
+        return size > body_size + self.heading_size_delta
+
+    def body_size(self, lines):
+        """The block's most common font size, weighted by characters"""
+        sizes = Counter()
+        for text, _, size in lines:
+            sizes[round(size, 1)] += len(text)
+        return sizes.most_common(1)[0][0]
+
+    def keep_line(self, text, zone, running, at_edge):
+        if not zone:
+            return True
+        if (zone, self.layout_key(text)) in running and not self.is_heading(text):
+            self.stats["running_lines"] += 1
+            return False
+        # Only between the page edge and the body text, so numbers within the text survive
+        if at_edge and PAGE_NUMBER.match(text):
+            self.stats["page_numbers"] += 1
+            return False
+        return True
+
+    def join(self, left, right, vocabulary):
+        """Join two pieces of one paragraph, undoing hyphenation at the break"""
+        match = re.search(r'(\w+)[-\u00ad]$', left)
+        following = re.match(r'\w+', right)
+        if match and following and right[:1].islower():
+            fragment, rest = match.group(1), following.group(0)
+            # Keep real compounds ("well-known") that the book also hyphenates mid-line
+            if f"{fragment}-{rest}".lower() in vocabulary and (fragment + rest).lower() not in vocabulary:
+                return left + right
+            self.stats["hyphenations"] += 1
+            return left[:-1] + right
+        return f"{left} {right}"
+
+    def clean(self, doc):
+        """
+        Cleaned text: blank lines between blocks and pages unless a paragraph
+        runs on. Within a block a line is merged into the previous one unless
+        either is a heading or the previous one ends a sentence.
+        """
+        pages = self.read_pages(doc)
+        running = self.find_running_lines(pages)
+        vocabulary = {word.lower() for blocks in pages for lines in blocks for text, _, _ in lines
+                      for word in re.findall(r'\w+(?:-\w+)*', text)}
+
+        page_texts = []
+        for blocks in pages:
+            edge = self.edge_lines(blocks)
+            block_texts = []
+            for b, lines in enumerate(blocks):
+                body_size = self.body_size(lines)
+                kept = []
+                previous_heading = False
+                for l, (line, zone, size) in enumerate(lines):
+                    if not self.keep_line(line, zone, running, (b, l) in edge):
+                        continue
+                    heading = self.looks_like_heading(line, size, body_size)
+                    if kept and not heading and not previous_heading and not kept[-1].endswith(SENTENCE_END):
+                        self.stats["merged_lines"] += 1
+                        kept[-1] = self.join(kept[-1], line, vocabulary)
+                    else:
+                        kept.append(line)
+                    previous_heading = heading
+                if kept:
+                    block_texts.append("\n".join(kept))
+            # Blocks are paragraphs (or headings); the chunker keeps units within them
+            page_texts.append("\n\n".join(block_texts))
+
+        cleaned = ""
+        for text in page_texts:
+            if not text:
+                continue
+            if cleaned and not cleaned.endswith(SENTENCE_END) and text[:1].islower():
+                # The paragraph continues on this page
+                self.stats["merged_pages"] += 1
+                cleaned = self.join(cleaned, text, vocabulary)
+            else:
+                cleaned += ("\n\n" if cleaned else "") + text
+        cleaned += "\n\n"
+
+        self.stats["pages"] = len(pages)
+        self.stats["chars_before"] = len(self.raw_text)
+        self.stats["chars_after"] = len(cleaned)
+        return cleaned
+
+    def print_report(self, paragraphs_before=None, paragraphs_after=None):
+        stats = self.stats
+        removed = stats["chars_before"] - stats["chars_after"]
+        print(f"🧹 Cleanup: {removed:,} characters removed "
+              f"({removed / max(1, stats['chars_before']):.1%}) from {stats['pages']} pages | "
+              f"{stats['running_lines']} header/footer lines, {stats['page_numbers']} page numbers, "
+              f"{stats['hyphenations']} hyphenations joined, {stats['merged_pages']} paragraphs rejoined across pages")
+        if paragraphs_before is not None:
+            # Rejoined paragraphs lower the count; blocks the raw text ran together raise it
+            change = paragraphs_after - paragraphs_before
+            if change < 0:
+                detail = f"{-change} fragments fewer to direct and synthesize"
+            elif change > 0:
+                detail = f"{change} more than in the raw page text"
+            else:
+                detail = "unchanged"
+            print(f"   Paragraphs: {paragraphs_before} → {paragraphs_after} ({detail})")
+        return stats
@@ -0,0 +1,205 @@
+import io
+import shutil
+import threading
+import zlib
+import subprocess
+import numpy as np
+import soundfile as sf
+from scipy.signal import resample_poly
+
+REPO_ID = "hexgrad/Kokoro-82M"
+SAMPLE_RATE = 24000
+
+try:
+    from importlib.metadata import version as _package_version
+    MODEL_VERSION = f"{REPO_ID}@kokoro-{_package_version('kokoro')}"
+except Exception:
+    MODEL_VERSION = REPO_ID
+
+try:
+    G2P_VERSION = f"misaki-{_package_version('misaki')}"
+except Exception:
+    G2P_VERSION = MODEL_VERSION
+
+# Acoustic model runtimes for Kokoro: PyTorch KPipeline, or ONNX Runtime on CPU (fp32 / dynamic int8)
+KOKORO_RUNTIMES = ("torch", "onnx", "onnx-int8")
+
+# Speaking rate the non-neural backends are paced to, close to Kokoro's at speed 1.0
+CHARS_PER_SECOND = 14.0
+
+
+class TTSBackend:
+    """
+    What AudiobookSpeaker needs from a synthesizer: text -> "phonemes"
+    (whatever unit the backend synthesizes from, cached per sentence) and
+    phonemes + voice + speed -> 24 kHz float32 audio chunks.
+    """
+
+    name = "base"
+    # Whether voices are Kokoro voice packs (tensor or .pt path) or just the voice file name
+    needs_voice_pack = False
+    # Whether phonemize() does real G2P worth caching
+    has_g2p = False
+
+    @property
+    def version(self):
+        """Goes into audio memo keys, so renders of different backends never mix"""
+        return f"{MODEL_VERSION}/{self.name}"
+
+    @property
+    def g2p_version(self):
+        return self.version
+
+    def phonemize(self, text):
+        return text
+
+    def synthesize(self, phonemes, voice, speed):
+        raise NotImplementedError
+
+    def load_voice(self, voice):
+        return voice
+
+
+class KokoroBackend(TTSBackend):
+    """Kokoro-82M: misaki G2P plus the acoustic model on PyTorch or ONNX Runtime"""
+
+    needs_voice_pack = True
+    has_g2p = True
+
+    def __init__(self, lang_code='a', runtime="torch", threads=None):
+        """
+        Args:
+            runtime: "torch", "onnx" or "onnx-int8"
+            threads: ONNX Runtime intra-op threads
+        """
+        if runtime not in KOKORO_RUNTIMES:
+            raise ValueError(f"Unknown Kokoro runtime: {runtime}")
+        # Imported here so the draft and test backends work without Kokoro installed
+        from kokoro import KPipeline
+
+        self.name = runtime
+        self.lang_code = lang_code
+        self.onnx = None
+        # misaki G2P keeps per-call state, so each G2P thread gets its own instance
+        self.g2p_local = threading.local()
+        if runtime == "torch":
+            self.pipeline = KPipeline(lang_code=lang_code, repo_id=REPO_ID)
+        else:
+            # The pipeline only does G2P and voice loading; ONNX Runtime runs the model
+            from onnx_backend import OnnxKokoro, ONNX_MODEL, ONNX_INT8_MODEL
+            self.pipeline = KPipeline(lang_code=lang_code, repo_id=REPO_ID, model=False)
+            self.onnx = OnnxKokoro(ONNX_INT8_MODEL if runtime == "onnx-int8" else ONNX_MODEL, threads=threads)
+
+    @property
+    def version(self):
+        # Torch keys are unchanged from before backends existed
+        return MODEL_VERSION if self.name == "torch" else f"{MODEL_VERSION}/{self.name}"
+
+    @property
+    def g2p_version(self):
+        return G2P_VERSION
+
+    def g2p(self):
+        """This thread's G2P-only pipeline, created on the thread's first call"""
+        pipeline = getattr(self.g2p_local, "pipeline", None)
+        if pipeline is None:
+            from kokoro import KPipeline
+            pipeline = KPipeline(lang_code=self.lang_code, repo_id=REPO_ID, model=False)
+            self.g2p_local.pipeline = pipeline
+        return pipeline
+
+    def phonemize(self, text):
+        phonemes, _ = self.g2p().g2p(text)
+        return phonemes or ""
+
+    def synthesize(self, phonemes, voice, speed):
+        if self.onnx is None:
+            return [audio for _, _, audio in self.pipeline.generate_from_tokens(phonemes, voice=voice, speed=speed)
+                    if audio is not None]
+        audio = self.onnx.infer(phonemes, self.pipeline.load_voice(voice), speed)
+        return [] if audio is None else [audio]
+
+
+class EspeakDraftBackend(TTSBackend):
+    """
+    Draft renders with the espeak-ng formant synthesizer: robotic, but
+    hundreds of times faster than Kokoro, for checking chapter splits,
+    director output and pacing before a full render.
+    """
+
+    name = "espeak"
+
+    def __init__(self, executable=None, words_per_minute=175):
+        self.executable = executable or shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.executable is None:
+            raise FileNotFoundError("espeak-ng not found; install it for draft renders")
+        self.words_per_minute = words_per_minute
+
+    @property
+    def version(self):
+        return f"espeak-ng/{self.words_per_minute}wpm"
+
+    def espeak_voice(self, voice_file):
+        """Map a Kokoro voice file (af_bella.pt, bm_daniel.pt, cm_timmy.pt) onto an espeak voice and pitch"""
+        name = str(voice_file or "af")
+        language = "en-gb" if name.startswith("b") else "en-us"
+        variant = "m3" if name[1:2] == "m" else "f3"
+        pitch = 75 if name.startswith("c") else 50
+        return f"{language}+{variant}", pitch
+
+    def synthesize(self, phonemes, voice, speed):
+        espeak_voice, pitch = self.espeak_voice(voice)
+        result = subprocess.run(
+            [self.executable, "--stdout", "--stdin", "-v", espeak_voice, "-p", str(pitch),
+             "-s", str(int(self.words_per_minute * speed))],
+            input=phonemes.encode("utf-8"), capture_output=True, check=True
+        )
+        audio, rate = sf.read(io.BytesIO(result.stdout), dtype="float32")
+        if rate != SAMPLE_RATE:
+            # espeak-ng speaks at 22.05 kHz
+            divisor = np.gcd(rate, SAMPLE_RATE)
+            audio = resample_poly(audio, SAMPLE_RATE // divisor, rate // divisor).astype(np.float32)
+        return [audio]
+
+
+class ToneBackend(TTSBackend):
+    """
+    Deterministic stand-in for tests and CI without model weights: a tone
+    per voice (or silence) lasting as long as the text would take to speak.
+    """
+
+    def __init__(self, silent=False):
+        self.silent = silent
+        self.name = "null" if silent else "tone"
+
+    def synthesize(self, phonemes, voice, speed):
+        seconds = max(0.1, len(phonemes) / (CHARS_PER_SECOND * speed))
+        samples = int(seconds * SAMPLE_RATE)
+        if self.silent:
+            return [np.zeros(samples, dtype=np.float32)]
+
+        frequency = 220 + (zlib.crc32(str(voice).encode("utf-8")) % 8) * 40
+        t = np.arange(samples) / SAMPLE_RATE
+        audio = 0.1 * np.sin(2 * np.pi * frequency * t)
+        fade = min(samples // 2, int(0.02 * SAMPLE_RATE))
+        if fade:
+            ramp = np.linspace(0, 1, fade)
+            audio[:fade] *= ramp
+            audio[-fade:] *= ramp[::-1]
+        return [audio.astype(np.float32)]
+
+
+TTS_BACKENDS = {
+    "torch": lambda lang_code, threads: KokoroBackend(lang_code, "torch", threads),
+    "onnx": lambda lang_code, threads: KokoroBackend(lang_code, "onnx", threads),
+    "onnx-int8": lambda lang_code, threads: KokoroBackend(lang_code, "onnx-int8", threads),
+    "espeak": lambda lang_code, threads: EspeakDraftBackend(),
+    "tone": lambda lang_code, threads: ToneBackend(),
+    "null": lambda lang_code, threads: ToneBackend(silent=True),
+}
+
+
+def create_backend(name, lang_code='a', threads=None):
+    if name not in TTS_BACKENDS:
+        raise ValueError(f"Unknown TTS backend: {name} (choose from {', '.join(TTS_BACKENDS)})")
+    return TTS_BACKENDS[name](lang_code, threads)
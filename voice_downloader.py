@@ -1,55 +1,392 @@
 import os
+import sys
+import hashlib
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from tqdm import tqdm
 import json
 import time
 
+def create_session(pool_size=10):
+    """Keep-alive session with a connection pool sized for our worker threads"""
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                  allowed_methods=["HEAD", "GET"])
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+CATALOG_FILE = "voice_catalog.json"
+
+def fetch_catalog(session, api_url, cache_path, timeout=30):
+    """
+    Fetch the voice tree listing with a conditional request against the cached
+    copy. Returns (files, source) where source is "network", "not-modified" or
+    "offline". Raises only when there is neither a response nor a cache.
+    """
+    cached = None
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = None
+    if cached and cached.get('api_url') != api_url:
+        cached = None
+
+    headers = {}
+    if cached:
+        if cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        if cached.get('last_modified'):
+            headers['If-Modified-Since'] = cached['last_modified']
+
+    try:
+        response = session.get(api_url, headers=headers, timeout=timeout)
+    except requests.exceptions.RequestException:
+        if cached:
+            return cached['files'], 'offline'
+        raise
+
+    if response.status_code == 304 and cached:
+        return cached['files'], 'not-modified'
+
+    if response.status_code == 200:
+        files = response.json()
+        catalog = {
+            'api_url': api_url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'fetched_at': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'files': files,
+        }
+        tmp_path = cache_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(catalog, f, indent=2)
+        os.replace(tmp_path, cache_path)
+        return files, 'network'
+
+    if cached:
+        return cached['files'], 'offline'
+    response.raise_for_status()
+    raise requests.exceptions.HTTPError(f"Unexpected status {response.status_code} from {api_url}")
+
+class VoiceDownloader:
+    """
+    Download engine for voice files: one pooled keep-alive session, parallel
+    workers, HTTP Range resume of .part files and size/SHA256 verification
+    against the Hugging Face tree API. base_url and api_url can point at any
+    server with the same layout (e.g. a local http.server for testing).
+    """
+
+    LOCKFILE = "voices.lock.json"
+
+    def __init__(self, base_url=None, api_url=None, voices_folder="model_assets/voices",
+                 max_workers=4, chunk_size=1024 * 1024):
+        self.base_url = base_url or "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/voices/"
+        self.api_url = api_url or "https://huggingface.co/api/models/hexgrad/Kokoro-82M/tree/main/voices"
+        self.voices_folder = voices_folder
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.session = create_session(pool_size=max_workers)
+        os.makedirs(self.voices_folder, exist_ok=True)
+
+    def fetch_remote_manifest(self):
+        """
+        Return {name: {"size": int, "sha256": str|None}} for every .pt file
+        listed by the tree API. LFS entries carry the SHA256 of the content.
+        """
+        files, _ = fetch_catalog(self.session, self.api_url, os.path.join(self.voices_folder, CATALOG_FILE))
+
+        manifest = {}
+        for file_info in files:
+            if file_info.get('type') != 'file' or not file_info['path'].endswith('.pt'):
+                continue
+            lfs = file_info.get('lfs') or {}
+            manifest[os.path.basename(file_info['path'])] = {
+                'size': lfs.get('size', file_info.get('size')),
+                'sha256': lfs.get('oid') or lfs.get('sha256'),
+            }
+        return manifest
+
+    def verify_file(self, path, expected):
+        """Check a local file against the expected size and SHA256"""
+        if not os.path.exists(path):
+            return False
+        if expected.get('size') is not None and os.path.getsize(path) != expected['size']:
+            return False
+        if expected.get('sha256'):
+            return file_sha256(path) == expected['sha256']
+        # Without any remote metadata the old >1 KB heuristic is all we have
+        return os.path.getsize(path) > 1024
+
+    def download_voice(self, voice_name, expected=None):
+        """
+        Download one voice, resuming a previous partial download if present.
+        Returns a result dict with a status of downloaded, resumed, skipped or failed.
+        """
+        expected = expected or {}
+        dest = os.path.join(self.voices_folder, voice_name)
+        part = dest + ".part"
+        result = {'name': voice_name, 'status': 'failed', 'bytes': 0, 'message': ''}
+
+        if self.verify_file(dest, expected):
+            result.update(status='skipped', message='Already verified')
+            return result
+
+        # A short existing file is most likely an interrupted download: resume it
+        if os.path.exists(dest):
+            if expected.get('size') and os.path.getsize(dest) < expected['size'] and not os.path.exists(part):
+                os.replace(dest, part)
+            else:
+                os.remove(dest)
+
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+
+        try:
+            with self.session.get(self.base_url + voice_name, headers=headers, stream=True, timeout=30) as response:
+                if response.status_code == 416:
+                    # Nothing left to fetch; the .part file may already be complete
+                    pass
+                elif response.status_code == 206 and offset:
+                    result['status'] = 'resumed'
+                    with open(part, 'ab') as f:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            f.write(chunk)
+                            result['bytes'] += len(chunk)
+                elif response.status_code == 200:
+                    # Server ignored the Range header; start over
+                    with open(part, 'wb') as f:
+                        for chunk in response.iter_content(chunk_size=self.chunk_size):
+                            f.write(chunk)
+                            result['bytes'] += len(chunk)
+                else:
+                    result['message'] = f"HTTP {response.status_code}"
+                    return result
+        except requests.exceptions.RequestException as e:
+            result.update(status='failed', message=f"Error: {e} (partial file kept for resume)")
+            return result
+
+        if not self.verify_file(part, expected):
+            os.remove(part)
+            if offset:
+                # The bytes we resumed from were bad; fetch the whole file once more
+                return self.download_voice(voice_name, expected)
+            result.update(status='failed', message='Checksum or size mismatch, partial file discarded')
+            return result
+
+        os.replace(part, dest)
+        if result['status'] != 'resumed':
+            result['status'] = 'downloaded'
+        result['message'] = f"{os.path.getsize(dest) / 1024 / 1024:.1f} MB"
+        return result
+
+    def download_all(self, voice_names=None):
+        """
+        Download voices in parallel. With no names, every voice in the remote
+        manifest is fetched. Writes the lockfile and returns the results.
+        """
+        try:
+            manifest = self.fetch_remote_manifest()
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"⚠️ Could not fetch remote manifest ({e}); files will not be checksum-verified")
+            manifest = {}
+
+        if voice_names is None:
+            voice_names = sorted(manifest)
+
+        results = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_voice = {
+                executor.submit(self.download_voice, name, manifest.get(name)): name
+                for name in voice_names
+            }
+            for future in tqdm(as_completed(future_to_voice),
+                               total=len(voice_names),
+                               desc="Downloading voices"):
+                results.append(future.result())
+
+        self.write_lockfile(results, manifest)
+
+        counts = {}
+        for result in results:
+            counts[result['status']] = counts.get(result['status'], 0) + 1
+            if result['status'] == 'failed':
+                print(f"   ❌ {result['name']}: {result['message']}")
+        print(f"📊 Summary: " + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+        return results
+
+    def write_lockfile(self, results, manifest):
+        """Record the verified size and SHA256 of every local voice file"""
+        lock_path = os.path.join(self.voices_folder, self.LOCKFILE)
+        lock = {}
+        if os.path.exists(lock_path):
+            with open(lock_path, 'r', encoding='utf-8') as f:
+                lock = json.load(f).get('voices', {})
+
+        for result in results:
+            if result['status'] == 'failed':
+                continue
+            path = os.path.join(self.voices_folder, result['name'])
+            lock[result['name']] = {
+                'size': os.path.getsize(path),
+                'sha256': manifest.get(result['name'], {}).get('sha256') or file_sha256(path),
+                'url': self.base_url + result['name'],
+            }
+
+        with open(lock_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                'last_updated': time.strftime("%Y-%m-%d %H:%M:%S"),
+                'voices': dict(sorted(lock.items())),
+            }, f, indent=2)
+
+        return lock_path
+
+VOICE_BANK_FILE = "voice_bank.npy"
+VOICE_BANK_INDEX = "voice_bank.json"
+
+def pack_voice_bank(voices_folder="model_assets/voices", output_folder=None):
+    """
+    Pack every downloaded .pt voice into one float32 .npy array plus a JSON
+    name -> (offset, shape) index, so processes can memory-map a single
+    page-cached file instead of unpickling each voice.
+    """
+    import numpy as np
+    import torch
+
+    output_folder = output_folder or voices_folder
+    voice_files = sorted(f for f in os.listdir(voices_folder) if f.endswith('.pt'))
+    if not voice_files:
+        print("❌ No .pt voice files to pack.")
+        return None
+
+    print(f"📦 Packing {len(voice_files)} voices into a voice bank...")
+    arrays = {}
+    for name in tqdm(voice_files, desc="Loading voices"):
+        tensor = torch.load(os.path.join(voices_folder, name), map_location="cpu", weights_only=True)
+        arrays[name] = tensor.detach().to(torch.float32).numpy()
+
+    total = sum(array.size for array in arrays.values())
+    bank_path = os.path.join(output_folder, VOICE_BANK_FILE)
+    index_path = os.path.join(output_folder, VOICE_BANK_INDEX)
+
+    # Write next to the final files, then swap in, so running readers never see a partial bank
+    tmp_bank = bank_path + ".tmp.npy"
+    bank = np.lib.format.open_memmap(tmp_bank, mode="w+", dtype=np.float32, shape=(total,))
+    index = {}
+    offset = 0
+    for name, array in arrays.items():
+        bank[offset:offset + array.size] = array.ravel()
+        index[name] = {'offset': offset, 'shape': list(array.shape)}
+        offset += array.size
+    bank.flush()
+    del bank
+
+    tmp_index = index_path + ".tmp"
+    with open(tmp_index, 'w', encoding='utf-8') as f:
+        json.dump({
+            'dtype': 'float32',
+            'total_values': total,
+            'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+            'voices': index,
+        }, f, indent=2)
+
+    os.replace(tmp_bank, bank_path)
+    os.replace(tmp_index, index_path)
+
+    print(f"💾 Voice bank: {bank_path} ({total * 4 / 1024 / 1024:.1f} MB, {len(index)} voices)")
+    return bank_path
+
 class VoiceRepositoryChecker:
-    def __init__(self):
+    def __init__(self, max_workers=8):
         self.base_url = "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/voices/"
         self.api_url = "https://huggingface.co/api/models/hexgrad/Kokoro-82M/tree/main/voices"
         self.voices_folder = "model_assets/voices"
         os.makedirs(self.voices_folder, exist_ok=True)
         
+        # One keep-alive session and a bounded number of in-flight probes
+        self.max_workers = max_workers
+        self.session = create_session(pool_size=max_workers)
+        self.catalog_path = os.path.join(self.voices_folder, CATALOG_FILE)
+        self.catalog = None  # {name: size_bytes} once known
+        
     def fetch_available_voices_via_api(self):
-        """Fetch available voices using Hugging Face API"""
+        """Fetch available voices using Hugging Face API (conditional request, cached catalog)"""
         print("🔍 Fetching voice list from Hugging Face API...")
         
         try:
-            response = requests.get(self.api_url, timeout=30)
-            
-            if response.status_code == 200:
-                files_data = response.json()
-                voice_files = []
-                
-                for file_info in files_data:
-                    if file_info['type'] == 'file' and file_info['path'].endswith('.pt'):
-                        filename = os.path.basename(file_info['path'])
-                        size = file_info.get('size', 0)
-                        voice_files.append({
-                            'name': filename,
-                            'size_bytes': size,
-                            'size_mb': size / (1024 * 1024)
-                        })
-                
-                print(f"✅ Found {len(voice_files)} voice files via API")
-                return voice_files
-            else:
-                print(f"❌ API request failed: {response.status_code}")
-                return []
-                
+            files_data, source = fetch_catalog(self.session, self.api_url, self.catalog_path)
         except Exception as e:
             print(f"❌ Error accessing API: {e}")
             return []
+        
+        voice_files = []
+        for file_info in files_data:
+            if file_info['type'] == 'file' and file_info['path'].endswith('.pt'):
+                filename = os.path.basename(file_info['path'])
+                size = file_info.get('size', 0)
+                voice_files.append({
+                    'name': filename,
+                    'size_bytes': size,
+                    'size_mb': size / (1024 * 1024)
+                })
+        
+        self.catalog = {voice['name']: voice['size_bytes'] for voice in voice_files}
+        
+        source_label = {
+            'network': "via API",
+            'not-modified': "from cache (unchanged on server)",
+            'offline': "from cache (offline)",
+        }[source]
+        print(f"✅ Found {len(voice_files)} voice files {source_label}")
+        return voice_files
+    
+    def load_cached_catalog(self):
+        """Use the cached catalog, if any, without touching the network"""
+        if self.catalog is not None or not os.path.exists(self.catalog_path):
+            return self.catalog
+        
+        try:
+            with open(self.catalog_path, 'r', encoding='utf-8') as f:
+                files_data = json.load(f)['files']
+        except (OSError, ValueError, KeyError):
+            return None
+        
+        self.catalog = {
+            os.path.basename(file_info['path']): file_info.get('size', 0)
+            for file_info in files_data
+            if file_info.get('type') == 'file' and file_info['path'].endswith('.pt')
+        }
+        return self.catalog
     
     def check_single_voice_exists(self, voice_name):
         """Check if a specific voice file exists in the repository"""
+        if self.load_cached_catalog() is not None:
+            size = self.catalog.get(voice_name)
+            return {
+                'name': voice_name,
+                'exists': size is not None,
+                'size_mb': (size or 0) / (1024 * 1024)
+            }
+        
         url = f"{self.base_url}{voice_name}"
         
         try:
-            response = requests.head(url, timeout=10)
+            # Voice files are LFS objects served through a redirect
+            response = self.session.head(url, timeout=10, allow_redirects=True)
             if response.status_code == 200:
                 # Try to get file size
                 size = response.headers.get('content-length')
@@ -68,6 +405,36 @@ class VoiceRepositoryChecker:
             'size_mb': 0
         }
     
+    def probe_voices(self, voice_names, desc="Checking voices"):
+        """
+        Check which of voice_names exist. Answered from the catalog when one is
+        cached; otherwise HEAD requests go through the shared session with at
+        most max_workers in flight.
+        """
+        voice_names = list(dict.fromkeys(voice_names))
+        
+        if self.load_cached_catalog() is not None:
+            return [
+                result for result in map(self.check_single_voice_exists, voice_names)
+                if result['exists']
+            ]
+        
+        available = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            future_to_voice = {
+                executor.submit(self.check_single_voice_exists, voice): voice 
+                for voice in voice_names
+            }
+            
+            for future in tqdm(as_completed(future_to_voice), 
+                              total=len(voice_names),
+                              desc=desc):
+                result = future.result()
+                if result['exists']:
+                    available.append(result)
+        
+        return available
+    
     def check_common_voices(self):
         """Check a list of commonly expected voice files"""
         print("\n🔍 Checking commonly used voice files...")
@@ -94,24 +461,7 @@ class VoiceRepositoryChecker:
             'af_fr_sophie.pt', 'bm_fr_pierre.pt', # French
         ]
         
-        available_voices = []
-        
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            # Submit all checking tasks
-            future_to_voice = {
-                executor.submit(self.check_single_voice_exists, voice): voice 
-                for voice in common_voices
-            }
-            
-            # Process results as they complete
-            for future in tqdm(as_completed(future_to_voice), 
-                              total=len(common_voices),
-                              desc="Checking voices"):
-                result = future.result()
-                if result['exists']:
-                    available_voices.append(result)
-        
-        return available_voices
+        return self.probe_voices(common_voices, desc="Checking voices")
     
     def scan_for_all_voices(self):
         """Try to discover all voice files by pattern matching"""
@@ -126,7 +476,7 @@ class VoiceRepositoryChecker:
         
         # Try to fetch directory listing (if accessible)
         try:
-            response = requests.get(self.base_url.replace('/resolve/', '/tree/'), timeout=10)
+            response = self.session.get(self.base_url.replace('/resolve/', '/tree/'), timeout=10)
             if response.status_code == 200:
                 # Try to parse HTML for links
                 from bs4 import BeautifulSoup
@@ -153,6 +503,11 @@ class VoiceRepositoryChecker:
         """Try to discover voices by common naming patterns"""
         print("🔍 Trying pattern-based discovery...")
         
+        # A cached catalog already lists every voice; no probing needed
+        if self.load_cached_catalog() is not None:
+            print(f"✅ Using cached voice catalog ({len(self.catalog)} voices)")
+            return [self.check_single_voice_exists(name) for name in sorted(self.catalog)]
+        
         # Common prefixes and names
         prefixes = ['af', 'bm', 'cm', 'cf', 'am', 'bf', 'gm', 'gf']
         names = [
@@ -174,41 +529,13 @@ class VoiceRepositoryChecker:
         
         print(f"Testing {len(possible_voices)} possible voice names...")
         
-        available = []
-        with ThreadPoolExecutor(max_workers=15) as executor:
-            future_to_voice = {
-                executor.submit(self.check_single_voice_exists, voice): voice 
-                for voice in possible_voices
-            }
-            
-            for future in tqdm(as_completed(future_to_voice), 
-                              total=len(possible_voices),
-                              desc="Pattern discovery"):
-                result = future.result()
-                if result['exists']:
-                    available.append(result)
-        
-        return available
+        return self.probe_voices(possible_voices, desc="Pattern discovery")
     
     def verify_voice_files(self, voice_list):
         """Verify which voice files actually exist"""
         print(f"🔍 Verifying {len(voice_list)} potential voice files...")
         
-        available = []
-        with ThreadPoolExecutor(max_workers=10) as executor:
-            future_to_voice = {
-                executor.submit(self.check_single_voice_exists, voice): voice 
-                for voice in voice_list
-            }
-            
-            for future in tqdm(as_completed(future_to_voice), 
-                              total=len(voice_list),
-                              desc="Verifying voices"):
-                result = future.result()
-                if result['exists']:
-                    available.append(result)
-        
-        return available
+        return self.probe_voices(voice_list, desc="Verifying voices")
     
     def categorize_voices(self, voices):
         """Categorize voices by type"""
@@ -258,15 +585,18 @@ class VoiceRepositoryChecker:
     
     def generate_download_script(self, voices, output_file="download_all_voices.py"):
         """Generate a Python script to download all available voices"""
-        script_content = '''import os
-import requests
-from tqdm import tqdm
+        repo_root = os.path.dirname(os.path.abspath(__file__))
+        script_content = f'''import os
+import sys
 import json
 
+# Use the download engine from voice_downloader.py
+sys.path.insert(0, {repo_root!r})
+from voice_downloader import VoiceDownloader
+
 # Configuration
-BASE_URL = "https://huggingface.co/hexgrad/Kokoro-82M/resolve/main/voices/"
-VOICES_FOLDER = "model_assets/voices"
-os.makedirs(VOICES_FOLDER, exist_ok=True)
+BASE_URL = {self.base_url!r}
+VOICES_FOLDER = {self.voices_folder!r}
 
 # Voice list to download
 VOICES_TO_DOWNLOAD = [
@@ -279,65 +609,14 @@ VOICES_TO_DOWNLOAD = [
         
         script_content += ''']
 
-def download_voice(voice_name):
-    """Download a single voice file"""
-    url = BASE_URL + voice_name
-    dest = os.path.join(VOICES_FOLDER, voice_name)
-    
-    # Skip if already exists and is valid
-    if os.path.exists(dest) and os.path.getsize(dest) > 1024:
-        return True, f"Skipped (already exists)"
-    
-    try:
-        response = requests.get(url, stream=True, timeout=30)
-        if response.status_code == 200:
-            total_size = int(response.headers.get('content-length', 0))
-            
-            with open(dest, 'wb') as f, tqdm(
-                desc=voice_name,
-                total=total_size,
-                unit='B',
-                unit_scale=True,
-                leave=False
-            ) as bar:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        bar.update(len(chunk))
-            
-            return True, f"Downloaded ({os.path.getsize(dest)/1024/1024:.1f} MB)"
-        else:
-            return False, f"HTTP {response.status_code}"
-            
-    except Exception as e:
-        return False, f"Error: {str(e)}"
-
 def main():
     print("🚀 Starting download of all available voices...")
     print("=" * 60)
     
-    successful = 0
-    failed = 0
-    skipped = 0
-    
-    for i, voice in enumerate(VOICES_TO_DOWNLOAD, 1):
-        print(f"{i}/{len(VOICES_TO_DOWNLOAD)}: {voice}")
-        
-        success, message = download_voice(voice)
-        
-        if success:
-            if "Skipped" in message:
-                skipped += 1
-                print(f"   ⏭️  {message}")
-            else:
-                successful += 1
-                print(f"   ✅ {message}")
-        else:
-            failed += 1
-            print(f"   ❌ {message}")
+    downloader = VoiceDownloader(base_url=BASE_URL, voices_folder=VOICES_FOLDER)
+    results = downloader.download_all(VOICES_TO_DOWNLOAD)
     
     print("=" * 60)
-    print(f"📊 Summary: {successful} downloaded, {skipped} skipped, {failed} failed")
     
     # Save a simple mapping file
     voice_map = {
@@ -348,7 +627,10 @@ def main():
     }
     
     # Add all downloaded voices to mapping
-    for voice in VOICES_TO_DOWNLOAD:
+    for result in results:
+        if result['status'] == 'failed':
+            continue
+        voice = result['name']
         key = voice.replace('.pt', '').replace('_', ' ')
         voice_map[key] = voice
     
@@ -356,6 +638,7 @@ def main():
         json.dump(voice_map, f, indent=2)
     
     print(f"🗺️ Voice mapping saved to {os.path.join(VOICES_FOLDER, 'voice_mapping.json')}")
+    print(f"🔒 Lockfile saved to {os.path.join(VOICES_FOLDER, VoiceDownloader.LOCKFILE)}")
 
 if __name__ == "__main__":
     main()
@@ -486,7 +769,8 @@ def main():
     print("🚀 NEXT STEPS:")
     print(f"1. View complete list: {json_file}")
     print(f"2. Download all voices: python {script_file}")
-    print(f"3. Required packages: pip install requests tqdm beautifulsoup4")
+    print(f"3. Pack voices for fast loading: python voice_downloader.py --pack-bank")
+    print(f"4. Required packages: pip install requests tqdm beautifulsoup4")
     print("=" * 60)
 
 if __name__ == "__main__":
@@ -505,4 +789,7 @@ if __name__ == "__main__":
     except ImportError:
         print("Note: For advanced scanning, install: pip install beautifulsoup4")
     
-    main()
\ No newline at end of file
+    if "--pack-bank" in sys.argv:
+        pack_voice_bank()
+    else:
+        main()
\ No newline at end of file
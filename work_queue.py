@@ -0,0 +1,566 @@
+import os
+import sys
+import json
+import time
+import socket
+import sqlite3
+import argparse
+import threading
+import subprocess
+import numpy as np
+from speaker import SAMPLE_RATE, load_tuning
+from audio_export import BookEncoder
+from loudness import LoudnessMeter, LoudnessNormalizer
+from render_manifest import RenderManifest
+
+# A lease not renewed for this long is considered abandoned (worker crashed or node lost)
+LEASE_SECONDS = 600
+HEARTBEAT_SECONDS = 60
+
+
+def worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def load_job(job_dir):
+    with open(os.path.join(job_dir, "job.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_atomic(path, data, mode="w"):
+    """Write to a unique temp file and rename, so readers never see half a file"""
+    tmp_path = f"{path}.{worker_id()}.tmp"
+    with open(tmp_path, mode, **({} if "b" in mode else {"encoding": "utf-8"})) as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class FileLeaseQueue:
+    """
+    Work queue made of lease files in a shared folder (NFS, SMB, a synced volume).
+    A unit is claimed by creating leases/<unit>.lease with O_CREAT|O_EXCL, which
+    only one worker can win; finished units get a done/<unit>.done marker.
+    """
+
+    def __init__(self, job_dir, lease_seconds=LEASE_SECONDS):
+        """
+        Args:
+            job_dir: Shared job folder containing job.json
+            lease_seconds: How long a lease stays valid without a heartbeat
+        """
+        self.job_dir = job_dir
+        self.lease_seconds = lease_seconds
+        self.lease_dir = os.path.join(job_dir, "leases")
+        self.done_dir = os.path.join(job_dir, "done")
+        os.makedirs(self.lease_dir, exist_ok=True)
+        os.makedirs(self.done_dir, exist_ok=True)
+        self.unit_ids = [unit["id"] for unit in load_job(job_dir)["units"]]
+
+    def lease_path(self, unit_id):
+        return os.path.join(self.lease_dir, f"{unit_id}.lease")
+
+    def is_done(self, unit_id):
+        return os.path.exists(os.path.join(self.done_dir, f"{unit_id}.done"))
+
+    def read_lease(self, unit_id):
+        try:
+            with open(self.lease_path(unit_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def try_create_lease(self, unit_id, worker):
+        try:
+            fd = os.open(self.lease_path(unit_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump({"worker": worker, "expires": time.time() + self.lease_seconds}, f)
+        return True
+
+    def reclaim_stale(self, unit_id):
+        """
+        Remove an expired lease. The rename is atomic, so when several workers
+        notice the same stale lease only one of them moves it away. The check
+        and the rename are not one step, so what was moved is checked again:
+        a lease refreshed or re-taken in between goes back into place.
+        """
+        lease = self.read_lease(unit_id)
+        if lease is None or lease.get("expires", 0) > time.time():
+            return False
+        tombstone = f"{self.lease_path(unit_id)}.stale.{worker_id()}"
+        try:
+            os.rename(self.lease_path(unit_id), tombstone)
+        except FileNotFoundError:
+            return False
+
+        # The owner may have sent a heartbeat, or another worker reclaimed and
+        # re-leased it, since we read it; then put it back (link never overwrites)
+        try:
+            with open(tombstone, 'r', encoding='utf-8') as f:
+                moved = json.load(f)
+        except ValueError:
+            moved = {}
+        same_lease = (moved.get("worker"), moved.get("expires")) == (lease.get("worker"), lease.get("expires"))
+        if not same_lease or moved.get("expires", 0) > time.time():
+            try:
+                os.link(tombstone, self.lease_path(unit_id))
+            except FileExistsError:
+                pass
+            os.remove(tombstone)
+            return False
+        os.remove(tombstone)
+        print(f"♻️ Reclaimed stale lease on {unit_id} from {lease.get('worker')}")
+        return True
+
+    def claim(self, worker):
+        """Lease the next pending unit; returns its id or None when nothing is left"""
+        for unit_id in self.unit_ids:
+            if self.is_done(unit_id):
+                continue
+            if self.try_create_lease(unit_id, worker):
+                # Finished between the done check and the lease
+                if self.is_done(unit_id):
+                    os.remove(self.lease_path(unit_id))
+                    continue
+                return unit_id
+            if self.reclaim_stale(unit_id) and self.try_create_lease(unit_id, worker):
+                return unit_id
+        return None
+
+    def heartbeat(self, unit_id, worker):
+        """Extend a lease; False if it was reclaimed by someone else"""
+        if self.is_done(unit_id):
+            return False
+        lease = self.read_lease(unit_id)
+        if lease is None:
+            # Moved aside by a reclaim that is still checking it, or reclaimed but not
+            # yet re-leased: this worker is alive, so take it back if nobody else has
+            return self.try_create_lease(unit_id, worker)
+        if lease.get("worker") != worker:
+            return False
+        write_atomic(self.lease_path(unit_id), json.dumps({
+            "worker": worker, "expires": time.time() + self.lease_seconds
+        }))
+        return True
+
+    def complete(self, unit_id, worker):
+        write_atomic(os.path.join(self.done_dir, f"{unit_id}.done"), json.dumps({
+            "worker": worker, "finished": time.time()
+        }))
+        try:
+            os.remove(self.lease_path(unit_id))
+        except FileNotFoundError:
+            pass
+
+    def release(self, unit_id, worker):
+        """Give a unit back after a failure so another worker can take it"""
+        lease = self.read_lease(unit_id)
+        if lease is not None and lease.get("worker") == worker:
+            try:
+                os.remove(self.lease_path(unit_id))
+            except FileNotFoundError:
+                pass
+
+    def status(self):
+        counts = {"pending": 0, "leased": 0, "stale": 0, "done": 0}
+        for unit_id in self.unit_ids:
+            if self.is_done(unit_id):
+                counts["done"] += 1
+                continue
+            lease = self.read_lease(unit_id)
+            if lease is None:
+                counts["pending"] += 1
+            elif lease.get("expires", 0) > time.time():
+                counts["leased"] += 1
+            else:
+                counts["stale"] += 1
+        return counts
+
+
+class SQLiteLeaseQueue:
+    """
+    The same queue as a SQLite table, for workers on one machine or a filesystem
+    with reliable locking. BEGIN IMMEDIATE makes claiming a single atomic step.
+    """
+
+    def __init__(self, job_dir, lease_seconds=LEASE_SECONDS):
+        self.job_dir = job_dir
+        self.lease_seconds = lease_seconds
+        self.db_path = os.path.join(job_dir, "queue.sqlite3")
+        self.unit_ids = [unit["id"] for unit in load_job(job_dir)["units"]]
+
+        db = self.connect()
+        try:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS units ("
+                "id TEXT PRIMARY KEY, position INTEGER, state TEXT, worker TEXT, expires REAL)"
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO units VALUES (?, ?, 'pending', NULL, 0)",
+                [(unit_id, position) for position, unit_id in enumerate(self.unit_ids)]
+            )
+        finally:
+            db.close()
+
+    def connect(self):
+        # Autocommit; claim() opens its own write transaction
+        return sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+
+    def claim(self, worker):
+        db = self.connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute(
+                "SELECT id, state, worker FROM units WHERE state = 'pending' "
+                "OR (state = 'leased' AND expires < ?) ORDER BY position LIMIT 1",
+                (time.time(),)
+            ).fetchone()
+            if row is None:
+                db.execute("COMMIT")
+                return None
+            if row[1] == "leased":
+                print(f"♻️ Reclaimed stale lease on {row[0]} from {row[2]}")
+            db.execute(
+                "UPDATE units SET state = 'leased', worker = ?, expires = ? WHERE id = ?",
+                (worker, time.time() + self.lease_seconds, row[0])
+            )
+            db.execute("COMMIT")
+            return row[0]
+        finally:
+            db.close()
+
+    def update(self, sql, params):
+        db = self.connect()
+        try:
+            return db.execute(sql, params).rowcount
+        finally:
+            db.close()
+
+    def heartbeat(self, unit_id, worker):
+        return self.update(
+            "UPDATE units SET expires = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+            (time.time() + self.lease_seconds, unit_id, worker)
+        ) == 1
+
+    def complete(self, unit_id, worker):
+        self.update("UPDATE units SET state = 'done', expires = 0 WHERE id = ?", (unit_id,))
+
+    def release(self, unit_id, worker):
+        self.update(
+            "UPDATE units SET state = 'pending', worker = NULL, expires = 0 WHERE id = ? AND worker = ?",
+            (unit_id, worker)
+        )
+
+    def is_done(self, unit_id):
+        db = self.connect()
+        try:
+            row = db.execute("SELECT state FROM units WHERE id = ?", (unit_id,)).fetchone()
+        finally:
+            db.close()
+        return row is not None and row[0] == "done"
+
+    def status(self):
+        counts = {"pending": 0, "leased": 0, "stale": 0, "done": 0}
+        db = self.connect()
+        try:
+            for state, expires in db.execute("SELECT state, expires FROM units"):
+                if state == "leased" and expires < time.time():
+                    state = "stale"
+                counts[state] += 1
+        finally:
+            db.close()
+        return counts
+
+
+QUEUE_BACKENDS = {
+    "file": FileLeaseQueue,
+    "sqlite": SQLiteLeaseQueue,
+}
+
+
+def open_queue(job_dir, lease_seconds=LEASE_SECONDS):
+    backend = load_job(job_dir).get("queue_backend", "file")
+    if backend not in QUEUE_BACKENDS:
+        raise ValueError(f"Unknown queue backend: {backend}")
+    return QUEUE_BACKENDS[backend](job_dir, lease_seconds)
+
+
+def render_unit(agent, unit):
+    """Render one work unit and return its audio as an AudioSegment"""
+    if unit["kind"] == "intro":
+        return agent.create_book_introduction()
+
+    chapter_idx = unit["chapter"] - 1
+    start, end = unit["paragraphs"]
+    return agent.process_chapter(
+        chapter_idx,
+        agent.chapters[chapter_idx],
+        include_title=(start == 0),
+        paragraph_range=(start, end)
+    )
+
+
+def unit_segments(agent, unit):
+    """
+    A unit's paragraphs as the worker recorded them in its render manifest, with
+    offsets relative to the unit's own audio; merge_job rebases them onto the book
+    """
+    if unit["kind"] == "intro":
+        return []
+    start, end = unit["paragraphs"]
+    segments = []
+    for segment in agent.render_manifest.segments(unit["chapter"]):
+        if start <= segment["position"] < end:
+            entry = agent.render_manifest.lookup(segment["hash"])
+            segments.append({
+                "position": segment["position"],
+                "hash": segment["hash"],
+                "start": segment["start"],
+                "end": segment["end"],
+                "directions": entry["directions"],
+                "memo_key": entry["memo_key"],
+                "voice": entry["voice"],
+                "text": entry["text"],
+            })
+    return segments
+
+
+def run_worker(job_dir, lease_seconds=LEASE_SECONDS, max_units=None):
+    """
+    Claim and render units until the queue is empty. Several of these can run
+    on different machines against the same job folder.
+    """
+    # Imported here so queue inspection and merging work without the TTS stack
+    from orchestrator import ChapterBasedAudiobookAgent
+
+    job = load_job(job_dir)
+    units = {unit["id"]: unit for unit in job["units"]}
+    work_queue = open_queue(job_dir, lease_seconds)
+    worker = worker_id()
+
+    results_dir = os.path.join(job_dir, "results")
+    os.makedirs(results_dir, exist_ok=True)
+
+    agent = ChapterBasedAudiobookAgent(
+        job["pdf_path"],
+        output_folder=os.path.join(job_dir, "workers", worker)
+    )
+    # Every worker shares one audio memo, so repeated lines are synthesized once per job
+    agent.speaker.memo_dir = os.path.join(job_dir, "audio_memo")
+    os.makedirs(agent.speaker.memo_dir, exist_ok=True)
+
+    rendered = 0
+    while max_units is None or rendered < max_units:
+        unit_id = work_queue.claim(worker)
+        if unit_id is None:
+            break
+
+        print(f"\n🧩 {worker} rendering {unit_id}")
+        stop_heartbeat = threading.Event()
+
+        def keep_alive(unit_id=unit_id):
+            while not stop_heartbeat.wait(min(HEARTBEAT_SECONDS, lease_seconds / 3)):
+                if not work_queue.heartbeat(unit_id, worker):
+                    print(f"\n⚠️ Lost lease on {unit_id}; another worker may render it too")
+                    return
+
+        heartbeat = threading.Thread(target=keep_alive, daemon=True)
+        heartbeat.start()
+        try:
+            audio = render_unit(agent, units[unit_id])
+            audio = audio.set_frame_rate(SAMPLE_RATE).set_channels(1).set_sample_width(2)
+            write_atomic(os.path.join(results_dir, f"{unit_id}.pcm"), audio.raw_data, mode="wb")
+            write_atomic(os.path.join(results_dir, f"{unit_id}.json"), json.dumps({
+                "worker": worker,
+                "samples": len(audio.raw_data) // 2,
+                "segments": unit_segments(agent, units[unit_id]),
+            }))
+            work_queue.complete(unit_id, worker)
+            rendered += 1
+        except Exception as e:
+            print(f"\n❌ {unit_id} failed on {worker}: {e}")
+            work_queue.release(unit_id, worker)
+            raise
+        finally:
+            stop_heartbeat.set()
+            heartbeat.join()
+
+    print(f"\n✅ {worker} finished ({rendered} units)")
+    agent.director.print_usage_report()
+    return rendered
+
+
+def read_unit_samples(results_dir, unit_id):
+    pcm = np.fromfile(os.path.join(results_dir, f"{unit_id}.pcm"), dtype=np.int16)
+    return pcm.astype(np.float32) / 32768
+
+
+def read_unit_result(results_dir, unit_id):
+    with open(os.path.join(results_dir, f"{unit_id}.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def merge_job(job_dir, output_name=None, output_format="m4b", target_lufs=-18.0, split_chapters=False):
+    """
+    Stitch finished units, in order, into one book with chapter markers.
+    Loudness is measured over all units of a chapter, so split chapters get
+    the same gain they would have in a single-machine render. The units'
+    paragraph offsets are rebased onto their chapter and the master file in
+    <output_name>_render.json, the same seek index a single-machine render writes.
+    """
+    job = load_job(job_dir)
+    work_queue = open_queue(job_dir)
+    results_dir = os.path.join(job_dir, "results")
+
+    missing = [unit["id"] for unit in job["units"] if not work_queue.is_done(unit["id"])]
+    if missing:
+        print(f"❌ {len(missing)} units are not finished yet: {', '.join(missing[:10])}")
+        return None
+
+    # Group units into chapters; the intro is its own group
+    groups = []
+    for unit in job["units"]:
+        key = unit["kind"] if unit["kind"] == "intro" else unit["chapter"]
+        if not groups or groups[-1][0] != key:
+            groups.append((key, []))
+        groups[-1][1].append(unit)
+
+    if output_name is None:
+        safe_title = job["book"]["title"].replace(' ', '_')
+        output_name = f"{safe_title}_distributed"
+
+    encoder = BookEncoder(
+        os.path.join(job_dir, output_name),
+        output_format=output_format,
+        metadata={
+            "title": job["book"]["title"],
+            "artist": job["book"]["author"],
+            "album": job["book"]["title"],
+            "genre": "Audiobook",
+        }
+    )
+    normalizer = LoudnessNormalizer(target_lufs=target_lufs) if target_lufs is not None else None
+    render_manifest = RenderManifest(os.path.join(job_dir, f"{output_name}_render.json"))
+
+    for position, (key, group) in enumerate(groups):
+        gain_db = 0.0
+        if normalizer is not None:
+            meter = LoudnessMeter()
+            for unit in group:
+                meter.feed(read_unit_samples(results_dir, unit["id"]))
+            gain_db = normalizer.gain_for(meter.integrated_lufs())
+
+        if key == "intro":
+            encoder.start_chapter("Introduction", "00_introduction")
+        else:
+            encoder.start_chapter(group[0]["title"], f"chapter_{key:02d}_selected")
+            render_manifest.start_chapter(key)
+
+        # Units are concatenated, so each one's offsets shift by the units before it
+        unit_offset = 0
+        for unit in group:
+            samples = read_unit_samples(results_dir, unit["id"])
+            if key != "intro":
+                for segment in read_unit_result(results_dir, unit["id"]).get("segments", []):
+                    if segment["start"] is None:
+                        continue
+                    render_manifest.record(
+                        key, segment["hash"], segment["directions"], segment["memo_key"],
+                        text=segment["text"], voice=segment["voice"], position=segment["position"],
+                        start=unit_offset + segment["start"], end=unit_offset + segment["end"]
+                    )
+            unit_offset += len(samples)
+            if normalizer is not None:
+                samples = normalizer.process(samples, gain_db)
+            encoder.write((np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16).tobytes())
+
+        if key == "intro":
+            encoder.write_silence(2000)
+        elif position < len(groups) - 1:
+            encoder.write_silence(3000)
+
+    output_filename = encoder.close()
+    chapter_files = []
+    if split_chapters:
+        chapter_files = encoder.split_chapters(os.path.join(job_dir, f"{output_name}_chapters"))
+
+    for (key, _), chapter in zip(groups, encoder.chapters):
+        if key == "intro":
+            continue
+        chapter_file = os.path.join(job_dir, f"{output_name}_chapters",
+                                    chapter["file_stem"] + encoder.settings["extension"])
+        render_manifest.place_chapter(key, output_filename, chapter["start"], chapter["end"],
+                                      chapter_file if chapter_file in chapter_files else None)
+    render_manifest.save(job["book"])
+
+    print(f"\n🎉 Merged {len(job['units'])} units into {output_filename} "
+          f"({encoder.duration_seconds / 60:.1f} minutes)")
+    return output_filename
+
+
+def run_local(job_dir, workers=None, lease_seconds=LEASE_SECONDS):
+    """Start several worker processes on this machine (autotuned count by default) and wait for them"""
+    workers = workers or load_tuning().get("workers", 2)
+    processes = [
+        subprocess.Popen([sys.executable, os.path.abspath(__file__), "worker", job_dir,
+                          "--lease-seconds", str(lease_seconds)])
+        for _ in range(workers)
+    ]
+    return [process.wait() for process in processes]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distributed audiobook rendering over a shared folder")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    create_parser = subparsers.add_parser("create", help="Split a book into work units")
+    create_parser.add_argument("pdf_path")
+    create_parser.add_argument("job_dir")
+    create_parser.add_argument("--chapters", default=None, help="e.g. '1-5' or '1,3,7'")
+    create_parser.add_argument("--paragraphs-per-unit", type=int, default=None)
+    create_parser.add_argument("--queue", choices=sorted(QUEUE_BACKENDS), default="file")
+    create_parser.add_argument("--no-intro", action="store_true")
+
+    worker_parser = subparsers.add_parser("worker", help="Render units until the queue is empty")
+    worker_parser.add_argument("job_dir")
+    worker_parser.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+    worker_parser.add_argument("--max-units", type=int, default=None)
+
+    local_parser = subparsers.add_parser("local", help="Run several workers on this machine")
+    local_parser.add_argument("job_dir")
+    local_parser.add_argument("--workers", type=int, default=None, help="Default: autotuned, else 2")
+    local_parser.add_argument("--lease-seconds", type=float, default=LEASE_SECONDS)
+
+    merge_parser = subparsers.add_parser("merge", help="Stitch finished units into the book")
+    merge_parser.add_argument("job_dir")
+    merge_parser.add_argument("--output-name", default=None)
+    merge_parser.add_argument("--format", choices=["m4b", "opus", "mp3"], default="m4b")
+    merge_parser.add_argument("--split-chapters", action="store_true")
+
+    status_parser = subparsers.add_parser("status", help="Show queue progress")
+    status_parser.add_argument("job_dir")
+
+    args = parser.parse_args()
+
+    if args.command == "create":
+        from orchestrator import ChapterBasedAudiobookAgent
+        agent = ChapterBasedAudiobookAgent(args.pdf_path, output_folder=os.path.join(args.job_dir, "setup"))
+        agent.create_job_manifest(
+            args.job_dir,
+            chapter_numbers=args.chapters,
+            paragraphs_per_unit=args.paragraphs_per_unit,
+            include_intro=not args.no_intro,
+            queue_backend=args.queue
+        )
+        open_queue(args.job_dir)
+    elif args.command == "worker":
+        run_worker(args.job_dir, args.lease_seconds, args.max_units)
+    elif args.command == "local":
+        run_local(args.job_dir, args.workers, args.lease_seconds)
+    elif args.command == "merge":
+        merge_job(args.job_dir, args.output_name, args.format, split_chapters=args.split_chapters)
+    elif args.command == "status":
+        counts = open_queue(args.job_dir).status()
+        print(f"📊 {counts['done']} done, {counts['leased']} leased, "
+              f"{counts['stale']} stale, {counts['pending']} pending")